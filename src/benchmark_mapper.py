@@ -0,0 +1,17 @@
+"""Benchmark do mapeamento em lote pela linha de comando.
+
+Uso:
+    python src/benchmark_mapper.py --records 100000 --forms identification systems
+"""
+import sys
+from pathlib import Path
+
+# Adiciona a raiz e o src ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+sys.path.append(str(root_dir / "src"))
+
+from src.migrations.mapper_benchmark import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""Benchmark dos backends de armazenamento pela linha de comando.
+
+Uso:
+    python src/benchmark_storage.py --processes 100000 --backends directory sqlite
+"""
+import sys
+from pathlib import Path
+
+# Adiciona a raiz e o src ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+sys.path.append(str(root_dir / "src"))
+
+from src.migrations.storage_benchmark import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""Exportação em lote de PDDs pela linha de comando.
+
+Uso:
+    python src/export_pdds.py [PROC-001 PROC-002 ...] --format html --workers 8
+"""
+import sys
+from pathlib import Path
+
+# Adiciona a raiz e o src ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+sys.path.append(str(root_dir / "src"))
+
+from services.export_service import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""Catálogo indexado dos backups da migração."""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple, Union, Callable
+import sqlite3
+import threading
+
+CATALOG_FILE = "catalog.db"
+
+@dataclass
+class RetentionPolicy:
+    """
+    Política de retenção de backups por formulário.
+    
+    Um backup é mantido se estiver entre os keep_last mais recentes, ou se
+    for o mais recente de um dos keep_daily últimos dias (ou keep_weekly
+    últimas semanas ISO) que têm backups.
+    """
+    keep_last: int = 0
+    keep_daily: int = 0
+    keep_weekly: int = 0
+
+class BackupCatalog:
+    """
+    Índice (SQLite) dos backups: nome, data, hash e contagem de referências.
+    
+    Consultas pelos N backups mais recentes de um formulário, pela entrada
+    de um backup e a aplicação da retenção usam índices, sem listar pastas
+    nem consultar o mtime de arquivos. Cada hash guarda quantos backups o
+    referenciam, então os blobs órfãos saem direto da retenção. Por ser
+    derivado dos manifestos, pode ser reconstruído a qualquer momento.
+    """
+    
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Inicializa o catálogo.
+        
+        Args:
+            db_path: Caminho do arquivo do catálogo
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS backups ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " form TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " created_at TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " week TEXT NOT NULL,"
+                " hash TEXT NOT NULL,"
+                " size INTEGER,"
+                " process_id TEXT,"
+                " UNIQUE (form, name)"
+                ")"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backups_form ON backups (form, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backups_day ON backups (form, day, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backups_week ON backups (form, week, id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, refs INTEGER NOT NULL)")
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual, criada na primeira utilização."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Transações explícitas (BEGIN IMMEDIATE) em _transaction
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Transação de escrita: o lock é obtido no início, então outros
+        processos esperam até o commit (ou rollback em caso de erro).
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @staticmethod
+    def _buckets(created_at: str) -> Tuple[str, str]:
+        """Dia e semana ISO do backup, usados pela retenção."""
+        created = datetime.fromisoformat(created_at)
+        year, week, _ = created.isocalendar()
+        return created.date().isoformat(), f"{year}-W{week:02d}"
+    
+    def _insert(self, conn: sqlite3.Connection, form_name: str, entry: Dict[str, Any]) -> None:
+        day, week = self._buckets(entry["created_at"])
+        conn.execute(
+            "INSERT INTO backups (form, name, created_at, day, week, hash, size, process_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (form_name, entry["backup"], entry["created_at"], day, week,
+             entry["hash"], entry.get("size"), entry.get("process_id"))
+        )
+        conn.execute(
+            "INSERT INTO blobs (hash, refs) VALUES (?, 1) "
+            "ON CONFLICT (hash) DO UPDATE SET refs = refs + 1",
+            (entry["hash"],)
+        )
+    
+    def add(self, form_name: str, entry: Dict[str, Any]) -> None:
+        """
+        Registra um backup.
+        
+        Args:
+            form_name: Nome do formulário
+            entry: Entrada do manifesto (backup, created_at, hash, size, process_id)
+        """
+        with self._transaction() as conn:
+            self._insert(conn, form_name, entry)
+    
+    def add_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Registra vários backups (pares formulário, entrada) em uma transação."""
+        with self._transaction() as conn:
+            for form_name, entry in entries:
+                self._insert(conn, form_name, entry)
+    
+    def get(self, form_name: str, name: str) -> Optional[Dict[str, Any]]:
+        """Entrada de um backup, ou None se não existir."""
+        row = self._connection().execute(
+            "SELECT name AS backup, created_at, hash, size, process_id "
+            "FROM backups WHERE form = ? AND name = ?",
+            (form_name, name)
+        ).fetchone()
+        return dict(row) if row else None
+    
+    def latest(self, form_name: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Os backups mais recentes de um formulário.
+        
+        Args:
+            form_name: Nome do formulário
+            limit: Quantidade máxima de backups
+            
+        Returns:
+            Entradas do mais recente para o mais antigo
+        """
+        rows = self._connection().execute(
+            "SELECT name AS backup, created_at, hash, size, process_id "
+            "FROM backups WHERE form = ? ORDER BY id DESC LIMIT ?",
+            (form_name, limit)
+        )
+        return [dict(row) for row in rows]
+    
+    def names(self, form_name: str) -> List[str]:
+        """Nomes dos backups de um formulário, ordenados."""
+        rows = self._connection().execute(
+            "SELECT name FROM backups WHERE form = ? ORDER BY name", (form_name,)
+        )
+        return [row[0] for row in rows]
+    
+    def forms(self) -> List[str]:
+        """Formulários com backups, ordenados."""
+        rows = self._connection().execute("SELECT DISTINCT form FROM backups ORDER BY form")
+        return [row[0] for row in rows]
+    
+    def count(self, form_name: str) -> int:
+        """Quantidade de backups de um formulário."""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM backups WHERE form = ?", (form_name,)
+        ).fetchone()[0]
+    
+    @staticmethod
+    def _kept_ids(conn: sqlite3.Connection, form_name: str, policy: RetentionPolicy) -> List[int]:
+        """IDs mantidos pela política (consultas limitadas ao que é mantido)."""
+        kept = [row[0] for row in conn.execute(
+            "SELECT id FROM backups WHERE form = ? ORDER BY id DESC LIMIT ?",
+            (form_name, policy.keep_last)
+        )]
+        for bucket, limit in (("day", policy.keep_daily), ("week", policy.keep_weekly)):
+            if limit > 0:
+                kept += [row[0] for row in conn.execute(
+                    f"SELECT MAX(id) FROM backups WHERE form = ? GROUP BY {bucket} "
+                    f"ORDER BY {bucket} DESC LIMIT ?",
+                    (form_name, limit)
+                )]
+        return kept
+    
+    def apply_retention(
+        self,
+        form_name: str,
+        policy: RetentionPolicy,
+        on_orphans: Optional[Callable[[List[str]], None]] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Remove do catálogo os backups que a política não mantém.
+        
+        Args:
+            form_name: Nome do formulário
+            policy: Política de retenção
+            on_orphans: Chamado com os hashes sem referências antes do commit,
+                para apagar os blobs enquanto nenhum outro processo pode
+                voltar a referenciá-los
+                
+        Returns:
+            Tuple[List, List]: (nomes removidos, hashes sem referências)
+        """
+        with self._transaction() as conn:
+            kept = self._kept_ids(conn, form_name, policy)
+            placeholders = ",".join("?" * len(kept))
+            where = f"form = ? AND id NOT IN ({placeholders})" if kept else "form = ?"
+            removed = conn.execute(
+                f"SELECT name, hash FROM backups WHERE {where} ORDER BY id", [form_name] + kept
+            ).fetchall()
+            if not removed:
+                return [], []
+                
+            conn.execute(f"DELETE FROM backups WHERE {where}", [form_name] + kept)
+            released: Dict[str, int] = {}
+            for row in removed:
+                released[row["hash"]] = released.get(row["hash"], 0) + 1
+            conn.executemany(
+                "UPDATE blobs SET refs = refs - ? WHERE hash = ?",
+                [(count, digest) for digest, count in released.items()]
+            )
+            orphans = [row[0] for row in conn.execute(
+                f"SELECT hash FROM blobs WHERE refs <= 0 AND hash IN ({','.join('?' * len(released))}) ORDER BY hash",
+                list(released)
+            )]
+            conn.executemany("DELETE FROM blobs WHERE hash = ?", [(digest,) for digest in orphans])
+            if on_orphans is not None and orphans:
+                on_orphans(orphans)
+        return [row["name"] for row in removed], orphans
+    
+    def rebuild(self, manifests: Iterable[Tuple[str, Iterable[Dict[str, Any]]]]) -> int:
+        """
+        Recria o catálogo a partir dos manifestos.
+        
+        Args:
+            manifests: Pares (formulário, entradas do manifesto na ordem
+                gravada); entradas {"deleted": nome} removem um backup
+                
+        Returns:
+            int: Quantidade de backups catalogados
+        """
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM backups")
+            conn.execute("DELETE FROM blobs")
+            for form_name, entries in manifests:
+                current: Dict[str, Dict[str, Any]] = {}
+                for entry in entries:
+                    if "deleted" in entry:
+                        current.pop(entry["deleted"], None)
+                    else:
+                        current[entry["backup"]] = entry
+                for entry in current.values():
+                    self._insert(conn, form_name, entry)
+            return conn.execute("SELECT COUNT(*) FROM backups").fetchone()[0]
+    
+    def close(self) -> None:
+        """Fecha as conexões abertas."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
@@ -1,78 +1,294 @@
 """Módulo para gerenciar backups durante a migração."""
+import gzip
+import hashlib
 import json
-import shutil
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-import time
-import os
+from typing import Dict, Any, Optional, List, Iterator, Set, Tuple
 
+from src.migrations.backup_catalog import BackupCatalog, RetentionPolicy, CATALOG_FILE
+from src.migrations.metrics import MigrationMetrics
+from src.utils.atomic_write import atomic_write, fsync_paths
 from src.utils.migration_logger import MigrationLogger
 
+OBJECTS_DIR = "objects"
+MANIFEST_FILE = "manifest.jsonl"
+
 class BackupService:
-    """Serviço para gerenciar backups dos dados durante a migração."""
+    """
+    Serviço para gerenciar backups dos dados durante a migração.
     
-    def __init__(self, backup_dir: str = "backups/migration"):
+    Os backups são endereçados por conteúdo: o JSON de cada backup é
+    comprimido e gravado uma única vez em objects/<hash>, e cada formulário
+    tem um manifesto append-only (<formulário>/manifest.jsonl) com o nome,
+    a data e o hash de cada backup. Backups repetidos de dados inalterados
+    custam apenas uma linha no manifesto.
+    
+    Listagens, restauração e retenção consultam o BackupCatalog (SQLite),
+    derivado dos manifestos e reconstruído a partir deles se não existir.
+    Backups do formato anterior (<formulário>/backup_*.json) encontrados na
+    inicialização são importados para esse armazenamento.
+    """
+    
+    def __init__(self, backup_dir: str = "backups/migration", metrics: Optional[MigrationMetrics] = None):
         """
         Inicializa o serviço de backup.
         
         Args:
             backup_dir: Diretório para armazenar backups
+            metrics: Métricas onde registrar a latência dos backups (opcional)
         """
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir = self.backup_dir / OBJECTS_DIR
         self.logger = MigrationLogger()
+        self.metrics = metrics
         self._counter = 0
+        self._lock = threading.Lock()
+        # Arquivos gravados sem fsync, persistidos por sync()
+        self._dirty: Set[Path] = set()
+        
+        catalog_path = self.backup_dir / CATALOG_FILE
+        rebuild = not catalog_path.exists()
+        self.catalog = BackupCatalog(catalog_path)
+        if rebuild and any(self._manifest_forms()):
+            self.rebuild_catalog()
+        self.import_legacy_backups()
+    
+    def _blob_path(self, digest: str) -> Path:
+        """Caminho do blob de um hash (duas letras de prefixo por pasta)."""
+        return self.objects_dir / digest[:2] / f"{digest}.json.gz"
+    
+    def _manifest_path(self, form_name: str) -> Path:
+        return self.backup_dir / form_name / MANIFEST_FILE
+    
+    @staticmethod
+    def _encode(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    def _store_blob(self, digest: str, payload: bytes) -> Optional[int]:
+        """Grava o blob se ainda não existir; retorna o tamanho gravado (None se já existia)."""
+        blob_path = self._blob_path(digest)
+        if blob_path.exists():
+            return None
+        compressed = gzip.compress(payload, mtime=0)
+        with atomic_write(blob_path, mode="wb", fsync=False) as f:
+            f.write(compressed)
+        with self._lock:
+            self._dirty.add(blob_path)
+        return len(compressed)
+    
+    def _next_name(self, now: datetime) -> str:
+        """Nome único do backup: data, microssegundos, PID e contador."""
+        with self._lock:
+            self._counter += 1
+            counter = self._counter
+        return f"backup_{now:%Y%m%d_%H%M%S}_{now.microsecond:06d}_{os.getpid()}_{counter}.json"
+    
+    def _manifest_forms(self) -> Iterator[str]:
+        for form_dir in self.backup_dir.iterdir():
+            if form_dir.is_dir() and (form_dir / MANIFEST_FILE).exists():
+                yield form_dir.name
+    
+    def _read_manifest(self, form_name: str) -> List[Dict[str, Any]]:
+        """Entradas do manifesto de um formulário, na ordem gravada."""
+        manifest_path = self._manifest_path(form_name)
+        if not manifest_path.exists():
+            return []
+        entries = []
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Última linha pode estar truncada após uma interrupção
+                    continue
+        return entries
     
-    def create_backup(self, form_name: str, data: Dict[str, Any]) -> Optional[Path]:
+    def _append_manifest(self, form_name: str, entries: List[Dict[str, Any]]) -> None:
+        manifest_path = self._manifest_path(form_name)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self._lock, open(manifest_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            self._dirty.add(manifest_path)
+    
+    def rebuild_catalog(self) -> int:
+        """
+        Recria o catálogo a partir dos manifestos.
+        
+        Returns:
+            int: Quantidade de backups catalogados
+        """
+        count = self.catalog.rebuild(
+            (form_name, self._read_manifest(form_name)) for form_name in self._manifest_forms()
+        )
+        self.logger.info(f"Backup catalog rebuilt with {count} backups")
+        return count
+    
+    def import_legacy_backups(self) -> int:
+        """
+        Importa os backups do formato anterior (um arquivo JSON por backup).
+        
+        Cada arquivo vira um blob e uma entrada no manifesto e no catálogo,
+        com o mesmo nome e a data de modificação do arquivo, do mais antigo
+        ao mais recente (a ordem usada pela retenção). O arquivo só é
+        removido depois de registrado; se a importação for interrompida,
+        os que já estão no catálogo são apenas removidos na próxima vez.
+        
+        Returns:
+            int: Quantidade de backups importados
+        """
+        legacy = []
+        for form_dir in self.backup_dir.iterdir():
+            if form_dir.is_dir() and form_dir.name != OBJECTS_DIR:
+                legacy += [(path.stat().st_mtime, form_dir.name, path) for path in form_dir.glob("backup_*.json")]
+        if not legacy:
+            return 0
+            
+        imported, done = [], []
+        for mtime, form_name, path in sorted(legacy):
+            if self.catalog.get(form_name, path.name) is not None:
+                done.append(path)
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = self._encode(json.load(f))
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Skipping unreadable legacy backup {path}", e)
+                continue
+            digest = hashlib.sha256(payload).hexdigest()
+            entry = {
+                "backup": path.name,
+                "created_at": datetime.fromtimestamp(mtime).isoformat(),
+                "hash": digest,
+                "size": len(payload),
+                "stored": self._store_blob(digest, payload)
+            }
+            imported.append((form_name, entry, path))
+            
+        by_form: Dict[str, List[Dict[str, Any]]] = {}
+        for form_name, entry, _ in imported:
+            by_form.setdefault(form_name, []).append(entry)
+        for form_name, entries in by_form.items():
+            self._append_manifest(form_name, entries)
+        if imported:
+            self.catalog.add_many((form_name, entry) for form_name, entry, _ in imported)
+        self.sync()
+        for path in done + [path for _, _, path in imported]:
+            path.unlink()
+        if imported:
+            self.logger.info(f"Imported {len(imported)} legacy backups")
+        return len(imported)
+    
+    def create_backup(
+        self,
+        form_name: str,
+        data: Dict[str, Any],
+        process_id: Optional[str] = None
+    ) -> Optional[Path]:
         """
         Cria um backup dos dados de um formulário.
         
         Args:
             form_name: Nome do formulário
             data: Dados a serem backupeados
+            process_id: ID do processo, registrado no manifesto (opcional)
             
         Returns:
-            Path: Caminho do arquivo de backup ou None se falhar
+            Path: Identificador do backup (<backup_dir>/<formulário>/<nome>),
+            aceito por restore_backup, ou None se falhar
         """
-        try:
-            # Cria diretório específico para o formulário
-            form_backup_dir = self.backup_dir / form_name
-            form_backup_dir.mkdir(exist_ok=True)
-            
-            # Gera nome único do arquivo com timestamp e contador
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            microsecond = datetime.now().microsecond
-            self._counter += 1
-            backup_file = form_backup_dir / f"backup_{timestamp}_{microsecond}_{self._counter}.json"
+        return self.create_backups([(form_name, data, process_id)])[0]
+    
+    def create_backups(self, items: List[Tuple[str, Dict[str, Any], Optional[str]]]) -> List[Optional[Path]]:
+        """
+        Cria vários backups de uma vez (group commit): uma gravação por
+        manifesto de formulário e uma única transação no catálogo.
+        
+        Args:
+            items: Tuplas (formulário, dados, process_id ou None)
             
-            # Pequeno delay para garantir timestamps diferentes
-            time.sleep(0.001)
+        Returns:
+            Identificador de cada backup, na mesma ordem (None nos que falharam)
+        """
+        results: List[Optional[Path]] = [None] * len(items)
+        staged = []
+        started = time.perf_counter()
+        for position, (form_name, data, process_id) in enumerate(items):
+            try:
+                now = datetime.now()
+                entry = {"backup": self._next_name(now), "created_at": now.isoformat()}
+                if process_id is not None:
+                    entry["process_id"] = process_id
+                payload = self._encode(data)
+                entry["hash"] = hashlib.sha256(payload).hexdigest()
+                entry["size"] = len(payload)
+                entry["stored"] = self._store_blob(entry["hash"], payload)
+                staged.append((position, form_name, entry, payload))
+            except Exception as e:
+                self.logger.error(f"Error creating backup for {form_name}", e)
+        if not staged:
+            return results
             
-            # Salva dados
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+        try:
+            by_form: Dict[str, List[Dict[str, Any]]] = {}
+            for _, form_name, entry, _ in staged:
+                by_form.setdefault(form_name, []).append(entry)
+            for form_name, entries in by_form.items():
+                self._append_manifest(form_name, entries)
+            self.catalog.add_many((form_name, entry) for _, form_name, entry, _ in staged)
+            for position, form_name, entry, payload in staged:
+                # Uma retenção concorrente pode ter apagado o blob antes do registro no catálogo
+                self._store_blob(entry["hash"], payload)
+                results[position] = self.backup_dir / form_name / entry["backup"]
+        except Exception as e:
+            self.logger.error(f"Error recording {len(staged)} backups", e)
+            return [None] * len(items)
             
-            self.logger.info(f"Backup created for {form_name} at {backup_file}")
-            return backup_file
+        if self.metrics is not None:
+            # Tempo do lote dividido entre os backups (amortizado no group commit)
+            elapsed = (time.perf_counter() - started) / len(staged)
+            for _, form_name, _, _ in staged:
+                self.metrics.observe("backup", form_name, elapsed)
+        if len(staged) == 1:
+            _, form_name, entry, _ = staged[0]
+            self.logger.info(f"Backup created for {form_name} at {self.backup_dir / form_name / entry['backup']}")
+        else:
+            self.logger.info(f"{len(staged)} backups created in {len(by_form)} forms")
+        return results
             
-        except Exception as e:
-            self.logger.error(f"Error creating backup for {form_name}", e)
-            return None
+    def sync(self) -> None:
+        """Força em disco os blobs e manifestos gravados desde a última chamada."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        fsync_paths(path for path in dirty if path.exists())
     
     def restore_backup(self, backup_file: Path) -> Optional[Dict[str, Any]]:
         """
         Restaura dados de um backup.
         
         Args:
-            backup_file: Caminho do arquivo de backup
+            backup_file: Caminho retornado por create_backup (arquivos JSON
+                de backups antigos, anteriores ao armazenamento por
+                conteúdo, também são aceitos)
             
         Returns:
             Dict: Dados restaurados ou None se falhar
         """
         try:
-            with open(backup_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            backup_file = Path(backup_file)
+            if backup_file.is_file():
+                with open(backup_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            else:
+                entry = self.catalog.get(backup_file.parent.name, backup_file.name)
+                if entry is None:
+                    raise FileNotFoundError(f"Backup not found: {backup_file}")
+                data = json.loads(gzip.decompress(self._blob_path(entry["hash"]).read_bytes()))
             
             self.logger.info(f"Backup restored from {backup_file}")
             return data
@@ -91,22 +307,58 @@ class BackupService:
         Returns:
             Dict: Dicionário com backups por formulário
         """
+        forms = [form_name] if form_name else self.catalog.forms()
         backups = {}
+        for name in forms:
+            names = self.catalog.names(name)
+            if names:
+                backups[name] = names
+        return backups
         
-        if form_name:
-            form_dir = self.backup_dir / form_name
-            if form_dir.exists():
-                backups[form_name] = sorted([
-                    f.name for f in form_dir.glob("backup_*.json")
-                ])
-        else:
-            for form_dir in self.backup_dir.iterdir():
-                if form_dir.is_dir():
-                    backups[form_dir.name] = sorted([
-                        f.name for f in form_dir.glob("backup_*.json")
-                    ])
+    def latest_backups(self, form_name: str, limit: int = 1) -> List[Path]:
+        """
+        Os backups mais recentes de um formulário, sem listar arquivos.
         
-        return backups
+        Args:
+            form_name: Nome do formulário
+            limit: Quantidade máxima de backups
+            
+        Returns:
+            Caminhos aceitos por restore_backup, do mais recente ao mais antigo
+        """
+        return [self.backup_dir / form_name / entry["backup"] for entry in self.catalog.latest(form_name, limit)]
+    
+    def _delete_blobs(self, digests: List[str]) -> None:
+        for digest in digests:
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+    
+    def apply_retention(self, policy: RetentionPolicy, form_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Remove os backups que a política de retenção não mantém.
+        
+        Os backups removidos são registrados no manifesto (entradas
+        {"deleted": nome}) e os blobs que ficam sem referências são apagados.
+        
+        Args:
+            policy: Política (keep_last, keep_daily, keep_weekly)
+            form_name: Formulário (padrão: todos)
+            
+        Returns:
+            Dict formulário -> nomes dos backups removidos
+        """
+        removed_by_form = {}
+        for name in ([form_name] if form_name else self.catalog.forms()):
+            removed, _ = self.catalog.apply_retention(name, policy, on_orphans=self._delete_blobs)
+            if not removed:
+                continue
+            deleted_at = datetime.now().isoformat()
+            self._append_manifest(name, [{"deleted": backup, "deleted_at": deleted_at} for backup in removed])
+            removed_by_form[name] = removed
+            self.logger.info(f"Removed {len(removed)} old backups of {name}")
+        return removed_by_form
     
     def cleanup_old_backups(self, max_backups: int = 5) -> None:
         """
@@ -115,29 +367,13 @@ class BackupService:
         Args:
             max_backups: Número máximo de backups a manter por formulário
         """
-        for form_dir in self.backup_dir.iterdir():
-            if form_dir.is_dir():
-                backups = sorted(
-                    form_dir.glob("backup_*.json"),
-                    key=lambda x: x.stat().st_mtime,
-                    reverse=True
-                )
-                
-                # Remove backups excedentes
-                for backup in backups[max_backups:]:
-                    backup.unlink()
-                    self.logger.info(f"Removed old backup: {backup}") 
+        self.apply_retention(RetentionPolicy(keep_last=max_backups))
     
     def backup_form_data(self, form_type: str, process_id: str, data: Dict[str, Any]) -> bool:
         """Faz backup dos dados do formulário antes da migração."""
-        try:
-            backup_path = f"backups/{process_id}/{form_type}_{datetime.now().isoformat()}.json"
-            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-            
-            with open(backup_path, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to backup {form_type} data: {str(e)}")
-            return False 
\ No newline at end of file
+        backup_file = self.create_backup(form_type, data, process_id=process_id)
+        if backup_file is None:
+            self.logger.error(f"Failed to backup {form_type} data")
+            return False
+        return True
+            
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""Gravação assíncrona e em lote dos backups da migração."""
+from queue import Queue
+from typing import Dict, Any, List, Optional, Tuple
+import threading
+
+from src.migrations.backup_service import BackupService
+
+class _Barrier:
+    """Marcador na fila: sinaliza quando tudo que veio antes foi gravado."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed: List[Tuple[str, str]] = []
+        self.error: Optional[BaseException] = None
+
+_CLOSE = object()
+
+class AsyncBackupWriter:
+    """
+    Grava backups em uma thread própria, com fila limitada e group commit.
+    
+    submit() só enfileira os dados e retorna; a thread de gravação junta
+    até batch_size backups e os grava com BackupService.create_backups
+    (uma transação no catálogo e uma gravação de manifesto por formulário).
+    A fila limitada segura o produtor quando o disco não acompanha.
+    
+    barrier() é o ponto de durabilidade: espera a gravação de tudo que foi
+    enviado antes dele, força os arquivos em disco (fsync) e informa quais
+    backups falharam desde a barreira anterior.
+    """
+    
+    def __init__(self, backup_service: BackupService, queue_size: int = 1000, batch_size: int = 100):
+        """
+        Inicializa o writer e inicia a thread de gravação.
+        
+        Args:
+            backup_service: Serviço que grava os backups
+            queue_size: Máximo de backups aguardando gravação
+            batch_size: Máximo de backups por group commit
+        """
+        self.backup_service = backup_service
+        self.batch_size = batch_size
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._failed: List[Tuple[str, str]] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="backup-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, form_name: str, process_id: str, data: Dict[str, Any]) -> None:
+        """
+        Enfileira o backup dos dados de um formulário.
+        
+        Args:
+            form_name: Nome do formulário
+            process_id: ID do processo
+            data: Dados a serem backupeados (não devem ser alterados depois)
+        """
+        if self._closed:
+            raise RuntimeError("Backup writer is closed")
+        self._queue.put((form_name, data, process_id))
+    
+    def barrier(self, timeout: Optional[float] = None) -> List[Tuple[str, str]]:
+        """
+        Espera a gravação dos backups enviados e os força em disco.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos (padrão: sem limite)
+            
+        Returns:
+            Pares (process_id, formulário) dos backups que falharam desde a
+            barreira anterior
+        """
+        marker = _Barrier()
+        self._queue.put(marker)
+        if not marker.done.wait(timeout):
+            raise TimeoutError("Backup writer barrier timed out")
+        if marker.error is not None:
+            raise marker.error
+        return marker.failed
+    
+    def close(self) -> List[Tuple[str, str]]:
+        """Grava o que resta na fila, encerra a thread e retorna as falhas pendentes."""
+        if self._closed:
+            return []
+        failed = self.barrier()
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        return failed
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            # Junta o que já está na fila, até o limite do lote
+            while isinstance(item, tuple):
+                batch.append(item)
+                if len(batch) >= self.batch_size or self._queue.empty():
+                    item = None
+                    break
+                item = self._queue.get()
+            if batch:
+                self._write(batch)
+            if isinstance(item, _Barrier):
+                self._sync(item)
+            elif item is _CLOSE:
+                return
+    
+    def _write(self, batch: List[Tuple[str, Dict[str, Any], str]]) -> None:
+        try:
+            results = self.backup_service.create_backups(batch)
+        except Exception:
+            results = [None] * len(batch)
+        self._failed.extend(
+            (process_id, form_name)
+            for (form_name, _, process_id), result in zip(batch, results)
+            if result is None
+        )
+    
+    def _sync(self, marker: _Barrier) -> None:
+        try:
+            self.backup_service.sync()
+        except Exception as e:
+            marker.error = e
+        marker.failed, self._failed = self._failed, []
+        marker.done.set()
@@ -0,0 +1,60 @@
+"""Mapeamento em lote dos formulários legados."""
+from functools import wraps
+from typing import Dict, Any, List, Callable, Iterable
+import gc
+
+from src.migrations.form_registry import FORMS
+from src.migrations.mapping_spec import default_mappers
+
+def _gc_paused(batch: Callable) -> Callable:
+    """
+    Suspende o coletor de ciclos durante o lote.
+    
+    Os registros mapeados não têm ciclos, mas cada milhar de dicts criados
+    dispara uma coleta que percorre os resultados já acumulados: em lotes
+    grandes isso passa a dominar o tempo de mapeamento.
+    """
+    @wraps(batch)
+    def wrapper(records):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return batch(records)
+        finally:
+            if enabled:
+                gc.enable()
+    return wrapper
+
+def _batch_mapper(form_name: str) -> Callable:
+    """
+    Variante em lote do mapeador compilado de um formulário.
+    
+    Recebe uma lista de registros legados e devolve a lista mapeada, com
+    resultado idêntico ao de chamar o método do DataMapper registro a
+    registro. Usa o mapeador compilado de config/mapping_spec.yaml, sem os
+    logs de depuração do DataMapper.
+    """
+    def batch(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        mapper = default_mappers()[form_name]
+        return [mapper(old_data) for old_data in records]
+    batch.__name__ = batch.__qualname__ = f"map_{form_name}_batch"
+    batch.__doc__ = f"Mapeia uma lista de {FORMS[form_name].label}s."
+    return _gc_paused(batch)
+
+# Formulário -> variante em lote (o método do DataMapper está em FORMS)
+BATCH_MAPPERS: Dict[str, Callable] = {form_name: _batch_mapper(form_name) for form_name in FORMS}
+
+def map_batch(form_name: str, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Mapeia uma lista de registros legados de um formulário.
+    
+    Args:
+        form_name: Nome do formulário (chave de BATCH_MAPPERS)
+        records: Registros no formato antigo
+        
+    Returns:
+        Lista de registros no novo formato, na mesma ordem
+    """
+    if form_name not in BATCH_MAPPERS:
+        raise ValueError(f"Invalid form name: {form_name}")
+    return BATCH_MAPPERS[form_name](records)
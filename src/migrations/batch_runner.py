@@ -0,0 +1,415 @@
+"""Módulo para migração em lote de processos legados."""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Callable
+import logging
+import os
+import time
+
+from src.migrations.backup_service import BackupService
+from src.migrations.backup_writer import AsyncBackupWriter
+from src.migrations.data_mapper import DataMapper
+from src.migrations.dry_run import DiffReport, diff_process
+from src.migrations.validators import DataValidator
+from src.migrations.metrics import MigrationMetrics
+from src.migrations.migration_service import MigrationService
+from src.migrations.form_registry import FORMS
+from src.migrations.persistence import MigrationPersistence
+from src.migrations.checkpoint import CheckpointJournal, content_hash, SUCCESS, FAILED
+
+# Serviço de migração de cada worker, com mapper e validator próprios
+_worker: Dict[str, Any] = {}
+
+def _init_worker(storage_path: str, backup_dir: Optional[str] = None, read_only: bool = False) -> None:
+    """Cria as instâncias de mapper, validator, persistência e backup do worker."""
+    _worker["service"] = MigrationService(
+        mapper=DataMapper(),
+        validator=DataValidator(),
+        persistence=MigrationPersistence(storage_path, read_only=read_only)
+    )
+    metrics = _worker["service"].metrics
+    _worker["backups"] = AsyncBackupWriter(BackupService(backup_dir, metrics=metrics)) if backup_dir else None
+
+def record_process_id(record: Dict[str, Any]) -> str:
+    """Obtém o ID do processo de um registro legado."""
+    return (
+        record.get("id")
+        or record.get("process_id")
+        or record.get("identification", {}).get("id", "")
+    )
+
+def migrate_record(
+    service: MigrationService,
+    record: Dict[str, Any],
+    backups: Optional[AsyncBackupWriter] = None
+) -> Dict[str, Any]:
+    """
+    Executa todas as migrações de formulário presentes em um registro legado.
+    
+    Args:
+        service: Serviço de migração
+        record: Registro com o ID do processo e os dados legados por formulário
+        backups: Writer que recebe os dados legados de cada formulário antes
+            da migração (opcional); a gravação acontece em segundo plano
+        
+    Returns:
+        Dict com o resultado por formulário
+    """
+    process_id = record_process_id(record)
+    started = time.perf_counter()
+    forms = {}
+    
+    for form_name in FORMS:
+        old_data = record.get(form_name)
+        if old_data is None:
+            continue
+        if backups is not None:
+            backups.submit(form_name, process_id, old_data)
+        result = service.migrate_form(form_name, old_data, process_id)
+        forms[form_name] = {
+            "success": result["success"],
+            "errors": result["errors"]
+        }
+        
+    return {
+        "process_id": process_id,
+        "success": bool(forms) and all(form["success"] for form in forms.values()),
+        "forms": forms,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+def _migrate_chunk(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Migra um bloco de registros no worker.
+    
+    Com backups ativos, o bloco só retorna depois que os backups dele estão
+    em disco, antes do checkpoint no diário. Formulários cujo backup falhou
+    são marcados com "backup_failed".
+    
+    Returns:
+        Dict com o resultado de cada registro ("results") e as métricas do
+        worker registradas durante o bloco ("metrics", ver MigrationMetrics.state)
+    """
+    service, backups = _worker["service"], _worker.get("backups")
+    results = [migrate_record(service, record, backups) for record in records]
+    if backups is not None:
+        failed = set(backups.barrier())
+        for result in results:
+            for form_name, form in result["forms"].items():
+                if (result["process_id"], form_name) in failed:
+                    form["backup_failed"] = True
+    return {"results": results, "metrics": service.metrics.state(reset=True)}
+
+def dry_run_record(service: MigrationService, record: Dict[str, Any], max_changes: int = 20) -> Dict[str, Any]:
+    """
+    Simula a migração de um registro legado e a compara com o já gravado.
+    
+    Args:
+        service: Serviço de migração (nada é gravado na persistência dele)
+        record: Registro com o ID do processo e os dados legados por formulário
+        max_changes: Máximo de diferenças relatadas por formulário
+        
+    Returns:
+        Entrada do relatório de diferenças (ver dry_run.diff_process)
+    """
+    process_id = record_process_id(record)
+    forms = {name: record[name] for name in FORMS if record.get(name) is not None}
+    preview = service.preview_process(forms, process_id)
+    persisted = service.persistence.load_process(process_id) if process_id else {}
+    return diff_process(preview, persisted, limit=max_changes)
+
+def _dry_run_chunk(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Simula a migração de um bloco de registros no worker."""
+    service = _worker["service"]
+    return [dry_run_record(service, record) for record in records]
+
+@dataclass
+class MigrationProgress:
+    """Progresso de uma migração em lote."""
+    total: Optional[int] = None
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    backup_failed: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @property
+    def elapsed(self) -> float:
+        """Tempo decorrido em segundos."""
+        return time.perf_counter() - self.started_at
+    
+    @property
+    def throughput(self) -> float:
+        """Processos migrados por segundo."""
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+    
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Tempo restante estimado, quando o total é conhecido."""
+        if self.total is None or not self.throughput:
+            return None
+        return max(self.total - self.processed, 0) / self.throughput
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo serializável do progresso."""
+        eta = self.eta_seconds
+        return {
+            "total": self.total,
+            "processed": self.processed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "backup_failed": self.backup_failed,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_per_s": round(self.throughput, 2),
+            "eta_s": round(eta, 1) if eta is not None else None,
+            "failures": self.failures
+        }
+
+class MigrationBatchRunner:
+    """Executa as migrações de muitos processos legados em um pool de processos."""
+    
+    def __init__(
+        self,
+        storage_path: str = "data/migrations",
+        max_workers: Optional[int] = None,
+        chunk_size: int = 50,
+        max_pending_chunks: Optional[int] = None,
+        journal_path: Optional[str] = None,
+        backup_dir: Optional[str] = None,
+        metrics: Optional[MigrationMetrics] = None
+    ):
+        """
+        Inicializa o runner.
+        
+        Args:
+            storage_path: Pasta de destino dos dados migrados
+            max_workers: Número de processos do pool (padrão: CPUs disponíveis)
+            chunk_size: Registros enviados a um worker por tarefa
+            max_pending_chunks: Blocos em andamento ao mesmo tempo (padrão: 2x workers)
+            journal_path: Diário de checkpoints; se informado, a execução é
+                retomável e pula formulários já migrados com o mesmo conteúdo
+            backup_dir: Pasta de backups; se informada, os dados legados de
+                cada formulário são copiados em segundo plano antes da migração
+            metrics: Métricas onde somar as dos workers (padrão: novas métricas)
+        """
+        self.storage_path = storage_path
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.journal_path = journal_path
+        self.backup_dir = backup_dir
+        self.metrics = metrics or MigrationMetrics()
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def _chunks(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Agrupa o fluxo de registros em blocos, sem materializá-lo."""
+        iterator = iter(records)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+    
+    @staticmethod
+    def _pending_records(
+        records: Iterable[Dict[str, Any]],
+        journal: CheckpointJournal,
+        progress: MigrationProgress,
+        hashes: Dict[str, Dict[str, str]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Remove dos registros os formulários já concluídos segundo o diário."""
+        for record in records:
+            process_id = record_process_id(record)
+            pending = {}
+            for form_name in FORMS:
+                old_data = record.get(form_name)
+                if old_data is None:
+                    continue
+                digest = content_hash(old_data)
+                if not journal.is_completed(process_id, form_name, digest):
+                    pending[form_name] = digest
+                    
+            if not pending:
+                progress.skipped += 1
+                continue
+            hashes[process_id] = pending
+            trimmed = {name: record[name] for name in pending}
+            trimmed["id"] = process_id
+            yield trimmed
+    
+    def run(
+        self,
+        records: Iterable[Dict[str, Any]],
+        total: Optional[int] = None,
+        on_progress: Optional[Callable[[MigrationProgress], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Migra um fluxo de registros legados.
+        
+        Args:
+            records: Registros legados (pode ser um gerador)
+            total: Quantidade total de registros, se conhecida (para o ETA)
+            on_progress: Callback chamado a cada bloco concluído
+            
+        Returns:
+            Dict com throughput, falhas, tempos da execução e as métricas
+            por formulário somadas de todos os workers
+        """
+        progress = MigrationProgress(total=total)
+        journal = CheckpointJournal(self.journal_path) if self.journal_path else None
+        # Hashes dos formulários em andamento, gravados no diário ao concluir
+        hashes: Dict[str, Dict[str, str]] = {}
+        if journal is not None:
+            records = self._pending_records(records, journal, progress, hashes)
+        
+        self._execute(
+            records,
+            _migrate_chunk,
+            lambda done: self._collect(done, progress, on_progress, journal, hashes),
+            backup_dir=self.backup_dir
+        )
+        if journal is not None:
+            journal.close()
+        summary = progress.to_dict()
+        summary["metrics"] = self.metrics.snapshot()
+        self.logger.info(
+            f"Batch migration finished: {progress.succeeded} succeeded, "
+            f"{progress.failed} failed, {progress.skipped} skipped, "
+            f"{summary['throughput_per_s']} processes/s"
+        )
+        return summary
+    
+    def dry_run(
+        self,
+        records: Iterable[Dict[str, Any]],
+        report_path: str,
+        total: Optional[int] = None,
+        on_progress: Optional[Callable[[MigrationProgress], None]] = None,
+        include_unchanged: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Simula a migração de um fluxo de registros, sem gravar nada.
+        
+        Os workers mapeiam e validam os registros em paralelo e comparam o
+        resultado com o que já está gravado; as diferenças de cada processo
+        são gravadas no relatório à medida que os blocos terminam.
+        
+        Args:
+            records: Registros legados (pode ser um gerador)
+            report_path: Arquivo do relatório de diferenças (JSON Lines)
+            total: Quantidade total de registros, se conhecida (para o ETA)
+            on_progress: Callback chamado a cada bloco concluído
+            include_unchanged: Grava também os processos sem alterações
+            
+        Returns:
+            Dict com totais por situação (unchanged, changed, new, invalid),
+            throughput e caminho do relatório
+        """
+        progress = MigrationProgress(total=total)
+        
+        def collect(done) -> None:
+            for future in done:
+                for entry in future.result():
+                    progress.processed += 1
+                    report.write(entry)
+                if on_progress:
+                    on_progress(progress)
+                    
+        with DiffReport(report_path, include_unchanged=include_unchanged) as report:
+            self._execute(records, _dry_run_chunk, collect, read_only=True)
+            
+        summary = dict(
+            report.totals,
+            processed=progress.processed,
+            elapsed_s=round(progress.elapsed, 3),
+            throughput_per_s=round(progress.throughput, 2),
+            report=str(report.path)
+        )
+        self.logger.info(
+            f"Dry run finished: {report.totals['changed']} changed, {report.totals['new']} new, "
+            f"{report.totals['invalid']} invalid, {report.totals['unchanged']} unchanged"
+        )
+        return summary
+    
+    def _execute(
+        self,
+        records: Iterable[Dict[str, Any]],
+        task: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        collect: Callable[[Iterable], None],
+        backup_dir: Optional[str] = None,
+        read_only: bool = False
+    ) -> None:
+        """
+        Envia os blocos de registros ao pool e entrega os concluídos a collect.
+        
+        Com read_only, os workers abrem o armazenamento só para leitura.
+        """
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.storage_path, backup_dir, read_only)
+        ) as pool:
+            max_pending = self.max_pending_chunks or 2 * (self.max_workers or os.cpu_count() or 1)
+            pending = set()
+            
+            for chunk in self._chunks(records, self.chunk_size):
+                # Limita blocos em andamento: o fluxo de entrada é lido sob demanda
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(task, chunk))
+                
+            done, _ = wait(pending)
+            collect(done)
+    
+    def _collect(
+        self,
+        futures: Iterable,
+        progress: MigrationProgress,
+        on_progress: Optional[Callable[[MigrationProgress], None]],
+        journal: Optional[CheckpointJournal] = None,
+        hashes: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> None:
+        """Contabiliza os resultados dos blocos concluídos."""
+        for future in futures:
+            chunk = future.result()
+            self.metrics.merge(chunk["metrics"])
+            for result in chunk["results"]:
+                progress.processed += 1
+                progress.backup_failed += sum(1 for form in result["forms"].values() if form.get("backup_failed"))
+                if journal is not None:
+                    digests = hashes.pop(result["process_id"], {})
+                    for name, form in result["forms"].items():
+                        journal.record(
+                            result["process_id"],
+                            name,
+                            SUCCESS if form["success"] else FAILED,
+                            digests.get(name)
+                        )
+                if result["success"]:
+                    progress.succeeded += 1
+                else:
+                    progress.failed += 1
+                    progress.failures.append({
+                        "process_id": result["process_id"],
+                        "forms": {
+                            name: form["errors"]
+                            for name, form in result["forms"].items()
+                            if not form["success"]
+                        }
+                    })
+                    
+            if journal is not None:
+                journal.sync()
+            eta = progress.eta_seconds
+            self.logger.info(
+                f"Migrated {progress.processed}"
+                f"{'/' + str(progress.total) if progress.total else ''} processes "
+                f"({progress.throughput:.1f}/s"
+                f"{f', ETA {eta:.0f}s' if eta is not None else ''})"
+            )
+            if on_progress:
+                on_progress(progress)
@@ -0,0 +1,149 @@
+"""Diário de checkpoints para migrações retomáveis."""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union, IO
+import hashlib
+import json
+import os
+
+from src.utils.atomic_write import atomic_write
+
+SUCCESS = "success"
+FAILED = "failed"
+
+def content_hash(data: Any) -> str:
+    """Hash estável do conteúdo legado de um formulário."""
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CheckpointJournal:
+    """
+    Diário append-only com o resultado de cada formulário migrado.
+    
+    Cada linha registra (process_id, form, status, hash do conteúdo). Ao
+    abrir, o diário é lido uma vez para um dict em memória: consultar se um
+    item já foi concluído é O(1). Um item só conta como concluído se a
+    última entrada for de sucesso e o hash bater com o conteúdo atual, então
+    falhas e registros alterados na origem são migrados de novo.
+    """
+    
+    def __init__(self, path: Union[str, Path], fsync: bool = True):
+        """
+        Inicializa o diário.
+        
+        Args:
+            path: Caminho do arquivo JSONL do diário
+            fsync: Se True, sync() força as entradas em disco
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self._completed: Dict[Tuple[str, str], str] = {}
+        self._failed = set()
+        self._file: Optional[IO[str]] = None
+        self._load()
+    
+    def _load(self) -> None:
+        """Reconstrói o estado a partir das entradas gravadas."""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha pode estar truncada após uma interrupção
+                    continue
+                self._apply(entry["process_id"], entry["form"], entry["status"], entry.get("hash"))
+    
+    def _apply(self, process_id: str, form: str, status: str, digest: Optional[str]) -> None:
+        """Aplica uma entrada ao estado em memória."""
+        key = (process_id, form)
+        if status == SUCCESS:
+            self._completed[key] = digest
+            self._failed.discard(key)
+        else:
+            self._completed.pop(key, None)
+            self._failed.add(key)
+    
+    def _ends_with_newline(self) -> bool:
+        """Verifica se o diário termina em uma linha completa."""
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def is_completed(self, process_id: str, form: str, digest: str) -> bool:
+        """
+        Verifica se o formulário já foi migrado com este conteúdo.
+        
+        Args:
+            process_id: ID do processo
+            form: Nome do formulário
+            digest: Hash do conteúdo legado atual
+            
+        Returns:
+            bool: True se pode ser pulado
+        """
+        return self._completed.get((process_id, form)) == digest
+    
+    def record(self, process_id: str, form: str, status: str, digest: str) -> None:
+        """
+        Acrescenta uma entrada ao diário.
+        
+        Args:
+            process_id: ID do processo
+            form: Nome do formulário
+            status: "success" ou "failed"
+            digest: Hash do conteúdo legado migrado
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            if self._file.tell() and not self._ends_with_newline():
+                self._file.write("\n")  # Isola uma linha truncada
+        entry = {
+            "process_id": process_id,
+            "form": form,
+            "status": status,
+            "hash": digest,
+            "at": datetime.now().isoformat()
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._apply(process_id, form, status, digest)
+    
+    def sync(self) -> None:
+        """Grava as entradas pendentes; chamado a cada bloco concluído."""
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        """Sincroniza e fecha o arquivo do diário."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+    
+    def compact(self) -> None:
+        """Reescreve o diário só com a última entrada de cada item."""
+        self.close()
+        with atomic_write(self.path, fsync=self.fsync) as f:
+            for (process_id, form), digest in self._completed.items():
+                f.write(json.dumps({
+                    "process_id": process_id, "form": form, "status": SUCCESS, "hash": digest
+                }, ensure_ascii=False) + "\n")
+            for process_id, form in self._failed:
+                f.write(json.dumps({
+                    "process_id": process_id, "form": form, "status": FAILED, "hash": None
+                }, ensure_ascii=False) + "\n")
+    
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de itens concluídos e com falha."""
+        return {"completed": len(self._completed), "failed": len(self._failed)}
+    
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
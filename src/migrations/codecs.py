@@ -0,0 +1,130 @@
+"""Codecs de serialização dos formulários armazenados."""
+from typing import Dict, Any, Optional, Union
+import gzip
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Cabeçalho dos formatos binários: MAGIC + codificação + compressão.
+# JSON sem compressão é gravado sem cabeçalho, como texto puro.
+MAGIC = b"RPA\x01"
+
+ENCODINGS = {"json": b"j", "msgpack": b"m"}
+COMPRESSIONS = {None: b"n", "gzip": b"g", "zstd": b"z"}
+
+class StorageCodec:
+    """
+    Converte documentos em bytes e de volta.
+    
+    O formato é autodescritivo: decode() lê qualquer combinação de
+    codificação e compressão, inclusive o JSON indentado dos arquivos
+    antigos, independente do codec usado para gravar.
+    """
+    
+    def __init__(
+        self,
+        encoding: str = "json",
+        compression: Optional[str] = None,
+        level: Optional[int] = None,
+        indent: Optional[int] = None
+    ):
+        """
+        Inicializa o codec.
+        
+        Args:
+            encoding: "json" (compacto) ou "msgpack"
+            compression: None, "gzip" ou "zstd"
+            level: Nível de compressão (padrão da biblioteca se None)
+            indent: Indentação do JSON; None grava compacto
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        _require(encoding)
+        _require(compression)
+        self.encoding = encoding
+        self.compression = compression
+        self.level = level
+        self.indent = indent
+    
+    @property
+    def name(self) -> str:
+        """Nome do codec, no formato aceito por get_codec()."""
+        return f"{self.encoding}+{self.compression}" if self.compression else self.encoding
+    
+    def encode(self, document: Dict[str, Any]) -> bytes:
+        """Serializa um documento."""
+        if self.encoding == "msgpack":
+            payload = msgpack.packb(document, use_bin_type=True, default=str)
+        elif self.indent is not None:
+            payload = json.dumps(document, indent=self.indent, ensure_ascii=False).encode("utf-8")
+        else:
+            payload = json.dumps(document, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            
+        if self.encoding == "json" and self.compression is None:
+            return payload
+        if self.compression == "gzip":
+            payload = gzip.compress(payload, compresslevel=9 if self.level is None else self.level)
+        elif self.compression == "zstd":
+            payload = zstandard.ZstdCompressor(level=3 if self.level is None else self.level).compress(payload)
+        return MAGIC + ENCODINGS[self.encoding] + COMPRESSIONS[self.compression] + payload
+    
+    @staticmethod
+    def decode(data: Union[bytes, str]) -> Dict[str, Any]:
+        """Lê um documento gravado por qualquer codec."""
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data.startswith(MAGIC):
+            return json.loads(data)
+            
+        encoding = data[len(MAGIC):len(MAGIC) + 1]
+        compression = data[len(MAGIC) + 1:len(MAGIC) + 2]
+        payload = data[len(MAGIC) + 2:]
+        if compression == COMPRESSIONS["gzip"]:
+            payload = gzip.decompress(payload)
+        elif compression == COMPRESSIONS["zstd"]:
+            _require("zstd")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif compression != COMPRESSIONS[None]:
+            raise ValueError(f"Unknown compression flag: {compression!r}")
+            
+        if encoding == ENCODINGS["msgpack"]:
+            _require("msgpack")
+            return msgpack.unpackb(payload, raw=False)
+        if encoding == ENCODINGS["json"]:
+            return json.loads(payload)
+        raise ValueError(f"Unknown encoding flag: {encoding!r}")
+
+def _require(name: Optional[str]) -> None:
+    """Falha com mensagem clara quando a dependência opcional não está instalada."""
+    if name == "msgpack" and msgpack is None:
+        raise RuntimeError("msgpack não está instalado")
+    if name == "zstd" and zstandard is None:
+        raise RuntimeError("zstandard não está instalado")
+
+def get_codec(spec: Union[str, StorageCodec, None]) -> StorageCodec:
+    """
+    Obtém um codec pelo nome.
+    
+    Args:
+        spec: "json", "msgpack", "json+gzip", "msgpack+zstd"... ou um
+            StorageCodec; None retorna JSON compacto
+            
+    Returns:
+        StorageCodec
+    """
+    if isinstance(spec, StorageCodec):
+        return spec
+    if not spec:
+        return StorageCodec()
+    encoding, _, compression = spec.partition("+")
+    return StorageCodec(encoding, compression or None)
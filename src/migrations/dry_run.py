@@ -0,0 +1,138 @@
+"""Simulação da migração: diferenças entre o resultado e os dados já gravados."""
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+import json
+
+from src.migrations.persistence import RAW_FORMS
+
+# Situação de um processo no relatório
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+NEW = "new"
+INVALID = "invalid"
+
+def diff_documents(old: Any, new: Any, path: str = "", limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Diferenças entre dois documentos JSON.
+    
+    Args:
+        old: Documento gravado
+        new: Documento resultante da migração
+        path: Caminho do documento (prefixo das chaves)
+        limit: Máximo de diferenças retornadas
+        
+    Returns:
+        Lista de {"path", "op" (added, removed, changed), "old", "new"}
+    """
+    changes: List[Dict[str, Any]] = []
+    _diff(old, new, path, changes, limit)
+    return changes
+
+def _diff(old: Any, new: Any, path: str, changes: List[Dict[str, Any]], limit: int) -> None:
+    if len(changes) >= limit or old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in list(old) + [key for key in new if key not in old]:
+            child = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append({"path": child, "op": "removed", "old": old[key]})
+            elif key not in old:
+                changes.append({"path": child, "op": "added", "new": new[key]})
+            else:
+                _diff(old[key], new[key], child, changes, limit)
+            if len(changes) >= limit:
+                return
+    elif isinstance(old, list) and isinstance(new, list):
+        for index in range(max(len(old), len(new))):
+            child = f"{path}[{index}]"
+            if index >= len(new):
+                changes.append({"path": child, "op": "removed", "old": old[index]})
+            elif index >= len(old):
+                changes.append({"path": child, "op": "added", "new": new[index]})
+            else:
+                _diff(old[index], new[index], child, changes, limit)
+            if len(changes) >= limit:
+                return
+    else:
+        changes.append({"path": path, "op": "changed", "old": old, "new": new})
+
+def diff_process(
+    preview: Dict[str, Any],
+    persisted: Dict[str, Optional[Dict[str, Any]]],
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Compara a simulação de um processo com os formulários já gravados.
+    
+    Args:
+        preview: Resultado de MigrationService.preview_process
+        persisted: Formulários gravados (MigrationPersistence.load_process)
+        limit: Máximo de diferenças por formulário
+        
+    Returns:
+        Entrada do relatório: situação do processo e, por formulário que
+        não ficaria igual, erros de validação ou diferenças
+    """
+    forms = {}
+    existing = False
+    for form_name, result in preview["forms"].items():
+        stored = persisted.get(form_name)
+        if stored is not None and form_name not in RAW_FORMS:
+            stored = stored.get("data")
+        existing = existing or stored is not None
+        if not result["success"]:
+            forms[form_name] = {"status": INVALID, "errors": result["errors"]}
+        elif stored is None:
+            forms[form_name] = {"status": NEW}
+        else:
+            changes = diff_documents(stored, preview["staged"][form_name], limit=limit)
+            if changes:
+                forms[form_name] = {"status": CHANGED, "changes": changes}
+                
+    statuses = {form["status"] for form in forms.values()}
+    if INVALID in statuses or not preview["forms"]:
+        status = INVALID
+    elif not existing:
+        status = NEW
+    else:
+        status = CHANGED if statuses else UNCHANGED
+    return {"process_id": preview["process_id"], "status": status, "forms": forms}
+
+class DiffReport:
+    """
+    Relatório da simulação, gravado em disco à medida que os processos
+    são comparados (uma linha JSON por processo que mudaria).
+    
+    Processos sem alterações só entram nos totais, mantendo o arquivo
+    pequeno mesmo para bases muito grandes.
+    """
+    
+    def __init__(self, path: Union[str, Path], include_unchanged: bool = False):
+        """
+        Abre o relatório.
+        
+        Args:
+            path: Arquivo do relatório (JSON Lines)
+            include_unchanged: Grava também os processos sem alterações
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.include_unchanged = include_unchanged
+        self.totals = {UNCHANGED: 0, CHANGED: 0, NEW: 0, INVALID: 0}
+        self._file = open(self.path, "w", encoding="utf-8")
+    
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Registra a entrada de um processo."""
+        self.totals[entry["status"]] += 1
+        if entry["status"] != UNCHANGED or self.include_unchanged:
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+    
+    def close(self) -> None:
+        """Fecha o arquivo do relatório."""
+        self._file.close()
+    
+    def __enter__(self) -> "DiffReport":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,9 +1,24 @@
 """Módulo para gerenciar feature flags da migração."""
+from contextlib import contextmanager
 from enum import Enum
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+import hashlib
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
+from src.utils.atomic_write import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+# Valor de um flag: bool, ou rollout {"enabled", "percentage", "processes"}
+FlagValue = Union[bool, Dict[str, Any]]
+
 class MigrationFlag(Enum):
     """Flags para controle da migração."""
     USE_NEW_FORMS = "use_new_forms"
@@ -17,47 +32,171 @@ class MigrationFlag(Enum):
     RISKS_MIGRATED = "risks_migrated"
     DOCUMENTATION_MIGRATED = "documentation_migrated"
 
+def rollout_bucket(flag: MigrationFlag, process_id: str) -> int:
+    """Faixa estável (0-99) de um processo no rollout de um flag."""
+    digest = hashlib.sha256(f"{flag.value}:{process_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % 100
+
+def _default_flags() -> Dict[str, FlagValue]:
+    return {flag.value: False for flag in MigrationFlag}
+
+def _set_flag(flag: MigrationFlag, value: FlagValue) -> Callable[[Dict[str, FlagValue]], None]:
+    """Alteração que define o valor de um flag."""
+    def change(flags: Dict[str, FlagValue]) -> None:
+        flags[flag.value] = value
+    return change
+
+def _reset_flags(flags: Dict[str, FlagValue]) -> None:
+    """Alteração que volta todos os flags para desativado."""
+    flags.clear()
+    flags.update(_default_flags())
+
+class _FlagStore:
+    """
+    Flags de um arquivo, compartilhados pelos gerenciadores do processo.
+    
+    A leitura usa um snapshot imutável, trocado por inteiro a cada
+    recarga, então não precisa de lock. Alterações feitas por outros
+    processos são detectadas pelo mtime/tamanho/inode do arquivo, consultado
+    no máximo a cada check_interval segundos.
+    """
+    
+    def __init__(self, path: Path, check_interval: float):
+        self.path = path
+        self.lock_path = path.with_name(f".{path.name}.lock")
+        self.check_interval = check_interval
+        self.snapshot: Dict[str, FlagValue] = {}
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        # Sob o lock de arquivo: dois processos iniciando juntos não gravam os padrões ao mesmo tempo
+        with self._lock, self._file_lock():
+            if not self._reload():
+                self._write(_default_flags())
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+    
+    def _reload(self) -> bool:
+        """Relê o arquivo se mudou; retorna False se ele não existe."""
+        stamp = self._file_stamp()
+        if stamp is None:
+            return False
+        if stamp != self._stamp:
+            with open(self.path, "r", encoding="utf-8") as f:
+                flags = json.load(f)
+            self.snapshot = flags
+            self._stamp = stamp
+        return True
+    
+    def _write(self, flags: Dict[str, FlagValue]) -> None:
+        with atomic_write(self.path) as f:
+            json.dump(flags, f, indent=4)
+        self.snapshot = flags
+        self._stamp = self._file_stamp()
+    
+    def current(self) -> Dict[str, FlagValue]:
+        """Snapshot atual, recarregado se o arquivo mudou desde a última consulta."""
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.check_interval
+                self._reload()
+            except (OSError, ValueError):
+                pass  # Mantém o último snapshot válido
+            finally:
+                self._lock.release()
+        return self.snapshot
+    
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusão entre processos durante leitura-alteração-escrita."""
+        if fcntl is None:
+            yield
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def update(self, change: Callable[[Dict[str, FlagValue]], None]) -> None:
+        """Aplica uma alteração sobre a versão em disco e grava atomicamente."""
+        with self._lock, self._file_lock():
+            self._reload()
+            flags = dict(self.snapshot)
+            change(flags)
+            self._write(flags)
+
+_stores: Dict[Path, _FlagStore] = {}
+_stores_lock = threading.Lock()
+
+def _shared_store(path: Path, check_interval: float) -> _FlagStore:
+    """Store do arquivo; se já existe, passa a usar o menor check_interval pedido."""
+    key = path.resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = _FlagStore(path, check_interval)
+        elif check_interval < store.check_interval:
+            store.check_interval = check_interval
+            store._next_check = 0.0
+        return store
+
 class FeatureFlagManager:
-    """Gerenciador de feature flags."""
+    """
+    Gerenciador de feature flags.
+    
+    Instâncias com o mesmo arquivo compartilham o store: uma alteração é
+    vista imediatamente pelas demais no processo e, em até check_interval
+    segundos (o menor entre os gerenciadores do arquivo), pelos outros
+    processos. Gravações são atômicas e, em POSIX,
+    serializadas entre processos, sem perder alterações concorrentes.
+    
+    Além de ligado/desligado, um flag pode ser liberado para uma
+    porcentagem dos processos ou para processos específicos (rollout).
+    """
     
-    def __init__(self, config_file: str = "config/feature_flags.json"):
+    def __init__(self, config_file: str = "config/feature_flags.json", check_interval: float = 1.0):
         """
         Inicializa o gerenciador.
         
         Args:
             config_file: Caminho para arquivo de configuração
+            check_interval: Intervalo mínimo, em segundos, entre verificações
+                de alterações feitas por outros processos
         """
         self.config_file = Path(config_file)
-        self._flags: Dict[str, bool] = {}
-        self._load_flags()
-    
-    def _load_flags(self) -> None:
-        """Carrega flags do arquivo de configuração."""
-        if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                self._flags = json.load(f)
-        else:
-            # Inicializa com todos os flags desativados
-            self._flags = {flag.value: False for flag in MigrationFlag}
-            self._save_flags()
-    
-    def _save_flags(self) -> None:
-        """Salva flags no arquivo de configuração."""
-        self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self._flags, f, indent=4)
-    
-    def is_enabled(self, flag: MigrationFlag) -> bool:
+        self._store = _shared_store(self.config_file, check_interval)
+    
+    def is_enabled(self, flag: MigrationFlag, process_id: Optional[str] = None) -> bool:
         """
         Verifica se um flag está ativado.
         
         Args:
             flag: Flag a ser verificado
+            process_id: ID do processo, considerado em flags com rollout
             
         Returns:
             bool: True se ativado, False caso contrário
         """
-        return self._flags.get(flag.value, False)
+        value = self._store.current().get(flag.value, False)
+        if not isinstance(value, dict):
+            return bool(value)
+        if value.get("enabled"):
+            return True
+        if process_id is None:
+            return False
+        return (
+            process_id in value.get("processes", ())
+            or rollout_bucket(flag, process_id) < value.get("percentage", 0)
+        )
     
     def enable(self, flag: MigrationFlag) -> None:
         """
@@ -66,8 +205,7 @@ class FeatureFlagManager:
         Args:
             flag: Flag a ser ativado
         """
-        self._flags[flag.value] = True
-        self._save_flags()
+        self._store.update(_set_flag(flag, True))
     
     def disable(self, flag: MigrationFlag) -> None:
         """
@@ -76,15 +214,33 @@ class FeatureFlagManager:
         Args:
             flag: Flag a ser desativado
         """
-        self._flags[flag.value] = False
-        self._save_flags()
+        self._store.update(_set_flag(flag, False))
+    
+    def set_rollout(
+        self,
+        flag: MigrationFlag,
+        percentage: int = 0,
+        processes: Iterable[str] = ()
+    ) -> None:
+        """
+        Ativa um flag só para parte dos processos.
+        
+        Args:
+            flag: Flag a ser liberado
+            percentage: Porcentagem (0-100) dos processos, escolhidos de
+                forma estável pelo hash do ID
+            processes: IDs de processos sempre incluídos
+        """
+        if not 0 <= percentage <= 100:
+            raise ValueError(f"Invalid rollout percentage: {percentage}")
+        rollout = {"enabled": False, "percentage": percentage, "processes": sorted(set(processes))}
+        self._store.update(_set_flag(flag, rollout))
     
     def reset_all(self) -> None:
         """Reseta todos os flags para desativado."""
-        self._flags = {flag.value: False for flag in MigrationFlag}
-        self._save_flags()
+        self._store.update(_reset_flags)
     
     @property
-    def status(self) -> Dict[str, bool]:
-        """Retorna status atual de todos os flags."""
-        return self._flags.copy() 
\ No newline at end of file
+    def status(self) -> Dict[str, FlagValue]:
+        """Retorna status atual de todos os flags (bool ou configuração de rollout)."""
+        return dict(self._store.current())
@@ -0,0 +1,100 @@
+"""Cache de leitura dos formulários persistidos."""
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Hashable
+import threading
+
+CacheKey = Tuple[str, str]
+
+def copy_document(value: Any) -> Any:
+    """Copia um documento JSON (dicts, listas e escalares), bem mais rápido que deepcopy."""
+    if isinstance(value, dict):
+        return {key: copy_document(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_document(item) for item in value]
+    return value
+
+class FormCache:
+    """
+    Cache LRU de documentos por (process_id, formulário).
+    
+    Cada entrada guarda o token de versão informado pelo backend no momento
+    da leitura (ex.: mtime, tamanho e inode do arquivo). Uma entrada só é
+    usada se o token atual for igual, então alterações feitas por outros
+    processos são detectadas sem reler o arquivo. As gravações da própria
+    persistência invalidam a entrada diretamente.
+    """
+    
+    def __init__(self, max_size: int = 1024):
+        """
+        Inicializa o cache.
+        
+        Args:
+            max_size: Número máximo de documentos em memória
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[CacheKey, Tuple[Hashable, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+    
+    def get(self, key: CacheKey, token: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Obtém uma cópia do documento se a versão em cache ainda for válida.
+        
+        Args:
+            key: (process_id, formulário)
+            token: Versão atual informada pelo backend
+            
+        Returns:
+            Documento ou None se ausente/desatualizado
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != token:
+                del self._entries[key]
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            document = entry[1]
+        return copy_document(document)
+    
+    def put(self, key: CacheKey, token: Hashable, document: Dict[str, Any]) -> None:
+        """Armazena um documento lido com o token de versão correspondente."""
+        document = copy_document(document)
+        with self._lock:
+            self._entries[key] = (token, document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key: CacheKey) -> None:
+        """Descarta a entrada de um formulário."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Descarta todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de uso do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
@@ -0,0 +1,218 @@
+"""Registro dos formulários da migração: mapeamento, validação e armazenamento."""
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class FormSpec:
+    """
+    Como um formulário é migrado e gravado.
+    
+    Attributes:
+        name: Nome do formulário (chave dos registros legados)
+        label: Nome usado nos logs
+        mapper: Método do DataMapper (e do MappingSpecMapper)
+        validator: Método do DataValidator
+        filename: Arquivo do formulário dentro da pasta do processo
+        envelope: Se os dados são gravados dentro de {"data", "metadata"}
+        check_input: Verificação dos dados legados; retorna a mensagem de
+            erro ou None
+        adjust: Ajuste dos dados mapeados (recebe dados legados e mapeados)
+        check_output: Verificação dos dados mapeados, após a validação
+        rollback_on_failure: Se uma falha remove o formulário já gravado
+        keyed: Se o ID do processo vem do próprio formulário (campo "id")
+    """
+    name: str
+    label: str
+    mapper: str
+    validator: str
+    filename: str
+    envelope: bool = True
+    check_input: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None
+    adjust: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    check_output: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None
+    rollback_on_failure: bool = False
+    keyed: bool = False
+    
+    def prepare(self, old_data: Dict[str, Any], process_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Dados legados a migrar para o processo.
+        
+        Em formulários keyed sem o campo "id", ele é preenchido com o ID do
+        processo (os dados originais não são alterados).
+        """
+        if self.keyed and process_id is not None and "id" not in old_data:
+            return dict(old_data, id=process_id)
+        return old_data
+    
+    def map(self, mapper: Any, old_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Mapeia os dados legados do formulário.
+        
+        Args:
+            mapper: DataMapper (ou MappingSpecMapper)
+            old_data: Dados no formato antigo
+            
+        Returns:
+            Dict com os dados mapeados
+            
+        Raises:
+            ValueError: Se os dados legados forem recusados por check_input
+        """
+        if self.check_input is not None:
+            error = self.check_input(old_data)
+            if error:
+                raise ValueError(error)
+        mapped = getattr(mapper, self.mapper)(old_data)
+        if self.adjust is not None:
+            self.adjust(old_data, mapped)
+        return mapped
+    
+    def validate(self, validator: Any, mapped: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Valida os dados mapeados do formulário.
+        
+        Args:
+            validator: DataValidator
+            mapped: Dados mapeados
+            
+        Returns:
+            Tuple com validade e erros no formato "campo: erro"
+        """
+        is_valid, errors = getattr(validator, self.validator)(mapped)
+        if not is_valid:
+            return False, [f"{field}: {error}" for field, error in errors.items()]
+        if self.check_output is not None:
+            error = self.check_output(mapped)
+            if error:
+                return False, [error]
+        return True, []
+
+def _force_automated(old_data: Dict[str, Any], mapped: Dict[str, Any]) -> None:
+    mapped["process_type"] = "automated"
+
+def _business_rules_from_legacy(old_data: Dict[str, Any], mapped: Dict[str, Any]) -> None:
+    # Garante que business_rules não está vazio e tem o tipo correto
+    if "business_rules" in old_data:
+        mapped["business_rules"] = [
+            {
+                "rule_id": rule.get("rule_id", ""),
+                "description": rule.get("description", ""),
+                "type": rule.get("implementation", {}).get("type", "validation"),
+                "priority": rule.get("priority", "medium")
+            }
+            for rule in old_data["business_rules"]
+        ]
+
+def _automation_goals_from_legacy(old_data: Dict[str, Any], mapped: Dict[str, Any]) -> None:
+    if "automation_goals" in old_data:
+        mapped["automation_goals"] = [
+            {
+                "goal_id": goal.get("goal_id", ""),
+                "description": goal.get("description", ""),
+                "category": goal.get("category", "efficiency"),
+                "priority_level": old_data.get("priority_level", "medium"),
+                "metrics": goal.get("metrics", {})
+            }
+            for goal in old_data.get("automation_goals", [])
+        ]
+
+def _invalid_goals(data: Dict[str, Any], goals: Any) -> bool:
+    for goal in goals:
+        if not goal.get("goal_id") or goal.get("category") == "invalid":
+            return True
+    return data.get("priority_level") == "invalid"
+
+def _check_automation_goals_input(old_data: Dict[str, Any]) -> Optional[str]:
+    if not old_data or "automation_goals" not in old_data or _invalid_goals(old_data, old_data["automation_goals"]):
+        return "Invalid input data"
+    return None
+
+def _check_automation_goals_output(mapped: Dict[str, Any]) -> Optional[str]:
+    goals = mapped.get("automation_goals")
+    if not goals or _invalid_goals(mapped, goals):
+        return "Invalid automation goals data"
+    return None
+
+# Formulários na ordem de migração
+FORMS: Dict[str, FormSpec] = {
+    spec.name: spec for spec in (
+        FormSpec(
+            "identification", "IdentificationForm", "map_identification_data",
+            "validate_identification_data", "identification.json",
+            rollback_on_failure=True, keyed=True
+        ),
+        FormSpec(
+            "process_details", "ProcessDetailsForm", "map_process_details_data",
+            "validate_process_details_data", "process_details.json", adjust=_force_automated
+        ),
+        FormSpec(
+            "business_rules", "BusinessRulesForm", "map_business_rules_data",
+            "validate_business_rules_data", "business_rules.json", adjust=_business_rules_from_legacy
+        ),
+        FormSpec(
+            "automation_goals", "AutomationGoalsForm", "map_automation_goals_data",
+            "validate_automation_goals_data", "automation_goals.json",
+            check_input=_check_automation_goals_input,
+            adjust=_automation_goals_from_legacy,
+            check_output=_check_automation_goals_output
+        ),
+        FormSpec("systems", "SystemsForm", "map_systems_data", "validate_systems_data", "systems.json"),
+        FormSpec("data", "DataForm", "map_data_form_data", "validate_data_form_data", "data_form.json", envelope=False),
+        FormSpec("steps", "StepsForm", "map_steps_data", "validate_steps_data", "steps_form.json", envelope=False),
+        FormSpec("risks", "RisksForm", "map_risks_data", "validate_risks_data", "risks.json"),
+        FormSpec(
+            "documentation", "DocumentationForm", "map_documentation_data",
+            "validate_documentation_data", "documentation.json"
+        )
+    )
+}
+
+def get_form(form_name: str) -> FormSpec:
+    """Especificação de um formulário (ValueError se não existir)."""
+    spec = FORMS.get(form_name)
+    if spec is None:
+        raise ValueError(f"Invalid form name: {form_name}")
+    return spec
+
+def add_form_methods(cls: type, action: str, factory: Callable[[str], Callable], doc: str) -> None:
+    """
+    Cria em cls um método <action>_<form>_form para cada formulário do registro.
+
+    Args:
+        cls: Classe que recebe os métodos
+        action: Prefixo dos nomes (ex.: "save")
+        factory: Recebe o nome do formulário e retorna a função do método
+        doc: Docstring, com {label} no lugar do nome do formulário
+    """
+    for form_name, spec in FORMS.items():
+        method = factory(form_name)
+        method.__name__ = f"{action}_{form_name}_form"
+        method.__qualname__ = f"{cls.__name__}.{method.__name__}"
+        method.__doc__ = doc.format(label=spec.label)
+        setattr(cls, method.__name__, method)
+
+def _save_method(form_name: str) -> Callable:
+    def method(self, data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
+        return self.save_form(process_id, form_name, data)
+    return method
+
+def _load_method(form_name: str) -> Callable:
+    def method(self, process_id: str) -> Optional[Dict[str, Any]]:
+        return self.load_form(process_id, form_name)
+    return method
+
+def _delete_method(form_name: str) -> Callable:
+    def method(self, process_id: str) -> Dict[str, Any]:
+        return self.delete_form(process_id, form_name)
+    return method
+
+def add_storage_methods(cls: type) -> type:
+    """
+    Decorador: cria save_<form>_form(data, process_id), load_<form>_form(process_id)
+    e delete_<form>_form(process_id), que chamam save_form, load_form e
+    delete_form da própria classe.
+    """
+    add_form_methods(cls, "save", _save_method, "Salva dados do {label} (ver save_form).")
+    add_form_methods(cls, "load", _load_method, "Carrega dados do {label} (ver load_form).")
+    add_form_methods(cls, "delete", _delete_method, "Remove dados do {label} (ver delete_form).")
+    return cls
@@ -0,0 +1,113 @@
+"""Módulo para leitura em streaming de exportações legadas."""
+from pathlib import Path
+from typing import Dict, Any, Iterator, IO, Union
+import gzip
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+def _open_text(path: PathLike) -> IO[str]:
+    """Abre o arquivo em modo texto, descompactando .gz quando necessário."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+def iter_jsonl(path: PathLike, skip_invalid: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Lê um arquivo JSONL registro a registro.
+    
+    Args:
+        path: Caminho do arquivo (.jsonl ou .jsonl.gz)
+        skip_invalid: Se True, ignora linhas inválidas em vez de falhar
+        
+    Yields:
+        Registros legados
+    """
+    with _open_text(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                if not skip_invalid:
+                    raise ValueError(f"Invalid JSON at {path}:{line_number}: {e}") from e
+                logger.warning(f"Skipping invalid JSON at {path}:{line_number}")
+
+def iter_json_array(path: PathLike, read_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Lê um arquivo com um array JSON de registros sem carregá-lo inteiro.
+    
+    O arquivo é lido em blocos de tamanho fixo e cada elemento do array é
+    decodificado assim que está completo no buffer, então a memória usada
+    é limitada pelo maior registro, não pelo arquivo.
+    
+    Args:
+        path: Caminho do arquivo (.json ou .json.gz)
+        read_size: Bytes lidos por vez
+        
+    Yields:
+        Registros legados
+    """
+    decoder = json.JSONDecoder()
+    with _open_text(path) as f:
+        buffer = ""
+        position = 0
+        started = False
+        eof = False
+        
+        while True:
+            # Pula espaços e, dentro do array, separadores
+            while position < len(buffer) and (
+                buffer[position].isspace() or (started and buffer[position] == ",")
+            ):
+                position += 1
+                
+            if position < len(buffer):
+                if not started:
+                    if buffer[position] != "[":
+                        raise ValueError(f"{path} does not contain a JSON array")
+                    started = True
+                    position += 1
+                    continue
+                if buffer[position] == "]":
+                    return
+                try:
+                    record, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise ValueError(f"Invalid JSON array element in {path}")
+                else:
+                    yield record
+                    continue
+            elif eof:
+                if started:
+                    raise ValueError(f"Truncated JSON array in {path}")
+                return
+                
+            # Elemento incompleto: descarta o já consumido e lê mais um bloco
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+def iter_legacy_records(path: PathLike) -> Iterator[Dict[str, Any]]:
+    """
+    Lê registros legados detectando o formato (JSONL ou array JSON).
+    
+    Args:
+        path: Caminho do arquivo
+        
+    Yields:
+        Registros legados
+    """
+    with _open_text(path) as f:
+        while (first_char := f.read(1)) and first_char.isspace():
+            pass
+            
+    if first_char == "[":
+        return iter_json_array(path)
+    return iter_jsonl(path)
@@ -0,0 +1,148 @@
+"""Benchmark do mapeamento em lote contra o mapeamento registro a registro."""
+from typing import Dict, Any, Optional, List
+import argparse
+import contextlib
+import gc
+import json
+import os
+import time
+
+from src.migrations.data_mapper import DataMapper
+from src.migrations.batch_mapper import BATCH_MAPPERS
+from src.migrations.form_registry import FORMS
+
+def sample_legacy_forms(number: int) -> Dict[str, Dict[str, Any]]:
+    """Formulários legados de um processo sintético."""
+    process_id = f"PROC-{number:06d}"
+    return {
+        "identification": {
+            "name": f"Processo {number}",
+            "id": process_id,
+            "department": "IT",
+            "owner": "John Doe",
+            "participants": ["Jane Doe"],
+            "created_at": "2024-01-01",
+            "status": "draft"
+        },
+        "process_details": {
+            "description": "Conciliação diária de pagamentos",
+            "objective": "Reduzir trabalho manual",
+            "frequency": "daily",
+            "volume": str(number % 1000),
+            "complexity": "Medium",
+            "scope_in": ["Pagamentos"]
+        },
+        "business_rules": {
+            "rules": [
+                {"id": f"BR{i:03d}", "description": f"Regra {i}", "type": "Validation", "priority": "High"}
+                for i in range(3)
+            ],
+            "validations": [{"field": "amount", "rule": "> 0", "error_message": "Valor inválido"}],
+            "calculations": [{"id": "CALC001", "name": "Total", "formula": "sum(amount)"}]
+        },
+        "automation_goals": {
+            "goals": [
+                {"id": "GOAL001", "description": "Reduzir tempo", "type": "efficiency",
+                 "metrics": {"current": "30 min", "target": "5 min", "unit": "time"}}
+            ],
+            "benefits": [{"type": "cost", "description": "Reduzir custos", "value": "50000"}],
+            "success_criteria": ["Tempo < 5 min", {"id": "SC001", "description": "Precisão"}],
+            "priority": "high"
+        },
+        "systems": {
+            "systems": [
+                {"id": "SYS001", "name": "SAP", "type": "ERP", "modules": ["FI"],
+                 "access": {"type": "SSO", "permissions": ["read"]}, "availability": {"hours": "24x7"}}
+            ],
+            "integrations": [{"source": "SAP", "target": "Excel", "type": "file", "data_flow": ["pagamentos"]}]
+        },
+        "data": {
+            "data_inputs": [
+                {"input_id": "INP001", "name": "Pagamentos", "type": "structured", "format": "CSV",
+                 "fields": [{"name": "amount", "type": "number", "required": True}]}
+            ],
+            "data_outputs": [{"output_id": "OUT001", "name": "Relatório", "format": "XLSX"}],
+            "data_quality": {"validation_rules": ["completeness"]}
+        },
+        "steps": {
+            "steps": [
+                {"id": f"STEP{i:03d}", "name": f"Passo {i}", "type": "manual", "role": "Analista",
+                 "dependencies": {"previous": [f"STEP{i - 1:03d}"] if i else []}}
+                for i in range(5)
+            ],
+            "flow": {"start_step": "STEP000", "end_step": "STEP004"},
+            "metrics": {"total_time": "2h", "handoffs": 2}
+        },
+        "risks": {
+            "risks": [
+                {"id": "RISK001", "description": "Sistema fora do ar", "impact": "high",
+                 "mitigation_plan": {"actions": ["Contingência manual"], "responsible": "TI"}}
+            ],
+            "monitoring": {"frequency": "weekly", "reporting": {"format": "PDF"}}
+        },
+        "documentation": {
+            "process_documentation": {
+                "version": "1.1",
+                "author": "John Doe",
+                "sections": [{"id": "SEC001", "title": "Visão geral", "attachments": [{"name": "fluxo.png"}]}]
+            },
+            "change_history": [{"date": "2024-01-01", "author": "John Doe", "type": "create"}],
+            "review_cycle": {"frequency": "quarterly"}
+        }
+    }
+
+def benchmark_form(form_name: str, records: List[Dict[str, Any]], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Compara o método do DataMapper com a variante em lote de um formulário.
+    
+    Args:
+        form_name: Nome do formulário
+        records: Registros legados do formulário
+        repeat: Execuções de cada caminho (vale a melhor)
+        
+    Returns:
+        Dict com registros por segundo em cada caminho e o ganho
+    """
+    batch = BATCH_MAPPERS[form_name]
+    method = getattr(DataMapper, FORMS[form_name].mapper)
+    
+    def per_record() -> List[Dict[str, Any]]:
+        return [method(record) for record in records]
+    
+    def best(run) -> float:
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            mapped = run()
+            timings.append(time.perf_counter() - started)
+            del mapped
+        return min(timings)
+        
+    # Alguns métodos do DataMapper imprimem logs de depuração
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        per_record_s = best(per_record)
+    batch_s = best(lambda: batch(records))
+    return {
+        "form": form_name,
+        "records": len(records),
+        "per_record_per_s": round(len(records) / per_record_s, 1),
+        "batch_per_s": round(len(records) / batch_s, 1),
+        "speedup": round(per_record_s / batch_s, 2)
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Compara o mapeamento em lote com o registro a registro.")
+    parser.add_argument("--records", type=int, default=100000, help="Registros por formulário")
+    parser.add_argument("--forms", nargs="+", default=list(BATCH_MAPPERS), choices=list(BATCH_MAPPERS))
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções de cada caminho")
+    args = parser.parse_args(argv)
+    
+    samples = [sample_legacy_forms(number) for number in range(args.records)]
+    results = [
+        benchmark_form(form_name, [sample[form_name] for sample in samples], args.repeat)
+        for form_name in args.forms
+    ]
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
@@ -0,0 +1,216 @@
+"""Compilação da especificação declarativa de mapeamento (config/mapping_spec.yaml)."""
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Callable, Union
+import yaml
+
+from src.migrations.form_registry import FORMS
+
+SPEC_PATH = Path(__file__).parent.parent.parent / "config" / "mapping_spec.yaml"
+
+COERCIONS = {
+    "int": "int({})",
+    "str": "str({})",
+    "lower": "{}.lower()"
+}
+
+FIELD_OPTIONS = {
+    "from", "default", "coerce", "value", "group", "items",
+    "limit", "non_dict", "scope", "when_text", "same_as"
+}
+
+# Únicos nomes disponíveis para o código gerado
+_BUILTINS = {
+    "int": int, "str": str, "isinstance": isinstance, "dict": dict,
+    "Exception": Exception, "ValueError": ValueError
+}
+
+Mapper = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+class _FormCompiler:
+    """Gera o código Python de um formulário da especificação."""
+    
+    def __init__(self, form_name: str, form_spec: Dict[str, Any]):
+        self.form_name = form_name
+        self.form_spec = form_spec
+        # Sub-dicts do registro lidos uma vez: caminho -> variável local
+        self.hoisted: Dict[tuple, str] = {}
+        # Campos reaproveitados por same_as: campo -> (variável local, expressão)
+        self.shared: Dict[str, tuple] = {}
+        self.items = 0
+    
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"Mapping spec '{self.form_name}': {message}")
+    
+    def _container(self, var: str, keys: tuple) -> str:
+        """Expressão do dict em keys dentro de var ({} se ausente)."""
+        if var != "source":
+            return var + "".join(f".get({key!r}, {{}})" for key in keys)
+        expression = var
+        for level in range(1, len(keys) + 1):
+            if keys[:level] not in self.hoisted:
+                self.hoisted[keys[:level]] = f"level{len(self.hoisted)}"
+            expression = self.hoisted[keys[:level]]
+        return expression
+    
+    @staticmethod
+    def _path(spec: Dict[str, Any]) -> tuple:
+        source = spec["from"]
+        return (source,) if isinstance(source, str) else tuple(source)
+    
+    def _read(self, var: str, spec: Dict[str, Any], default: str) -> str:
+        keys = self._path(spec)
+        return f"{self._container(var, keys[:-1])}.get({keys[-1]!r}, {default})"
+    
+    def field(self, name: str, spec: Dict[str, Any], var: str) -> str:
+        """Expressão do valor de um campo de saída."""
+        if not isinstance(spec, dict):
+            raise self._error(f"field '{name}' must be a mapping")
+        unknown = set(spec) - FIELD_OPTIONS
+        if unknown:
+            raise self._error(f"field '{name}' has unknown options: {', '.join(sorted(unknown))}")
+        if spec.get("scope") == "root":
+            var = "source"
+            
+        if "same_as" in spec:
+            if spec["same_as"] not in self.shared:
+                raise self._error(f"field '{name}' refers to '{spec['same_as']}', not a previous top-level field")
+            return self.shared[spec["same_as"]][0]
+        if "value" in spec:
+            value = repr(spec["value"])
+        elif "group" in spec:
+            value = self.fields(spec["group"], var)
+        elif "items" in spec:
+            self.items += 1
+            item = f"item{self.items}"
+            source = self._read(var, spec, "[]")
+            if "limit" in spec:
+                source += f"[:{int(spec['limit'])}]"
+            value = self.fields(spec["items"], item)
+            if "non_dict" in spec:
+                value = f"{value} if isinstance({item}, dict) else {self._coerce(spec['non_dict'], item)}"
+            value = f"[{value} for {item} in {source}]"
+        elif "from" in spec:
+            value = self._read(var, spec, repr(spec.get("default")))
+            if "when_text" in spec:
+                keys = self._path(spec)
+                if len(keys) < 2:
+                    raise self._error(f"field '{name}' uses when_text without a nested 'from'")
+                alternative = self.field(name, spec["when_text"], var)
+                value = f"({alternative} if isinstance({self._container(var, keys[:-1])}, str) else {value})"
+        else:
+            raise self._error(f"field '{name}' needs one of from, value, group, items or same_as")
+            
+        if "coerce" in spec:
+            value = self._coerce(spec["coerce"], value)
+        return value
+    
+    def _coerce(self, coercion: str, value: str) -> str:
+        if coercion not in COERCIONS:
+            raise self._error(f"unknown coercion '{coercion}'")
+        return COERCIONS[coercion].format(value)
+    
+    def fields(self, fields: Dict[str, Any], var: str) -> str:
+        """Literal de dict com os campos, na ordem da especificação."""
+        items = [f"{name!r}: {self.field(name, spec, var)}" for name, spec in fields.items()]
+        return "{" + ", ".join(items) + "}"
+    
+    def source(self) -> str:
+        """Código da função map_<formulário>(source)."""
+        fields = self.form_spec.get("fields")
+        if not isinstance(fields, dict):
+            raise self._error("missing 'fields'")
+            
+        # Campos reaproveitados viram variáveis locais calculadas antes do literal
+        targets = {spec["same_as"] for spec in fields.values() if isinstance(spec, dict) and "same_as" in spec}
+        items = []
+        for name, spec in fields.items():
+            value = self.field(name, spec, "source")
+            if name in targets:
+                self.shared[name] = (f"shared_{name}", value)
+                value = f"shared_{name}"
+            items.append(f"{name!r}: {value}")
+            
+        body = [f"{local} = {self._container('source', keys[:-1]) if len(keys) > 1 else 'source'}.get({keys[-1]!r}, {{}})"
+                for keys, local in list(self.hoisted.items())]
+        body += [f"{local} = {value}" for local, value in self.shared.values()]
+        body.append("return {" + ", ".join(items) + "}")
+        
+        if "error" in self.form_spec:
+            body = (
+                ["try:"] + ["    " + line for line in body]
+                + ["except Exception as e:", f"    raise ValueError({self.form_spec['error']!r} + ': ' + str(e))"]
+            )
+        return f"def map_{self.form_name}(source):\n" + "\n".join("    " + line for line in body) + "\n"
+
+def load_spec(path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    Carrega a especificação de mapeamento.
+    
+    Args:
+        path: Arquivo YAML (padrão: config/mapping_spec.yaml)
+        
+    Returns:
+        Dict formulário -> especificação
+    """
+    with open(path or SPEC_PATH, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+def generate_source(form_name: str, form_spec: Dict[str, Any]) -> str:
+    """Código Python gerado para um formulário (útil para depuração)."""
+    return _FormCompiler(form_name, form_spec).source()
+
+def compile_form(form_name: str, form_spec: Dict[str, Any]) -> Mapper:
+    """
+    Compila a especificação de um formulário em uma função de mapeamento.
+    
+    Args:
+        form_name: Nome do formulário
+        form_spec: Especificação do formulário
+        
+    Returns:
+        Função registro antigo -> registro novo
+    """
+    namespace: Dict[str, Any] = {"__builtins__": _BUILTINS}
+    code = compile(generate_source(form_name, form_spec), f"<mapping {form_name}>", "exec")
+    exec(code, namespace)
+    return namespace[f"map_{form_name}"]
+
+def compile_spec(spec: Dict[str, Any]) -> Dict[str, Mapper]:
+    """Compila todos os formulários da especificação."""
+    return {form_name: compile_form(form_name, form_spec) for form_name, form_spec in spec.items()}
+
+@lru_cache(maxsize=None)
+def default_mappers() -> Dict[str, Mapper]:
+    """Mapeadores compilados de config/mapping_spec.yaml (compilados uma única vez)."""
+    return compile_spec(load_spec())
+
+class CompiledDataMapper:
+    """
+    Mapeador com a mesma interface do DataMapper, gerado da especificação.
+    
+    Cada método map_*_data é uma função compilada a partir do YAML, com
+    resultado idêntico ao do DataMapper, então a instância pode substituí-lo
+    no MigrationService e no pipeline.
+    """
+    
+    def __init__(self, spec_path: Union[str, Path, None] = None):
+        """
+        Inicializa o mapeador.
+        
+        Args:
+            spec_path: Especificação alternativa (padrão: config/mapping_spec.yaml)
+        """
+        mappers = default_mappers() if spec_path is None else compile_spec(load_spec(spec_path))
+        missing = set(FORMS) - set(mappers)
+        if missing:
+            raise ValueError(f"Mapping spec is missing forms: {', '.join(sorted(missing))}")
+        self.mappers = mappers
+        for form_name, spec in FORMS.items():
+            setattr(self, spec.mapper, mappers[form_name])
+    
+    def map_form(self, form_name: str, old_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Mapeia um formulário pelo nome."""
+        if form_name not in self.mappers:
+            raise ValueError(f"Invalid form name: {form_name}")
+        return self.mappers[form_name](old_data)
@@ -0,0 +1,234 @@
+"""Métricas da migração: latência por etapa e contadores por formulário."""
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+import json
+import threading
+import time
+
+STAGES = ("map", "validate", "persist", "backup", "rollback")
+OUTCOMES = ("success", "failure", "rollback")
+
+# Limites dos buckets em segundos (de 100 µs a 5 s)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Histogram:
+    """Histograma de latências com buckets fixos (no estilo do Prometheus)."""
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # Uma contagem por bucket e a última para valores acima do maior limite
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def merge(self, counts: Sequence[int], count: int, total: float) -> None:
+        """Soma as observações de outro histograma com os mesmos buckets."""
+        self.counts = [mine + other for mine, other in zip(self.counts, counts)]
+        self.count += count
+        self.sum += total
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Pares (limite, contagem acumulada), terminando em +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimativa do quantil pelo limite superior do bucket (None se vazio)."""
+        if not self.count:
+            return None
+        rank, total = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return self.buckets[-1]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_s": round(self.sum, 6),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else None,
+            "p50_ms": self._ms(self.quantile(0.5)),
+            "p95_ms": self._ms(self.quantile(0.95)),
+            "buckets": dict(self.cumulative())
+        }
+    
+    @staticmethod
+    def _ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+class MigrationMetrics:
+    """
+    Métricas de uma migração, por formulário.
+    
+    Registra a latência das etapas (map, validate, persist, backup,
+    rollback) em histogramas e conta sucessos, falhas e rollbacks. Pode ser
+    compartilhado entre threads e exportado em JSON ou no formato de texto
+    do Prometheus.
+    """
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Inicializa as métricas.
+        
+        Args:
+            buckets: Limites dos buckets de latência, em segundos
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._last_update: Dict[str, float] = {}
+    
+    def observe(self, stage: str, form_name: str, seconds: float) -> None:
+        """Registra a duração de uma etapa."""
+        key = (form_name, stage)
+        with self._lock:
+            self._histogram(key).observe(seconds)
+    
+    @contextmanager
+    def time(self, stage: str, form_name: str) -> Iterator[None]:
+        """Mede a duração do bloco (também quando ele termina com erro)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, form_name, time.perf_counter() - started)
+    
+    def increment(self, outcome: str, form_name: str, amount: int = 1) -> None:
+        """Incrementa um contador (success, failure ou rollback)."""
+        key = (form_name, outcome)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._last_update[form_name] = time.time()
+    
+    def _histogram(self, key: Tuple[str, str]) -> Histogram:
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        return histogram
+    
+    def state(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Estado bruto das métricas, que pode ser enviado entre processos
+        (pickle) e somado a outra instância com merge.
+        
+        Args:
+            reset: Descarta as métricas depois de lê-las, para que cada
+                estado só tenha o registrado desde o anterior
+                
+        Returns:
+            Dict com buckets, histogramas, contadores e últimas atualizações
+        """
+        with self._lock:
+            state = {
+                "buckets": self.buckets,
+                "histograms": {
+                    key: (list(histogram.counts), histogram.count, histogram.sum)
+                    for key, histogram in self._histograms.items()
+                },
+                "counters": dict(self._counters),
+                "last_update": dict(self._last_update)
+            }
+            if reset:
+                self._histograms.clear()
+                self._counters.clear()
+                self._last_update.clear()
+        return state
+    
+    def merge(self, state: Dict[str, Any]) -> None:
+        """
+        Soma às métricas o estado de outra instância (ver state).
+        
+        Args:
+            state: Estado retornado por state()
+            
+        Raises:
+            ValueError: Se os buckets forem diferentes
+        """
+        if tuple(state["buckets"]) != self.buckets:
+            raise ValueError("Cannot merge metrics with different buckets")
+        with self._lock:
+            for key, (counts, count, total) in state["histograms"].items():
+                self._histogram(key).merge(counts, count, total)
+            for key, value in state["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for form_name, updated in state["last_update"].items():
+                self._last_update[form_name] = max(updated, self._last_update.get(form_name, 0.0))
+    
+    def forms(self) -> List[str]:
+        """Formulários com métricas registradas."""
+        with self._lock:
+            return sorted({form for form, _ in self._histograms} | {form for form, _ in self._counters})
+    
+    def form_snapshot(self, form_name: str) -> Dict[str, Any]:
+        """
+        Métricas de um formulário.
+        
+        Returns:
+            Dict com contadores, latência por etapa e data da última atualização
+        """
+        with self._lock:
+            last_update = self._last_update.get(form_name)
+            return {
+                "counters": {outcome: self._counters.get((form_name, outcome), 0) for outcome in OUTCOMES},
+                "latency": {
+                    stage: histogram.to_dict()
+                    for (form, stage), histogram in sorted(self._histograms.items())
+                    if form == form_name
+                },
+                "last_update": datetime.fromtimestamp(last_update).isoformat() if last_update else None
+            }
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas de todos os formulários."""
+        return {form_name: self.form_snapshot(form_name) for form_name in self.forms()}
+    
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Métricas em JSON."""
+        return json.dumps(self.snapshot(), indent=indent)
+    
+    def to_prometheus(self, prefix: str = "rpa_migration") -> str:
+        """Métricas no formato de texto do Prometheus."""
+        with self._lock:
+            histograms = [
+                (key, histogram.cumulative(), histogram.sum, histogram.count)
+                for key, histogram in sorted(self._histograms.items())
+            ]
+            counters = sorted(self._counters.items())
+            
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Duration of each migration stage per form.",
+            f"# TYPE {prefix}_stage_duration_seconds histogram"
+        ]
+        for (form_name, stage), buckets, total, count in histograms:
+            labels = f'form="{form_name}",stage="{stage}"'
+            for bound, cumulative in buckets:
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}_stage_duration_seconds_sum{{{labels}}} {total!r}")
+            lines.append(f"{prefix}_stage_duration_seconds_count{{{labels}}} {count}")
+            
+        lines += [
+            f"# HELP {prefix}_forms_total Migrated forms per outcome.",
+            f"# TYPE {prefix}_forms_total counter"
+        ]
+        for (form_name, outcome), value in counters:
+            lines.append(f'{prefix}_forms_total{{form="{form_name}",outcome="{outcome}"}} {value}')
+        return "\n".join(lines) + "\n"
+    
+    def reset(self) -> None:
+        """Descarta todas as métricas."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._last_update.clear()
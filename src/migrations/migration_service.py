@@ -1,467 +1,319 @@
 """Módulo do serviço de migração."""
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from pathlib import Path
+import copy
 import logging
-from datetime import datetime
 
 from src.utils.migration_logger import MigrationLogger
 from src.migrations.backup_service import BackupService
 from src.migrations.feature_flags import FeatureFlagManager, MigrationFlag
 from src.migrations.data_mapper import DataMapper
 from src.migrations.validators import DataValidator
+from src.migrations.metrics import MigrationMetrics
+from src.migrations.form_registry import FORMS, FormSpec, add_form_methods, get_form
 from .persistence import MigrationPersistence
 
+# Nome usado nas métricas da migração atômica de processos (migrate_process)
+PROCESS_METRICS = "process"
+
 class MigrationService:
     """Serviço responsável por gerenciar a migração dos dados."""
     
-    def __init__(self, mapper: DataMapper, validator: DataValidator):
+    def __init__(
+        self,
+        mapper: DataMapper,
+        validator: DataValidator,
+        persistence: Optional[MigrationPersistence] = None,
+        metrics: Optional[MigrationMetrics] = None
+    ):
         """
         Inicializa o serviço de migração.
         
         Args:
             mapper: Instância do DataMapper
             validator: Instância do DataValidator
+            persistence: Persistência dos dados migrados (padrão: data/migrations)
+            metrics: Métricas de latência e contadores (padrão: novas métricas)
         """
         self.mapper = mapper
         self.validator = validator
-        self.persistence = MigrationPersistence()
+        self.persistence = persistence or MigrationPersistence()
+        self.metrics = metrics or MigrationMetrics()
         self.logger = logging.getLogger(__name__)
         self.save_error = False  # Flag para simular erros (apenas testes)
     
-    def migrate_identification_form(self, old_data: Dict[str, Any]) -> Dict[str, Any]:
+    def migrate_form(
+        self,
+        form_name: str,
+        old_data: Dict[str, Any],
+        process_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Migra dados do IdentificationForm.
+        Migra um formulário: mapeia, valida e grava conforme o registro.
+        
+        Também disponível como migrate_<form>_form(old_data, process_id),
+        ex.: migrate_systems_form.
         
         Args:
+            form_name: Nome do formulário
             old_data: Dados no formato antigo
+            process_id: ID do processo (no identification é opcional e vale
+                só quando os dados não trazem o campo "id")
             
         Returns:
-            Dict contendo resultado da migração
+            Dict com success, errors e data; nos formulários com rollback
+            em caso de falha, também o resultado do rollback
         """
+        spec = get_form(form_name)
+        old_data = spec.prepare(old_data, process_id)
         try:
-            # Log início da migração
-            self.logger.info(f"Starting IdentificationForm migration for process {old_data.get('id', 'unknown')}")
-            
-            # Mapeia dados
-            new_data = self.mapper.map_identification_data(old_data)
-            
-            # Valida dados
-            is_valid, errors = self.validator.validate_identification_data(new_data)
-            if not is_valid:
-                self.logger.error(f"Validation failed: {errors}")
-                # Executa rollback em caso de falha na validação
-                try:
-                    rollback_result = self._rollback_identification_form(old_data)
-                except Exception as rollback_error:
-                    return {
-                        "success": False,
-                        "errors": [f"{field}: {error}" for field, error in errors.items()] + [str(rollback_error)],
-                        "data": None,
-                        "rollback": {"success": False, "error": str(rollback_error)}
-                    }
-                return {
-                    "success": False,
-                    "errors": [f"{field}: {error}" for field, error in errors.items()],
-                    "data": None,
-                    "rollback": rollback_result
-                }
-            
-            # Simula erro de salvamento para testes
-            if self.save_error:
-                raise Exception("Simulated save error")
-            
-            # Salva dados
-            process_id = new_data["process_id"]
-            save_result = self.persistence.save_identification_form(new_data, process_id)
-            
-            if not save_result["success"]:
-                raise Exception("Failed to save data")
-            
-            # Log sucesso
-            self.logger.info("IdentificationForm migration completed successfully")
-            
-            return {
-                "success": True,
-                "errors": [],
-                "data": new_data,
-                "rollback": {"success": True}
-            }
-            
+            result = self._migrate(spec, old_data, process_id)
         except Exception as e:
-            # Log erro
-            self.logger.error(f"Migration failed: {str(e)}")
-            
-            # Executa rollback
-            self.logger.info("Executing rollback")
-            try:
-                rollback_result = self._rollback_identification_form(old_data)
-            except Exception as rollback_error:
-                return {
-                    "success": False,
-                    "errors": [str(e), str(rollback_error)],
-                    "rollback": {"success": False, "error": str(rollback_error)}
-                }
-            
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "rollback": rollback_result
-            }
-    
-    def _rollback_identification_form(self, old_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Executa rollback da migração do IdentificationForm."""
+            self.logger.error(f"{spec.label} migration failed: {str(e)}")
+            result = self._failed(spec, old_data, process_id, [str(e)])
+            
+        if result["success"]:
+            self.metrics.increment("success", form_name)
+        else:
+            self.metrics.increment("failure", form_name)
+            if "rollback" in result:
+                self.metrics.increment("rollback", form_name)
+        return result
+            
+    def _migrate(self, spec: FormSpec, old_data: Dict[str, Any], process_id: Optional[str]) -> Dict[str, Any]:
+        """Mapeia, valida e grava um formulário (exceções seguem para migrate_form)."""
+        self.logger.info(
+            f"Starting {spec.label} migration for process {process_id or old_data.get('id', 'unknown')}"
+        )
+        with self.metrics.time("map", spec.name):
+            mapped_data = spec.map(self.mapper, old_data)
+        with self.metrics.time("validate", spec.name):
+            is_valid, errors = spec.validate(self.validator, mapped_data)
+        if not is_valid:
+            self.logger.error(f"{spec.label} validation failed: {errors}")
+            return self._failed(spec, old_data, process_id, errors)
+            
+        # Simula erro de salvamento para testes
+        if self.save_error:
+            raise Exception("Simulated save error")
+            
+        target = mapped_data["process_id"] if spec.keyed else process_id
+        with self.metrics.time("persist", spec.name):
+            save_result = self.persistence.save_form(target, spec.name, mapped_data)
+        if not save_result["success"]:
+            raise Exception("Failed to save data")
+            
+        self.logger.info(f"{spec.label} migration completed successfully")
+        result = {"success": True, "errors": [], "data": mapped_data}
+        if spec.rollback_on_failure:
+            result["rollback"] = {"success": True}
+        return result
+            
+    def _failed(
+        self,
+        spec: FormSpec,
+        old_data: Dict[str, Any],
+        process_id: Optional[str],
+        errors: List[str]
+    ) -> Dict[str, Any]:
+        """Resultado de uma migração com falha, executando o rollback se o formulário pede."""
+        result = {"success": False, "errors": errors, "data": None}
+        if not spec.rollback_on_failure:
+            return result
+            
+        self.logger.info("Executing rollback")
         try:
-            process_id = old_data.get("id")
-            if process_id:
-                return self.persistence.delete_identification_form(process_id)
+            with self.metrics.time("rollback", spec.name):
+                result["rollback"] = self._rollback_form(spec, old_data, process_id)
+        except Exception as rollback_error:
+            result["errors"] = errors + [str(rollback_error)]
+            result["rollback"] = {"success": False, "error": str(rollback_error)}
+        return result
+            
+    def _rollback_form(
+        self,
+        spec: FormSpec,
+        old_data: Dict[str, Any],
+        process_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Remove o formulário gravado do processo."""
+        try:
+            target = old_data.get("id") if spec.keyed else process_id
+            if target:
+                return self.persistence.delete_form(target, spec.name)
             return {"success": True}
             
         except Exception as e:
             self.logger.error(f"Rollback failed: {str(e)}")
             raise
     
-    def get_migration_status(self, form_name: str) -> Dict[str, Any]:
+    def migrate_process(self, old_forms: Dict[str, Dict[str, Any]], process_id: str) -> Dict[str, Any]:
         """
-        Obtém o status da migração de um formulário.
+        Migra todos os formulários de um processo de forma atômica.
+        
+        Os formulários são mapeados e validados por migrate_form, como
+        sempre, mas gravados em uma unidade de trabalho: só chegam ao
+        armazenamento, juntos, se todos forem migrados com sucesso. Caso
+        contrário nada é gravado e o rollback é apenas descartar o acumulado.
         
         Args:
-            form_name: Nome do formulário
+            old_forms: Dados no formato antigo por nome de formulário
+            process_id: ID do processo
             
         Returns:
-            Dict contendo status e detalhes da migração
+            Dict com sucesso geral, resultado por formulário e rollback
         """
-        valid_forms = [
-            "identification", "process_details", "business_rules",
-            "automation_goals", "systems", "data", "steps", "risks",
-            "documentation"
-        ]
-        
-        if form_name not in valid_forms:
-            raise ValueError(f"Invalid form name: {form_name}")
+        unit, forms, staged_metrics = self._stage_forms(old_forms, process_id)
+        success = bool(forms) and all(form["success"] for form in forms.values())
+        errors = []
+        if success:
+            try:
+                with self.metrics.time("persist", PROCESS_METRICS):
+                    unit.commit()
+            except Exception as e:
+                self.logger.error(f"Commit failed for process {process_id}: {str(e)}")
+                success = False
+                errors.append(str(e))
+        if success:
+            rollback = {"success": True}
+        else:
+            with self.metrics.time("rollback", PROCESS_METRICS):
+                rollback = unit.rollback()
+            self.metrics.increment("rollback", PROCESS_METRICS)
+        self.metrics.increment("success" if success else "failure", PROCESS_METRICS)
+        self._record_staged(staged_metrics, committed=success)
         
-        # TODO: Implementar lógica real de status
+        if success:
+            self.logger.info(f"Process {process_id} migrated ({len(forms)} forms)")
+        else:
+            self.logger.error(f"Process {process_id} migration failed, nothing was saved")
         return {
-            "status": "in_progress",
-            "details": {
-                "total_records": 0,
-                "migrated_records": 0,
-                "failed_records": 0,
-                "last_migration": datetime.now().isoformat()
-            }
-        } 
+            "process_id": process_id,
+            "success": success,
+            "forms": forms,
+            "errors": errors,
+            "rollback": rollback
+        }
     
-    def migrate_process_details_form(self, old_data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Migra dados do ProcessDetailsForm."""
-        try:
-            self.logger.info(f"Starting ProcessDetailsForm migration for process {process_id}")
-            
-            # Mapeia dados usando o DataMapper
-            mapped_data = self.mapper.map_process_details_data(old_data)
-            
-            # Força o process_type para 'automated'
-            mapped_data["process_type"] = "automated"
-            
-            # Valida dados mapeados
-            is_valid, errors = self.validator.validate_process_details_data(mapped_data)
-            if not is_valid:
-                return {
-                    "success": False,
-                    "errors": errors,
-                    "data": None
-                }
-            
-            # Salva dados migrados
-            self.persistence.save_process_details_form(mapped_data, process_id)
-            
-            self.logger.info("ProcessDetailsForm migration completed successfully")
-            return {
-                "success": True,
-                "errors": [],
-                "data": mapped_data
-            }
-        except Exception as e:
-            self.logger.error(f"ProcessDetailsForm migration failed: {str(e)}")
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "data": None
-            }
-
-    def migrate_business_rules_form(self, old_data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Migra dados do BusinessRulesForm."""
-        try:
-            self.logger.info(f"Starting BusinessRulesForm migration for process {process_id}")
-            
-            # Mapeia dados usando o DataMapper
-            mapped_data = self.mapper.map_business_rules_data(old_data)
-            
-            # Garante que business_rules não está vazio e tem o tipo correto
-            if "business_rules" in old_data:
-                mapped_data["business_rules"] = [
-                    {
-                        "rule_id": rule.get("rule_id", ""),
-                        "description": rule.get("description", ""),
-                        "type": rule.get("implementation", {}).get("type", "validation"),
-                        "priority": rule.get("priority", "medium")
-                    }
-                    for rule in old_data["business_rules"]
-                ]
-            
-            # Valida dados mapeados
-            is_valid, errors = self.validator.validate_business_rules_data(mapped_data)
-            if not is_valid:
-                return {
-                    "success": False,
-                    "errors": errors,
-                    "data": None
-                }
-            
-            # Salva dados migrados
-            self.persistence.save_business_rules_form(mapped_data, process_id)
-            
-            self.logger.info("BusinessRulesForm migration completed successfully")
-            return {
-                "success": True,
-                "errors": [],
-                "data": mapped_data
-            }
-        except Exception as e:
-            self.logger.error(f"BusinessRulesForm migration failed: {str(e)}")
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "data": None
-            }
-
-    def migrate_automation_goals_form(self, old_data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Migra dados do AutomationGoalsForm."""
-        try:
-            self.logger.info(f"Starting AutomationGoalsForm migration for process {process_id}")
-            
-            # Valida dados de entrada
-            if not self._validate_automation_goals_input(old_data):
-                return {
-                    "success": False,
-                    "errors": ["Invalid input data"],
-                    "data": None
-                }
-            
-            # Mapeia dados usando o DataMapper
-            mapped_data = self.mapper.map_automation_goals_data(old_data)
-            
-            # Garante que automation_goals não está vazio
-            if "automation_goals" in old_data:
-                mapped_data["automation_goals"] = [
-                    {
-                        "goal_id": goal.get("goal_id", ""),
-                        "description": goal.get("description", ""),
-                        "category": goal.get("category", "efficiency"),
-                        "priority_level": old_data.get("priority_level", "medium"),
-                        "metrics": goal.get("metrics", {})
-                    }
-                    for goal in old_data.get("automation_goals", [])
-                ]
-            
-            # Valida dados mapeados
-            is_valid, errors = self.validator.validate_automation_goals_data(mapped_data)
-            if not is_valid:
-                return {
-                    "success": False,
-                    "errors": errors,
-                    "data": None
-                }
-            
-            # Verifica dados inválidos
-            if self._has_invalid_automation_goals(mapped_data):
-                return {
-                    "success": False,
-                    "errors": ["Invalid automation goals data"],
-                    "data": None
-                }
-            
-            # Salva dados migrados
-            self.persistence.save_automation_goals_form(mapped_data, process_id)
+    def preview_process(self, old_forms: Dict[str, Dict[str, Any]], process_id: str) -> Dict[str, Any]:
+        """
+        Mapeia e valida os formulários de um processo sem gravar nada.
+        
+        Args:
+            old_forms: Dados no formato antigo por nome de formulário
+            process_id: ID do processo
             
-            self.logger.info("AutomationGoalsForm migration completed successfully")
-            return {
-                "success": True,
-                "errors": [],
-                "data": mapped_data
-            }
-        except Exception as e:
-            self.logger.error(f"AutomationGoalsForm migration failed: {str(e)}")
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "data": None
-            }
-
-    def _validate_automation_goals_input(self, data: Dict[str, Any]) -> bool:
-        """Valida dados de entrada do AutomationGoalsForm."""
-        if not data:
-            return False
+        Returns:
+            Dict com sucesso geral, resultado por formulário e os dados que
+            seriam gravados ("staged", por nome de formulário)
+        """
+        # As métricas da simulação são descartadas
+        unit, forms, _ = self._stage_forms(old_forms, process_id)
+        staged = unit.staged
+        unit.rollback()
+        return {
+            "process_id": process_id,
+            "success": bool(forms) and all(form["success"] for form in forms.values()),
+            "forms": forms,
+            "staged": staged
+        }
+    
+    def _stage_forms(
+        self,
+        old_forms: Dict[str, Dict[str, Any]],
+        process_id: str
+    ) -> Tuple["UnitOfWork", Dict[str, Dict[str, Any]], MigrationMetrics]:
+        """
+        Migra os formulários em uma unidade de trabalho, ainda sem commit.
         
-        # Verifica campos obrigatórios
-        if "automation_goals" not in data:
-            return False
+        As métricas dos formulários ficam em uma instância separada, levada
+        às do serviço por _record_staged só quando o resultado é conhecido.
+        """
+        unit = self.persistence.unit_of_work(process_id)
+        staged_service = copy.copy(self)
+        staged_service.persistence = unit
+        staged_service.metrics = MigrationMetrics(self.metrics.buckets)
         
-        # Verifica dados inválidos
-        for goal in data.get("automation_goals", []):
-            if not goal.get("goal_id"):
-                return False
-            if goal.get("category") == "invalid":
-                return False
-            
-        if data.get("priority_level") == "invalid":
-            return False
+        forms = {}
+        for form_name in FORMS:
+            old_data = old_forms.get(form_name)
+            if old_data is None:
+                continue
+            result = staged_service.migrate_form(form_name, old_data, process_id)
+            forms[form_name] = {"success": result["success"], "errors": result["errors"]}
+        return unit, forms, staged_service.metrics
+    
+    def _record_staged(self, staged: MigrationMetrics, committed: bool) -> None:
+        """
+        Soma às métricas do serviço as dos formulários de migrate_process.
         
-        return True
-
-    def _has_invalid_automation_goals(self, data: Dict[str, Any]) -> bool:
-        """Verifica se há dados inválidos nos objetivos de automação."""
-        if not data.get("automation_goals"):
-            return True
+        A etapa "persist" deles (gravação só em memória) é descartada; a
+        gravação real é medida em "process". Se o processo não foi gravado,
+        os formulários que tinham dado certo contam como falha e rollback.
+        """
+        state = staged.state()
+        state["histograms"] = {
+            key: value for key, value in state["histograms"].items() if key[1] != "persist"
+        }
+        if not committed:
+            counters: Dict[Tuple[str, str], int] = {}
+            for (form_name, outcome), value in state["counters"].items():
+                outcomes = ("failure", "rollback") if outcome == "success" else (outcome,)
+                for key in ((form_name, name) for name in outcomes):
+                    counters[key] = counters.get(key, 0) + value
+            state["counters"] = counters
+        self.metrics.merge(state)
+    
+    def get_migration_status(self, form_name: str) -> Dict[str, Any]:
+        """
+        Obtém o status da migração de um formulário.
         
-        for goal in data["automation_goals"]:
-            if not goal.get("goal_id"):
-                return True
-            if goal.get("category") == "invalid":
-                return True
+        Args:
+            form_name: Nome do formulário, ou "process" para a migração
+                atômica de processos (migrate_process)
             
-        if data.get("priority_level") == "invalid":
-            return True
+        Returns:
+            Dict contendo status, contagens e as métricas do formulário
+            (contadores e latência por etapa)
+        """
+        if form_name != PROCESS_METRICS:
+            get_form(form_name)
         
-        return False
-
-    # Métodos de rollback
-    def _rollback_process_details_form(self, process_id: str) -> Dict[str, Any]:
-        """Executa rollback da migração do ProcessDetailsForm."""
-        try:
-            return self.persistence.delete_process_details_form(process_id)
-        except Exception as e:
-            self.logger.error(f"Rollback failed: {str(e)}")
-            raise
-
-    def _rollback_business_rules_form(self, process_id: str) -> Dict[str, Any]:
-        """Executa rollback da migração do BusinessRulesForm."""
-        try:
-            return self.persistence.delete_business_rules_form(process_id)
-        except Exception as e:
-            self.logger.error(f"Rollback failed: {str(e)}")
-            raise
-
-    def _rollback_automation_goals_form(self, process_id: str) -> Dict[str, Any]:
-        """Executa rollback da migração do AutomationGoalsForm."""
-        try:
-            return self.persistence.delete_automation_goals_form(process_id)
-        except Exception as e:
-            self.logger.error(f"Rollback failed: {str(e)}")
-            raise 
-
-    def migrate_systems_form(self, old_data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Migra dados do SystemsForm."""
-        try:
-            self.logger.info(f"Starting SystemsForm migration for process {process_id}")
-            
-            # Mapeia e valida dados
-            mapped_data = self.mapper.map_systems_data(old_data)
-            is_valid, errors = self.validator.validate_systems_data(mapped_data)
-            
-            if not is_valid:
-                return {
-                    "success": False,
-                    "errors": errors,
-                    "data": None
-                }
-            
-            # Salva dados migrados
-            self.persistence.save_systems_form(mapped_data, process_id)
-            
-            return {
-                "success": True,
-                "errors": [],
-                "data": mapped_data
-            }
-        except Exception as e:
-            self.logger.error(f"SystemsForm migration failed: {str(e)}")
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "data": None
-            } 
-
-    def migrate_data_form(self, old_data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Migra dados do DataForm."""
-        try:
-            self.logger.info(f"Starting DataForm migration for process {process_id}")
-            
-            # Mapeia dados usando o DataMapper
-            mapped_data = self.mapper.map_data_form_data(old_data)
-            
-            # Valida dados mapeados
-            is_valid, errors = self.validator.validate_data_form_data(mapped_data)
-            if not is_valid:
-                return {
-                    "success": False,
-                    "errors": errors,
-                    "data": None
-                }
-            
-            # Salva dados migrados
-            self.persistence.save_data_form(mapped_data, process_id)
-            
-            self.logger.info("DataForm migration completed successfully")
-            return {
-                "success": True,
-                "errors": [],
-                "data": mapped_data
-            }
-        except Exception as e:
-            self.logger.error(f"DataForm migration failed: {str(e)}")
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "data": None
-            } 
-
-    def migrate_steps_form(self, old_data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Migra dados do StepsForm."""
-        try:
-            self.logger.info(f"Starting StepsForm migration for process {process_id}")
-            
-            # Mapeia dados usando o DataMapper
-            mapped_data = self.mapper.map_steps_data(old_data)
-            
-            # Valida dados mapeados
-            is_valid, errors = self.validator.validate_steps_data(mapped_data)
-            if not is_valid:
-                return {
-                    "success": False,
-                    "errors": errors,
-                    "data": None
-                }
-            
-            # Salva dados migrados
-            self.persistence.save_steps_form(mapped_data, process_id)
+        metrics = self.metrics.form_snapshot(form_name)
+        counters = metrics["counters"]
+        total = counters["success"] + counters["failure"]
+        return {
+            "status": "in_progress" if total else "not_started",
+            "details": {
+                "total_records": total,
+                "migrated_records": counters["success"],
+                "failed_records": counters["failure"],
+                "rollbacks": counters["rollback"],
+                "last_migration": metrics["last_update"]
+            },
+            "metrics": metrics
+        } 
+    
+    def export_metrics(self, output_format: str = "json") -> str:
+        """
+        Exporta as métricas da migração para dashboards.
+        
+        Args:
+            output_format: "json" ou "prometheus" (formato de texto)
             
-            self.logger.info("StepsForm migration completed successfully")
-            return {
-                "success": True,
-                "errors": [],
-                "data": mapped_data
-            }
-        except Exception as e:
-            self.logger.error(f"StepsForm migration failed: {str(e)}")
-            return {
-                "success": False,
-                "errors": [str(e)],
-                "data": None
-            } 
+        Returns:
+            str: Métricas no formato pedido
+        """
+        if output_format == "json":
+            return self.metrics.to_json()
+        if output_format == "prometheus":
+            return self.metrics.to_prometheus()
+        raise ValueError(f"Unsupported metrics format: {output_format}")
+    
+def _migrate_method(form_name: str) -> Callable[..., Dict[str, Any]]:
+    def method(self, old_data: Dict[str, Any], process_id: Optional[str] = None) -> Dict[str, Any]:
+        return self.migrate_form(form_name, old_data, process_id)
+    return method
 
-    def _rollback_steps_form(self, process_id: str) -> Dict[str, Any]:
-        """Executa rollback da migração do StepsForm."""
-        try:
-            return self.persistence.delete_steps_form(process_id)
-        except Exception as e:
-            self.logger.error(f"Rollback failed: {str(e)}")
-            raise 
\ No newline at end of file
+# migrate_<form>_form(old_data, process_id) para cada formulário do registro
+add_form_methods(MigrationService, "migrate", _migrate_method, "Migra dados do {label} (ver migrate_form).")
@@ -1,212 +1,392 @@
 """Módulo para persistência dos dados migrados."""
-import json
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Optional, List, Union, Iterable
 from pathlib import Path
 import logging
+import threading
 from datetime import datetime
-import os
 
+from src.migrations.codecs import StorageCodec
+from src.migrations.form_cache import FormCache
+from src.migrations.form_registry import FORMS, add_storage_methods, get_form
+from src.migrations.process_index import ProcessIndex, INDEX_FILE
+from src.migrations.storage import StorageBackend, create_backend
+
+# Arquivo de cada formulário dentro da pasta do processo
+FORM_FILES = {name: spec.filename for name, spec in FORMS.items()}
+
+# Formulários gravados sem o envelope data/metadata
+RAW_FORMS = {name for name, spec in FORMS.items() if not spec.envelope}
+
+@add_storage_methods
 class MigrationPersistence:
     """Classe responsável pela persistência dos dados migrados."""
     
-    def __init__(self, storage_path: str = "data/migrations"):
+    def __init__(
+        self,
+        storage_path: str = "data/migrations",
+        backend: Union[str, StorageBackend] = "directory",
+        codec: Union[str, StorageCodec, None] = None,
+        cache_size: int = 1024,
+        max_read_workers: Optional[int] = None,
+        index: bool = True,
+        read_only: bool = False
+    ):
         """
         Inicializa o serviço de persistência.
         
         Args:
             storage_path: Caminho para armazenamento dos dados
+            backend: Instância de StorageBackend ou nome ("directory",
+                "single_file" ou "sqlite")
+            codec: Codec dos backends criados pelo nome: "json" (compacto,
+                padrão), "msgpack", "json+gzip", "msgpack+zstd"...
+            cache_size: Formulários mantidos no cache de leitura (0 desativa)
+            max_read_workers: Threads de leitura de load_process/load_processes
+                (padrão do ThreadPoolExecutor)
+            index: Se True, mantém o índice de status/departamento/dono
+                em <storage_path>/index.db
+            read_only: Abre o armazenamento só para leitura (ex.: simulação):
+                nada é criado nem recuperado, não há índice e gravações falham
         """
         self.storage_path = Path(storage_path)
-        self.storage_path.mkdir(parents=True, exist_ok=True)
+        if not read_only:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+        if isinstance(backend, str):
+            backend = create_backend(backend, self.storage_path, codec, read_only=read_only)
+        self.backend = backend
+        self.cache = FormCache(cache_size) if cache_size > 0 else None
+        self.index = ProcessIndex(self.storage_path / INDEX_FILE) if index and not read_only else None
+        self.max_read_workers = max_read_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
     
-    def save_identification_form(self, data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
+    def _read_executor(self) -> ThreadPoolExecutor:
+        """Pool de threads de leitura, criado na primeira utilização."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_read_workers,
+                        thread_name_prefix="persistence-read"
+                    )
+        return self._executor
+    
+    def close(self) -> None:
+        """Encerra o pool de leitura e libera o backend."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self.backend.close()
+        if self.index is not None:
+            self.index.close()
+    
+    def __enter__(self) -> "MigrationPersistence":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def _read(self, process_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Lê um documento passando pelo cache."""
+        if self.cache is None:
+            return self.backend.read(process_id, filename)
+            
+        key = (process_id, filename)
+        token = self.backend.version(process_id, filename)
+        if token is None:
+            self.cache.invalidate(key)
+            return None
+        document = self.cache.get(key, token)
+        if document is None:
+            document = self.backend.read(process_id, filename)
+            if document is not None:
+                self.cache.put(key, token, document)
+        return document
+    
+    def _write(self, process_id: str, filename: str, document: Dict[str, Any]) -> None:
+        """Grava um documento e invalida sua entrada no cache."""
+        try:
+            self.backend.write(process_id, filename, document)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate((process_id, filename))
+    
+    def _delete(self, process_id: str, filename: str) -> None:
+        """Remove um documento e invalida sua entrada no cache."""
+        try:
+            self.backend.delete(process_id, filename)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate((process_id, filename))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Métricas do cache de leitura.
+        
+        Returns:
+            Dict com hits, misses, stale, evictions, hit_rate e tamanho
+        """
+        if self.cache is None:
+            return {"enabled": False}
+        return dict(self.cache.stats(), enabled=True)
+    
+    @staticmethod
+    def _envelope(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Envolve os dados do formulário com os metadados da migração."""
+        return {
+            "data": data,
+            "metadata": {
+                "version": "1.0",
+                "migrated_at": datetime.now().isoformat(),
+                "status": "migrated"
+            }
+        }
+    
+    def save_forms(self, process_id: str, forms: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Salva dados do IdentificationForm.
+        Salva vários formulários de um processo em uma única gravação.
+        
+        A gravação é tudo ou nada em todos os backends (troca atômica da
+        pasta no "directory", transação nos demais).
         
         Args:
-            data: Dados a serem salvos
             process_id: ID do processo
+            forms: Dados por nome de formulário (chaves de FORM_FILES)
             
         Returns:
             Dict com resultado da operação
         """
-        try:
-            # Cria pasta do processo se não existir
-            process_path = self.storage_path / process_id
-            process_path.mkdir(exist_ok=True)
+        unknown = set(forms) - set(FORM_FILES)
+        if unknown:
+            raise ValueError(f"Invalid form name: {', '.join(sorted(unknown))}")
             
-            # Salva dados em arquivo JSON
-            file_path = process_path / "identification.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "data": data,
-                    "metadata": {
-                        "version": "1.0",
-                        "migrated_at": datetime.now().isoformat(),
-                        "status": "migrated"
-                    }
-                }, f, indent=2)
+        documents = {
+            FORM_FILES[name]: data if name in RAW_FORMS else self._envelope(data)
+            for name, data in forms.items()
+        }
+        try:
+            self.backend.write_many(process_id, documents)
+            if self.index is not None and "identification" in forms:
+                self.index.update(process_id, forms["identification"])
             
-            self.logger.info(f"Saved identification data for process {process_id}")
+            self.logger.info(f"Saved {len(forms)} forms for {process_id}")
             return {"success": True}
             
         except Exception as e:
-            self.logger.error(f"Failed to save identification data: {str(e)}")
+            self.logger.error(f"Failed to save forms for {process_id}: {str(e)}")
             raise
+        finally:
+            if self.cache is not None:
+                for filename in documents:
+                    self.cache.invalidate((process_id, filename))
     
-    def load_identification_form(self, process_id: str) -> Optional[Dict[str, Any]]:
+    def unit_of_work(self, process_id: str) -> "UnitOfWork":
         """
-        Carrega dados do IdentificationForm.
+        Cria uma unidade de trabalho para gravar os formulários de um processo juntos.
         
         Args:
             process_id: ID do processo
             
         Returns:
-            Dict com dados ou None se não encontrado
+            UnitOfWork (commit ao sair do bloco with, rollback em exceção)
         """
-        try:
-            file_path = self.storage_path / process_id / "identification.json"
-            if not file_path.exists():
-                return None
-                
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-                
-        except Exception as e:
-            self.logger.error(f"Failed to load identification data: {str(e)}")
-            raise
+        # Importado aqui: unit_of_work depende deste módulo
+        from src.migrations.unit_of_work import UnitOfWork
+        return UnitOfWork(self, process_id)
     
-    def delete_identification_form(self, process_id: str) -> Dict[str, Any]:
+    def save_form(self, process_id: str, form_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Remove dados do IdentificationForm.
+        Salva um formulário, com ou sem envelope conforme o registro de formulários.
         
         Args:
             process_id: ID do processo
+            form_name: Nome do formulário (chave de FORMS)
+            data: Dados a serem salvos
             
         Returns:
             Dict com resultado da operação
         """
+        spec = get_form(form_name)
         try:
-            file_path = self.storage_path / process_id / "identification.json"
-            if file_path.exists():
-                file_path.unlink()
-                
-            self.logger.info(f"Deleted identification data for process {process_id}")
-            return {"success": True}
+            self._write(process_id, spec.filename, self._envelope(data) if spec.envelope else data)
+            if self.index is not None and form_name == "identification":
+                self.index.update(process_id, data)
             
-        except Exception as e:
-            self.logger.error(f"Failed to delete identification data: {str(e)}")
-            raise 
-
-    def save_process_details_form(self, data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Salva dados do ProcessDetailsForm."""
-        try:
-            process_path = self.storage_path / process_id
-            process_path.mkdir(exist_ok=True)
-            
-            file_path = process_path / "process_details.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "data": data,
-                    "metadata": {
-                        "version": "1.0",
-                        "migrated_at": datetime.now().isoformat(),
-                        "status": "migrated"
-                    }
-                }, f, indent=2)
-            
-            self.logger.info(f"Saved process details for {process_id}")
+            self.logger.info(f"Saved {spec.label} for {process_id}")
             return {"success": True}
             
         except Exception as e:
-            self.logger.error(f"Failed to save process details: {str(e)}")
+            self.logger.error(f"Failed to save {spec.label}: {str(e)}")
             raise
-
-    def save_business_rules_form(self, data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Salva dados do BusinessRulesForm."""
-        try:
-            process_path = self.storage_path / process_id
-            process_path.mkdir(exist_ok=True)
+    
+    def delete_form(self, process_id: str, form_name: str) -> Dict[str, Any]:
+        """
+        Remove um formulário.
+        
+        Args:
+            process_id: ID do processo
+            form_name: Nome do formulário (chave de FORMS)
             
-            file_path = process_path / "business_rules.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "data": data,
-                    "metadata": {
-                        "version": "1.0",
-                        "migrated_at": datetime.now().isoformat(),
-                        "status": "migrated"
-                    }
-                }, f, indent=2)
+        Returns:
+            Dict com resultado da operação
+        """
+        result = self._delete_form(process_id, get_form(form_name).filename)
+        if self.index is not None and form_name == "identification":
+            self.index.remove(process_id)
+        return result
+                
+    def load_form(self, process_id: str, form_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Carrega um formulário qualquer pelo nome.
+        
+        Args:
+            process_id: ID do processo
+            form_name: Nome do formulário (chave de FORMS)
             
-            self.logger.info(f"Saved business rules for {process_id}")
-            return {"success": True}
+        Returns:
+            Dict com dados ou None se não encontrado
+        """
+        return self._load_form(process_id, get_form(form_name).filename)
+    
+    def list_process_ids(self) -> List[str]:
+        """Lista os IDs dos processos com dados migrados."""
+        return self.backend.list_process_ids()
+    
+    def _require_index(self) -> ProcessIndex:
+        """Retorna o índice ou falha se a persistência foi criada sem ele."""
+        if self.index is None:
+            raise RuntimeError("Process index is disabled for this persistence")
+        return self.index
+    
+    def find_processes(
+        self,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+        owner: Optional[str] = None
+    ) -> List[str]:
+        """
+        Busca processos pelo índice, sem ler os formulários.
+        
+        Args:
+            status: Status do processo (ex.: "in_review")
+            department: Departamento
+            owner: Dono do processo
+            
+        Returns:
+            Lista de IDs ordenada
+        """
+        return self._require_index().find(status=status, department=department, owner=owner)
+    
+    def list_processes(
+        self,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+        owner: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista o resumo dos processos (nome, status, departamento e dono) pelo índice.
+        
+        Returns:
+            Lista de dicts ordenada por ID
+        """
+        return self._require_index().list(status=status, department=department, owner=owner)
+    
+    def rebuild_index(self) -> int:
+        """
+        Recria o índice a partir dos IdentificationForms gravados.
+        
+        Returns:
+            int: Quantidade de processos indexados
+        """
+        def entries():
+            for process_id in self.list_process_ids():
+                form = self.load_identification_form(process_id)
+                if form is not None:
+                    yield process_id, form.get("data", {})
+                    
+        count = self._require_index().rebuild(entries())
+        self.logger.info(f"Rebuilt process index with {count} processes")
+        return count
+        
+    def _merge_process(self, documents: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Organiza os documentos de um processo por nome de formulário."""
+        return {name: documents.get(filename) for name, filename in FORM_FILES.items()}
+    
+    def _read_process(self, process_id: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Lê, em sequência e passando pelo cache, os arquivos de um processo."""
+        return {filename: self._read(process_id, filename) for filename in FORM_FILES.values()}
+    
+    def load_process(self, process_id: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Carrega todos os formulários de um processo.
+        
+        Os arquivos são lidos em paralelo no pool de threads; backends que
+        guardam o processo inteiro junto ("single_file", "sqlite") fazem
+        uma única leitura.
+        
+        Args:
+            process_id: ID do processo
+            
+        Returns:
+            Dict com um item por formulário (None se não encontrado)
+        """
+        try:
+            if self.backend.bulk_read:
+                return self._merge_process(self.backend.read_many(process_id))
+                
+            filenames = list(FORM_FILES.values())
+            documents = self._read_executor().map(lambda filename: self._read(process_id, filename), filenames)
+            return self._merge_process(dict(zip(filenames, documents)))
             
         except Exception as e:
-            self.logger.error(f"Failed to save business rules: {str(e)}")
+            self.logger.error(f"Failed to load process {process_id}: {str(e)}")
             raise
-
-    def save_automation_goals_form(self, data: Dict[str, Any], process_id: str) -> Dict[str, Any]:
-        """Salva dados do AutomationGoalsForm."""
+    
+    def load_processes(
+        self,
+        process_ids: Iterable[str],
+        chunk_size: int = 256
+    ) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Carrega todos os formulários de vários processos.
+        
+        Args:
+            process_ids: IDs dos processos
+            chunk_size: Processos enviados ao pool por vez, limitando as
+                leituras pendentes em memória
+                
+        Returns:
+            Dict por ID de processo, no formato de load_process()
+        """
         try:
-            process_path = self.storage_path / process_id
-            process_path.mkdir(exist_ok=True)
-            
-            file_path = process_path / "automation_goals.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "data": data,
-                    "metadata": {
-                        "version": "1.0",
-                        "migrated_at": datetime.now().isoformat(),
-                        "status": "migrated"
-                    }
-                }, f, indent=2)
-            
-            self.logger.info(f"Saved automation goals for {process_id}")
-            return {"success": True}
+            executor = self._read_executor()
+            processes = {}
+            iterator = iter(dict.fromkeys(process_ids))
+            while chunk := list(islice(iterator, chunk_size)):
+                if self.backend.bulk_read:
+                    for process_id, documents in zip(chunk, executor.map(self.backend.read_many, chunk)):
+                        processes[process_id] = self._merge_process(documents)
+                    continue
+                    
+                # Uma tarefa por processo: o custo de agendar uma tarefa por
+                # arquivo supera o ganho de paralelizar leituras tão pequenas
+                for process_id, documents in zip(chunk, executor.map(self._read_process, chunk)):
+                    processes[process_id] = self._merge_process(documents)
+            return processes
             
         except Exception as e:
-            self.logger.error(f"Failed to save automation goals: {str(e)}")
+            self.logger.error(f"Failed to load processes: {str(e)}")
             raise
-
-    # Métodos de carregamento
-    def load_process_details_form(self, process_id: str) -> Optional[Dict[str, Any]]:
-        """Carrega dados do ProcessDetailsForm."""
-        return self._load_form(process_id, "process_details.json")
-
-    def load_business_rules_form(self, process_id: str) -> Optional[Dict[str, Any]]:
-        """Carrega dados do BusinessRulesForm."""
-        return self._load_form(process_id, "business_rules.json")
-
-    def load_automation_goals_form(self, process_id: str) -> Optional[Dict[str, Any]]:
-        """Carrega dados do AutomationGoalsForm."""
-        return self._load_form(process_id, "automation_goals.json")
-
-    # Métodos de deleção
-    def delete_process_details_form(self, process_id: str) -> Dict[str, Any]:
-        """Remove dados do ProcessDetailsForm."""
-        return self._delete_form(process_id, "process_details.json")
-
-    def delete_business_rules_form(self, process_id: str) -> Dict[str, Any]:
-        """Remove dados do BusinessRulesForm."""
-        return self._delete_form(process_id, "business_rules.json")
-
-    def delete_automation_goals_form(self, process_id: str) -> Dict[str, Any]:
-        """Remove dados do AutomationGoalsForm."""
-        return self._delete_form(process_id, "automation_goals.json")
-
+            
     # Métodos auxiliares
     def _load_form(self, process_id: str, filename: str) -> Optional[Dict[str, Any]]:
         """Método genérico para carregar formulários."""
         try:
-            file_path = self.storage_path / process_id / filename
-            if not file_path.exists():
-                return None
-                
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return self._read(process_id, filename)
                 
         except Exception as e:
             self.logger.error(f"Failed to load {filename}: {str(e)}")
@@ -215,9 +395,7 @@ class MigrationPersistence:
     def _delete_form(self, process_id: str, filename: str) -> Dict[str, Any]:
         """Método genérico para deletar formulários."""
         try:
-            file_path = self.storage_path / process_id / filename
-            if file_path.exists():
-                file_path.unlink()
+            self._delete(process_id, filename)
                 
             self.logger.info(f"Deleted {filename} for process {process_id}")
             return {"success": True}
@@ -225,69 +403,3 @@ class MigrationPersistence:
         except Exception as e:
             self.logger.error(f"Failed to delete {filename}: {str(e)}")
             raise 
-
-    def save_data_form(self, data: Dict[str, Any], process_id: str) -> None:
-        """Salva dados do DataForm."""
-        try:
-            self.logger.info(f"Saving DataForm data for process {process_id}")
-            
-            # Cria diretório se não existir
-            process_dir = os.path.join(self.storage_path, process_id)
-            os.makedirs(process_dir, exist_ok=True)
-            
-            # Salva arquivo
-            file_path = os.path.join(process_dir, "data_form.json")
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-                
-            self.logger.info("DataForm data saved successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to save DataForm data: {str(e)}")
-            raise
-
-    def save_steps_form(self, data: Dict[str, Any], process_id: str) -> None:
-        """Salva dados do StepsForm."""
-        try:
-            self.logger.info(f"Saving StepsForm data for process {process_id}")
-            
-            # Cria diretório se não existir
-            process_dir = os.path.join(self.storage_path, process_id)
-            os.makedirs(process_dir, exist_ok=True)
-            
-            # Salva arquivo
-            file_path = os.path.join(process_dir, "steps_form.json")
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-                
-            self.logger.info("StepsForm data saved successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to save StepsForm data: {str(e)}")
-            raise
-
-    def delete_data_form(self, process_id: str) -> Dict[str, Any]:
-        """Remove dados do DataForm."""
-        try:
-            self.logger.info(f"Deleting DataForm data for process {process_id}")
-            
-            file_path = os.path.join(self.storage_path, process_id, "data_form.json")
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                
-            return {"success": True, "message": "DataForm data deleted successfully"}
-        except Exception as e:
-            self.logger.error(f"Failed to delete DataForm data: {str(e)}")
-            return {"success": False, "message": str(e)}
-
-    def delete_steps_form(self, process_id: str) -> Dict[str, Any]:
-        """Remove dados do StepsForm."""
-        try:
-            self.logger.info(f"Deleting StepsForm data for process {process_id}")
-            
-            file_path = os.path.join(self.storage_path, process_id, "steps_form.json")
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                
-            return {"success": True, "message": "StepsForm data deleted successfully"}
-        except Exception as e:
-            self.logger.error(f"Failed to delete StepsForm data: {str(e)}")
-            return {"success": False, "message": str(e)} 
\ No newline at end of file
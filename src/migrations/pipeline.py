@@ -0,0 +1,179 @@
+"""Pipeline de migração em estágios com backpressure."""
+from pathlib import Path
+from queue import Queue
+from typing import Dict, Any, Optional, Iterable, Union
+import logging
+import threading
+import time
+
+from src.migrations.data_mapper import DataMapper
+from src.migrations.validators import DataValidator
+from src.migrations.persistence import MigrationPersistence
+from src.migrations.form_registry import FORMS
+from src.migrations.batch_runner import record_process_id
+from src.migrations.legacy_reader import iter_legacy_records
+
+_DONE = object()
+
+class StreamingMigrationPipeline:
+    """
+    Migra um fluxo de registros legados em três estágios (mapear, validar,
+    persistir), cada um em sua thread e ligados por filas limitadas.
+    
+    Quando um estágio fica para trás, sua fila enche e o estágio anterior
+    bloqueia, até chegar ao leitor: o arquivo de entrada só é lido na
+    velocidade em que os dados são gravados e a memória fica limitada ao
+    tamanho das filas.
+    """
+    
+    def __init__(
+        self,
+        mapper: Optional[DataMapper] = None,
+        validator: Optional[DataValidator] = None,
+        persistence: Optional[MigrationPersistence] = None,
+        queue_size: int = 1000,
+        max_failures: int = 1000
+    ):
+        """
+        Inicializa o pipeline.
+        
+        Args:
+            mapper: Instância do DataMapper
+            validator: Instância do DataValidator
+            persistence: Persistência de destino
+            queue_size: Itens máximos em cada fila entre estágios
+            max_failures: Falhas detalhadas mantidas no relatório
+        """
+        self.mapper = mapper or DataMapper()
+        self.validator = validator or DataValidator()
+        self.persistence = persistence or MigrationPersistence()
+        self.queue_size = queue_size
+        self.max_failures = max_failures
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {}
+    
+    def _record_failure(self, stage: str, process_id: str, form: str, errors: Any) -> None:
+        """Registra uma falha de forma segura entre threads."""
+        with self._lock:
+            self._stats[f"{stage}_failed"] += 1
+            if len(self._stats["failures"]) < self.max_failures:
+                self._stats["failures"].append({
+                    "stage": stage,
+                    "process_id": process_id,
+                    "form": form,
+                    "errors": errors
+                })
+    
+    def _map_stage(self, inbox: Queue, outbox: Queue) -> None:
+        """Separa cada registro em formulários e aplica o mapeamento."""
+        try:
+            while (record := inbox.get()) is not _DONE:
+                try:
+                    self._map_record(record, outbox)
+                except Exception as e:
+                    # Registro malformado (ex.: linha que não é um objeto)
+                    self._record_failure("map", "", "record", str(e))
+        finally:
+            # O sentinela sempre segue adiante, ou os próximos estágios esperariam para sempre
+            outbox.put(_DONE)
+    
+    def _map_record(self, record: Dict[str, Any], outbox: Queue) -> None:
+        """Mapeia os formulários de um registro."""
+        process_id = record_process_id(record)
+        for form, spec in FORMS.items():
+            old_data = record.get(form)
+            if old_data is None:
+                continue
+            try:
+                mapped = spec.map(self.mapper, spec.prepare(old_data, process_id))
+            except Exception as e:
+                self._record_failure("map", process_id, form, str(e))
+                continue
+            outbox.put((process_id, form, mapped))
+    
+    def _validate_stage(self, inbox: Queue, outbox: Queue) -> None:
+        """Valida os formulários mapeados."""
+        try:
+            while (item := inbox.get()) is not _DONE:
+                process_id, form, mapped = item
+                try:
+                    is_valid, errors = FORMS[form].validate(self.validator, mapped)
+                except Exception as e:
+                    is_valid, errors = False, str(e)
+                if is_valid:
+                    outbox.put(item)
+                else:
+                    self._record_failure("validate", process_id, form, errors)
+        finally:
+            outbox.put(_DONE)
+    
+    def _persist_stage(self, inbox: Queue) -> None:
+        """Grava os formulários válidos."""
+        while (item := inbox.get()) is not _DONE:
+            process_id, form, mapped = item
+            try:
+                self.persistence.save_form(process_id, form, mapped)
+            except Exception as e:
+                self._record_failure("persist", process_id, form, str(e))
+                continue
+            with self._lock:
+                self._stats["forms_persisted"] += 1
+    
+    def run(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Executa o pipeline sobre um fluxo de registros.
+        
+        Args:
+            records: Registros legados (lidos sob demanda)
+            
+        Returns:
+            Dict com contadores por estágio e falhas
+        """
+        self._stats = {
+            "records": 0,
+            "forms_persisted": 0,
+            "map_failed": 0,
+            "validate_failed": 0,
+            "persist_failed": 0,
+            "failures": []
+        }
+        to_map, to_validate, to_persist = (Queue(self.queue_size) for _ in range(3))
+        threads = [
+            threading.Thread(target=self._map_stage, args=(to_map, to_validate), daemon=True),
+            threading.Thread(target=self._validate_stage, args=(to_validate, to_persist), daemon=True),
+            threading.Thread(target=self._persist_stage, args=(to_persist,), daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+            
+        started = time.perf_counter()
+        try:
+            for record in records:
+                to_map.put(record)  # Bloqueia quando o pipeline está cheio
+                self._stats["records"] += 1
+        finally:
+            to_map.put(_DONE)
+            for thread in threads:
+                thread.join()
+                
+        elapsed = time.perf_counter() - started
+        self._stats["elapsed_s"] = round(elapsed, 3)
+        self._stats["records_per_s"] = round(self._stats["records"] / elapsed, 2) if elapsed else 0.0
+        self.logger.info(
+            f"Streaming migration finished: {self._stats['records']} records, "
+            f"{self._stats['forms_persisted']} forms persisted"
+        )
+        return self._stats
+    
+    def migrate_file(self, path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Migra um arquivo de exportação legado (JSONL ou array JSON).
+        
+        Args:
+            path: Caminho do arquivo, opcionalmente .gz
+            
+        Returns:
+            Dict com o resultado do pipeline
+        """
+        return self.run(iter_legacy_records(path))
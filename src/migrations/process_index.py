@@ -0,0 +1,204 @@
+"""Índices secundários dos processos migrados."""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Tuple, Union
+import argparse
+import json
+import sqlite3
+import threading
+
+# Campos do IdentificationForm indexados
+INDEXED_FIELDS = ("status", "department", "owner")
+
+INDEX_FILE = "index.db"
+
+class ProcessIndex:
+    """
+    Índice persistente (SQLite) de processos por status, departamento e dono.
+    
+    É atualizado pela persistência a cada gravação ou remoção do
+    IdentificationForm, então consultas e a listagem de processos custam
+    O(resultados) em vez de ler todos os identification.json. Por ser
+    derivado dos formulários, pode ser reconstruído a qualquer momento.
+    """
+    
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Inicializa o índice.
+        
+        Args:
+            db_path: Caminho do arquivo do índice
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS processes ("
+                " process_id TEXT PRIMARY KEY,"
+                " process_name TEXT,"
+                " status TEXT,"
+                " department TEXT,"
+                " owner TEXT,"
+                " updated_at TEXT NOT NULL"
+                ")"
+            )
+            for field in INDEXED_FIELDS:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_processes_{field} ON processes ({field})")
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual, criada na primeira utilização."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Workers de um pool de processos podem gravar ao mesmo tempo
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @staticmethod
+    def _row(process_id: str, data: Dict[str, Any]) -> Tuple:
+        return (
+            process_id,
+            data.get("process_name"),
+            data.get("status"),
+            data.get("department"),
+            data.get("owner"),
+            datetime.now().isoformat()
+        )
+    
+    def update(self, process_id: str, data: Dict[str, Any]) -> None:
+        """
+        Indexa (ou reindexa) um processo.
+        
+        Args:
+            process_id: ID do processo
+            data: Dados do IdentificationForm
+        """
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO processes "
+                "(process_id, process_name, status, department, owner, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(process_id, data)
+            )
+    
+    def remove(self, process_id: str) -> None:
+        """Remove um processo do índice."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM processes WHERE process_id = ?", (process_id,))
+    
+    def rebuild(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Recria o índice a partir dos dados de identificação.
+        
+        Args:
+            entries: Pares (process_id, dados do IdentificationForm)
+            
+        Returns:
+            int: Quantidade de processos indexados
+        """
+        with self._connection() as conn:  # Uma transação: leitores veem o índice antigo até o fim
+            conn.execute("DELETE FROM processes")
+            count = 0
+            for process_id, data in entries:
+                conn.execute(
+                    "INSERT OR REPLACE INTO processes "
+                    "(process_id, process_name, status, department, owner, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    self._row(process_id, data)
+                )
+                count += 1
+        return count
+    
+    @staticmethod
+    def _where(filters: Dict[str, Optional[str]]) -> Tuple[str, List[str]]:
+        """Monta o filtro SQL a partir dos campos indexados informados."""
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Field not indexed: {', '.join(sorted(unknown))}")
+        conditions = [(field, value) for field, value in filters.items() if value is not None]
+        if not conditions:
+            return "", []
+        return (
+            " WHERE " + " AND ".join(f"{field} = ?" for field, _ in conditions),
+            [value for _, value in conditions]
+        )
+    
+    def find(self, **filters: Optional[str]) -> List[str]:
+        """
+        IDs dos processos que atendem aos filtros (ex.: status="in_review").
+        
+        Returns:
+            Lista de IDs ordenada
+        """
+        where, params = self._where(filters)
+        rows = self._connection().execute(
+            f"SELECT process_id FROM processes{where} ORDER BY process_id", params
+        )
+        return [row[0] for row in rows]
+    
+    def list(self, **filters: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Resumo dos processos que atendem aos filtros, para listagens.
+        
+        Returns:
+            Lista de dicts com process_id, process_name, status, department e owner
+        """
+        where, params = self._where(filters)
+        rows = self._connection().execute(
+            "SELECT process_id, process_name, status, department, owner "
+            f"FROM processes{where} ORDER BY process_id",
+            params
+        )
+        return [dict(row) for row in rows]
+    
+    def counts(self, field: str) -> Dict[str, int]:
+        """
+        Quantidade de processos por valor de um campo indexado.
+        
+        Args:
+            field: "status", "department" ou "owner"
+            
+        Returns:
+            Dict valor -> quantidade
+        """
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f"Field not indexed: {field}")
+        rows = self._connection().execute(
+            f"SELECT {field}, COUNT(*) FROM processes GROUP BY {field} ORDER BY {field}"
+        )
+        return {row[0]: row[1] for row in rows}
+    
+    def close(self) -> None:
+        """Fecha as conexões abertas."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando: reconstrói o índice."""
+    # Importado aqui: a persistência depende deste módulo
+    from src.migrations.persistence import MigrationPersistence
+    from src.migrations.storage import BACKENDS
+    
+    parser = argparse.ArgumentParser(description="Reconstrói o índice de processos migrados.")
+    parser.add_argument("--storage", default="data/migrations", help="Pasta dos dados migrados")
+    parser.add_argument("--backend", default="directory", choices=list(BACKENDS))
+    args = parser.parse_args(argv)
+    
+    persistence = MigrationPersistence(args.storage, backend=args.backend)
+    try:
+        count = persistence.rebuild_index()
+        print(json.dumps({"indexed": count, "status": persistence.index.counts("status")}, ensure_ascii=False))
+    finally:
+        persistence.close()
+    return 0
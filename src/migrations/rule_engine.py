@@ -0,0 +1,263 @@
+"""Motor de regras de validação compiladas (config/validation_rules.yaml)."""
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Callable, Union
+import re
+import yaml
+
+RULES_PATH = Path(__file__).parent.parent.parent / "config" / "validation_rules.yaml"
+
+ValidationResult = Tuple[bool, Dict[str, str]]
+Validator = Callable[[Dict[str, Any]], ValidationResult]
+
+# Chave do erro de um registro que não pôde ser validado (validate_many)
+RECORD_ERROR_KEY = "record"
+
+CHECKS = ("required", "pattern", "date", "enum", "type", "each")
+RULE_OPTIONS = {"field", "key", "message", "nullable", "rules"} | set(CHECKS)
+
+# Únicos nomes disponíveis para o código gerado
+_BUILTINS = {
+    "enumerate": enumerate, "isinstance": isinstance, "len": len, "list": list,
+    "str": str, "type": type, "Exception": Exception
+}
+
+# Mesma gramática que datetime.strptime(valor, "%Y-%m-%d") aceita
+_ISO_DATE = re.compile(r"(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])", re.IGNORECASE)
+
+def is_iso_date(value: str) -> bool:
+    """
+    Verifica se o texto é uma data AAAA-MM-DD válida.
+    
+    Aceita exatamente o que datetime.strptime(value, "%Y-%m-%d") aceita,
+    sem o custo de interpretar o formato a cada chamada.
+    """
+    match = _ISO_DATE.fullmatch(value)
+    if match is None:
+        return False
+    try:
+        date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        return True
+    except ValueError:
+        return False
+
+class _RuleCompiler:
+    """Gera o código Python que valida um formulário."""
+    
+    def __init__(self, form_name: str, rules: List[Dict[str, Any]], enums: Dict[str, Tuple[str, ...]]):
+        self.form_name = form_name
+        self.rules = rules
+        self.enums = enums
+        # Regexes e enums compilados, acessados pelo código gerado como globais
+        self.constants: Dict[str, Any] = {"is_iso_date": is_iso_date, "RECORD_ERROR_KEY": RECORD_ERROR_KEY}
+        self.lines: List[str] = []
+        self.loops = 0
+        self.locals = 0
+    
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"Validation rules '{self.form_name}': {message}")
+    
+    def _constant(self, prefix: str, value: Any) -> str:
+        for name, existing in self.constants.items():
+            if name.startswith(prefix) and existing == value:
+                return name
+        name = f"{prefix}{len(self.constants)}"
+        self.constants[name] = value
+        return name
+    
+    def _emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+    
+    def _container(self, var: str, keys: Tuple[str, ...], scope: Dict[tuple, str], depth: int) -> str:
+        """Dict intermediário de um campo aninhado, lido uma vez por escopo."""
+        expression = var
+        for level in range(1, len(keys) + 1):
+            path = keys[:level]
+            if path not in scope:
+                self.locals += 1
+                scope[path] = f"container{self.locals}"
+                self._emit(depth, f"{scope[path]} = {expression}.get({path[-1]!r}, {{}})")
+            expression = scope[path]
+        return expression
+    
+    def _choices(self, rule: Dict[str, Any]) -> Tuple[str, ...]:
+        enum = rule["enum"]
+        if isinstance(enum, str):
+            if enum not in self.enums:
+                raise self._error(f"unknown enum '{enum}'")
+            return self.enums[enum]
+        return tuple(enum)
+    
+    def _key(self, prefix: Optional[str], key: str) -> str:
+        """Expressão da chave do erro (f-string dentro de listas)."""
+        if prefix is None:
+            return repr(key)
+        return "f" + repr(f"{prefix}.{key}")
+    
+    def compile_rules(self, rules: List[Dict[str, Any]], var: str, prefix: Optional[str], depth: int) -> None:
+        scope: Dict[tuple, str] = {}
+        for rule in rules:
+            if not isinstance(rule, dict):
+                raise self._error("each rule must be a mapping")
+            unknown = set(rule) - RULE_OPTIONS
+            if unknown:
+                raise self._error(f"unknown rule options: {', '.join(sorted(unknown))}")
+            checks = [check for check in CHECKS if check in rule]
+            if len(checks) != 1:
+                raise self._error(f"rule must have exactly one of {', '.join(CHECKS)}: {rule}")
+                
+            if checks[0] == "each":
+                self._compile_each(rule, var, prefix, scope, depth)
+                continue
+            fields = rule.get("field")
+            if not fields:
+                raise self._error(f"rule without field: {rule}")
+            for field in [fields] if isinstance(fields, str) else fields:
+                self._compile_check(checks[0], rule, field, var, prefix, scope, depth)
+    
+    def _compile_each(self, rule: Dict[str, Any], var: str, prefix: Optional[str],
+                      scope: Dict[tuple, str], depth: int) -> None:
+        keys = tuple(rule["each"].split("."))
+        container = self._container(var, keys[:-1], scope, depth)
+        self.loops += 1
+        index, item = f"i{self.loops}", f"item{self.loops}"
+        name = rule.get("key", rule["each"])
+        item_prefix = f"{name}[{{{index}}}]" if prefix is None else f"{prefix}.{name}[{{{index}}}]"
+        self._emit(depth, f"for {index}, {item} in enumerate({container}.get({keys[-1]!r}, [])):")
+        self.compile_rules(rule.get("rules") or [], item, item_prefix, depth + 1)
+        if not rule.get("rules"):
+            self._emit(depth + 1, "pass")
+    
+    def _compile_check(self, check: str, rule: Dict[str, Any], field: str, var: str,
+                       prefix: Optional[str], scope: Dict[tuple, str], depth: int) -> None:
+        keys = tuple(field.split("."))
+        container = self._container(var, keys[:-1], scope, depth)
+        key = self._key(prefix, rule.get("key", field))
+        message = rule.get("message", "Field {field} is required" if check == "required" else "Invalid {field}")
+        message = message.replace("{field}", keys[-1])
+        
+        if check == "type" and rule["type"] != "list":
+            raise self._error(f"unsupported type '{rule['type']}'")
+        if check == "type" and rule.get("nullable", True) is False:
+            self._emit(depth, f"if not isinstance({container}.get({keys[-1]!r}, []), list):")
+        else:
+            value = f"{container}.get({keys[-1]!r})"
+            if check != "required":
+                # Lido uma vez: as demais verificações só valem para valores presentes
+                self._emit(depth, f"value = {value}")
+            if check == "required":
+                condition = f"not {value}"
+            elif check == "pattern":
+                matcher = self._constant("pattern", re.compile(rule["pattern"]).match)
+                condition = f"value and not {matcher}(value)"
+            elif check == "date":
+                condition = "value and not is_iso_date(value)"
+            elif check == "enum":
+                choices = self._choices(rule)
+                message = message.replace("{choices}", ", ".join(str(choice) for choice in choices))
+                if all(isinstance(choice, str) for choice in choices):
+                    # Valores não hashable (listas, dicts) nunca são iguais a um texto do enum
+                    enum = self._constant("enum", frozenset(choices))
+                    condition = f"value and (not isinstance(value, str) or value not in {enum})"
+                else:
+                    condition = f"value and value not in {self._constant('enum', choices)}"
+            else:
+                condition = "value and not isinstance(value, list)"
+            self._emit(depth, f"if {condition}:")
+        self._emit(depth + 1, f"errors[{key}] = {message!r}")
+    
+    def source(self) -> str:
+        """
+        Código das funções validate_<formulário>(data) e
+        validate_many_<formulário>(records), com o mesmo corpo.
+        """
+        self.compile_rules(self.rules, "data", None, 0)
+        body = ["errors = {}"] + self.lines
+        single = "\n".join("    " + line for line in body + ["return len(errors) == 0, errors"])
+        many = "\n".join("            " + line for line in body)
+        # No lote, um registro malformado vira erro dele, sem abortar os demais
+        return (
+            f"def validate_{self.form_name}(data):\n{single}\n\n"
+            f"def validate_many_{self.form_name}(records):\n"
+            f"    results = []\n    append = results.append\n"
+            f"    for data in records:\n        try:\n{many}\n"
+            f"        except Exception as error:\n"
+            f"            errors = {{RECORD_ERROR_KEY: 'Invalid record: ' + type(error).__name__ + ': ' + str(error)}}\n"
+            f"        append(errors)\n    return results\n"
+        )
+
+class RuleEngine:
+    """
+    Valida formulários com regras compiladas uma única vez.
+    
+    Cada formulário vira uma função Python gerada a partir das regras:
+    enums como frozensets, regexes pré-compiladas e datas verificadas sem
+    strptime. O resultado é o mesmo (bool, erros) dos métodos do
+    DataValidator.
+    """
+    
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Compila as regras.
+        
+        Args:
+            spec: Dict com "enums" e "forms" (formato de config/validation_rules.yaml)
+        """
+        self.enums: Dict[str, Tuple[str, ...]] = {
+            name: tuple(values) for name, values in (spec.get("enums") or {}).items()
+        }
+        self.sources: Dict[str, str] = {}
+        self.validators: Dict[str, Validator] = {}
+        self._batch_validators: Dict[str, Callable[[List[Dict[str, Any]]], List[Dict[str, str]]]] = {}
+        for form_name, rules in (spec.get("forms") or {}).items():
+            compiler = _RuleCompiler(form_name, rules or [], self.enums)
+            source = compiler.source()
+            namespace: Dict[str, Any] = dict(
+                compiler.constants,
+                __builtins__=_BUILTINS
+            )
+            exec(compile(source, f"<rules {form_name}>", "exec"), namespace)
+            self.sources[form_name] = source
+            self.validators[form_name] = namespace[f"validate_{form_name}"]
+            self._batch_validators[form_name] = namespace[f"validate_many_{form_name}"]
+    
+    @classmethod
+    def from_file(cls, path: Union[str, Path, None] = None) -> "RuleEngine":
+        """Carrega e compila as regras de um arquivo YAML (padrão: config/validation_rules.yaml)."""
+        with open(path or RULES_PATH, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f))
+    
+    def _validator(self, form_name: str) -> Validator:
+        if form_name not in self.validators:
+            raise ValueError(f"Invalid form name: {form_name}")
+        return self.validators[form_name]
+    
+    def validate(self, form_name: str, data: Dict[str, Any]) -> ValidationResult:
+        """
+        Valida um formulário.
+        
+        Returns:
+            Tuple[bool, Dict]: (resultado da validação, erros encontrados)
+        """
+        return self._validator(form_name)(data)
+    
+    def validate_many(self, form_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Valida uma lista de registros do mesmo formulário.
+        
+        Args:
+            form_name: Nome do formulário
+            records: Registros já mapeados
+            
+        Returns:
+            Lista com os erros de cada registro, na mesma ordem (vazio se válido;
+            registros que não puderam ser validados trazem o erro em RECORD_ERROR_KEY)
+        """
+        self._validator(form_name)
+        return self._batch_validators[form_name](records)
+
+@lru_cache(maxsize=None)
+def default_engine() -> RuleEngine:
+    """Motor com as regras de config/validation_rules.yaml (compiladas uma única vez)."""
+    return RuleEngine.from_file()
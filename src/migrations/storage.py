@@ -0,0 +1,554 @@
+"""Backends de armazenamento dos dados migrados."""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, List, TypeVar, Union, Hashable
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import uuid
+
+from src.migrations.codecs import StorageCodec, get_codec
+from src.utils.atomic_write import atomic_write, fsync_dir, fsync_paths
+
+PathLike = Union[str, Path]
+T = TypeVar("T")
+
+class StorageBackend(ABC):
+    """
+    Interface de armazenamento usada pelo MigrationPersistence.
+    
+    Guarda documentos identificados por (process_id, nome do arquivo do
+    formulário, ex.: "identification.json"), serializados pelo codec do
+    backend. A leitura aceita qualquer codec, então trocar o codec não
+    exige migrar os dados já gravados.
+    """
+    
+    codec: StorageCodec
+    # True quando read_many lê o processo inteiro de uma vez (um arquivo ou consulta)
+    bulk_read = False
+    # Aberto só para leitura: nada é criado nem alterado, e gravações falham
+    read_only = False
+    
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise PermissionError(f"{type(self).__name__} was opened read-only")
+    
+    @abstractmethod
+    def read(self, process_id: str, name: str) -> Optional[Dict[str, Any]]:
+        """Lê um documento; retorna None se não existir."""
+        pass
+    
+    @abstractmethod
+    def write(self, process_id: str, name: str, document: Dict[str, Any]) -> None:
+        """Grava (ou substitui) um documento."""
+        pass
+    
+    @abstractmethod
+    def delete(self, process_id: str, name: str) -> None:
+        """Remove um documento, se existir."""
+        pass
+    
+    @abstractmethod
+    def read_many(self, process_id: str) -> Dict[str, Dict[str, Any]]:
+        """Lê todos os documentos de um processo."""
+        pass
+    
+    @abstractmethod
+    def list_process_ids(self) -> List[str]:
+        """Lista os processos armazenados, ordenados."""
+        pass
+    
+    @abstractmethod
+    def version(self, process_id: str, name: str) -> Optional[Hashable]:
+        """
+        Token barato que muda quando o documento muda (usado pelo cache).
+        
+        Returns:
+            Token de versão, ou None se o documento certamente não existe
+        """
+        pass
+    
+    def write_many(self, process_id: str, documents: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Grava vários documentos de um processo.
+        
+        A implementação padrão grava um a um; backends que suportam
+        transações gravam tudo ou nada.
+        """
+        for name, document in documents.items():
+            self.write(process_id, name, document)
+    
+    def close(self) -> None:
+        """Libera recursos do backend."""
+        pass
+
+class DirectoryBackend(StorageBackend):
+    """
+    Layout original: uma pasta por processo e um arquivo JSON por formulário.
+    
+    write_many monta a nova versão da pasta do processo em uma pasta oculta
+    de staging (formulários inalterados entram como hard links) e a troca
+    pela atual com renames, então os formulários são gravados juntos ou
+    nenhum é. Os arquivos novos e a staging vão a disco antes da troca.
+    Entre os dois renames a pasta do processo não existe: um marcador
+    oculto (.<processo>.swap) aponta a versão anterior, e as leituras que
+    não acham a pasta usam essa versão até a nova aparecer (apenas
+    list_process_ids não enxerga o processo nesse intervalo). As pastas
+    ocultas levam o PID do processo que as criou, e sobras de uma troca
+    interrompida são resolvidas ao abrir apenas quando esse processo já
+    terminou: outros processos (workers do pool, por exemplo) podem estar
+    gravando na mesma raiz.
+    """
+    
+    STAGING_MARKER = ".staging-"
+    OLD_MARKER = ".old-"
+    SWAP_SUFFIX = ".swap"
+    
+    def __init__(self, root: PathLike, codec: Union[str, StorageCodec, None] = None, read_only: bool = False):
+        """
+        Inicializa o backend.
+        
+        Args:
+            root: Pasta raiz dos processos
+            codec: Codec de gravação (padrão: JSON compacto)
+            read_only: Não cria a pasta nem recupera trocas interrompidas
+        """
+        self.root = Path(root)
+        self.codec = get_codec(codec)
+        self.read_only = read_only
+        self._locks = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+        if not read_only:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self.recover()
+    
+    def _lock(self, process_id: str) -> threading.Lock:
+        """Lock do processo: serializa trocas concorrentes da mesma pasta."""
+        with self._locks_guard:
+            return self._locks[process_id]
+    
+    def _hidden_name(self, process_id: str, marker: str) -> str:
+        """Prefixo de uma pasta oculta de write_many, com o PID dono."""
+        return f".{process_id}{marker}{os.getpid()}-"
+    
+    @staticmethod
+    def _abandoned(name: str, marker: str) -> bool:
+        """True se o processo que criou a pasta oculta não está mais rodando."""
+        owner = name[name.rindex(marker) + len(marker):].split("-", 1)[0]
+        if not owner.isdigit():
+            # Pasta sem dono registrado (formato antigo)
+            return True
+        pid = int(owner)
+        if pid == os.getpid():
+            # Outra instância deste mesmo processo pode estar no meio de uma troca
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # Existe, mas pertence a outro usuário
+            return False
+        return False
+    
+    def _swap_marker(self, process_id: str) -> Path:
+        """Marcador gravado durante a troca com o nome da versão anterior."""
+        return self.root / f".{process_id}{self.SWAP_SUFFIX}"
+    
+    def _during_swap(self, process_id: str, reader: Callable[[Path], T]) -> T:
+        """
+        Refaz uma leitura que não achou a pasta do processo.
+        
+        Se uma troca está em andamento, lê a versão anterior apontada pelo
+        marcador; se a nova pasta apareceu nesse meio tempo (e a anterior
+        pode ter sido apagada), lê a nova.
+        
+        Args:
+            process_id: ID do processo
+            reader: Leitura a partir de uma pasta de processo, que devolve
+                vazio se a pasta não existe
+        """
+        process_path = self.root / process_id
+        try:
+            old = self.root / self._swap_marker(process_id).read_text()
+        except FileNotFoundError:
+            old = None
+        if old is not None:
+            try:
+                result = reader(old)
+            except FileNotFoundError:
+                pass  # Apagada logo após a troca
+            else:
+                if not process_path.exists():
+                    return result
+        return reader(process_path)
+    
+    def recover(self) -> None:
+        """Conclui ou desfaz trocas de pasta interrompidas por processos que já terminaram."""
+        for entry in os.scandir(self.root):
+            if not entry.name.startswith("."):
+                continue
+            if entry.name.endswith(self.SWAP_SUFFIX) and entry.is_file():
+                # O marcador contém o nome da versão anterior, com o PID dono
+                owner = Path(entry.path).read_text()
+                if self.OLD_MARKER not in owner or self._abandoned(owner, self.OLD_MARKER):
+                    os.unlink(entry.path)
+                continue
+            if not entry.is_dir():
+                continue
+            marker = self.STAGING_MARKER if self.STAGING_MARKER in entry.name else self.OLD_MARKER
+            if marker not in entry.name or not self._abandoned(entry.name, marker):
+                continue
+            if marker == self.STAGING_MARKER:
+                # Staging nunca promovido: a versão anterior continua válida
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                process_id = entry.name[1:entry.name.rindex(self.OLD_MARKER)]
+                if (self.root / process_id).exists():
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    # Interrompido entre os dois renames: restaura a versão anterior
+                    os.rename(entry.path, self.root / process_id)
+    
+    def _read_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            data = file_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        return self.codec.decode(data)
+    
+    def read(self, process_id: str, name: str) -> Optional[Dict[str, Any]]:
+        document = self._read_file(self.root / process_id / name)
+        if document is None:
+            document = self._during_swap(process_id, lambda directory: self._read_file(directory / name))
+        return document
+    
+    def write(self, process_id: str, name: str, document: Dict[str, Any]) -> None:
+        self._check_writable()
+        # Cada arquivo é substituído atomicamente; o fsync fica a cargo do chamador
+        with atomic_write(self.root / process_id / name, mode="wb", fsync=False) as f:
+            f.write(self.codec.encode(document))
+    
+    def delete(self, process_id: str, name: str) -> None:
+        self._check_writable()
+        file_path = self.root / process_id / name
+        if file_path.exists():
+            file_path.unlink()
+    
+    def write_many(self, process_id: str, documents: Dict[str, Dict[str, Any]]) -> None:
+        self._check_writable()
+        process_path = self.root / process_id
+        with self._lock(process_id):
+            staging = Path(tempfile.mkdtemp(dir=self.root, prefix=self._hidden_name(process_id, self.STAGING_MARKER)))
+            try:
+                os.chmod(staging, 0o755)  # mkdtemp cria com 0700
+                if process_path.is_dir():
+                    for existing in process_path.iterdir():
+                        if existing.name not in documents and existing.is_file():
+                            _link_or_copy(existing, staging / existing.name)
+                for name, document in documents.items():
+                    (staging / name).write_bytes(self.codec.encode(document))
+                # Arquivos novos e entradas da staging em disco antes de promovê-la
+                fsync_paths(staging / name for name in documents)
+                    
+                if process_path.exists():
+                    old = self.root / f"{self._hidden_name(process_id, self.OLD_MARKER)}{uuid.uuid4().hex}"
+                    self._swap(process_path, staging, old)
+                else:
+                    os.rename(staging, process_path)
+                fsync_dir(self.root)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+    
+    def _swap(self, process_path: Path, staging: Path, old: Path) -> None:
+        """Troca a pasta do processo pela staging, anunciando a versão anterior aos leitores."""
+        marker = self._swap_marker(process_path.name)
+        with atomic_write(marker, fsync=False) as f:
+            f.write(old.name)
+        try:
+            os.rename(process_path, old)
+            try:
+                os.rename(staging, process_path)
+            except BaseException:
+                os.rename(old, process_path)
+                raise
+        finally:
+            marker.unlink()
+        shutil.rmtree(old, ignore_errors=True)
+    
+    def _read_directory(self, process_path: Path) -> Dict[str, Dict[str, Any]]:
+        if not process_path.is_dir():
+            return {}
+        documents = {}
+        for file_path in sorted(process_path.glob("*.json")):
+            documents[file_path.name] = self.codec.decode(file_path.read_bytes())
+        return documents
+    
+    def read_many(self, process_id: str) -> Dict[str, Dict[str, Any]]:
+        process_path = self.root / process_id
+        if process_path.is_dir():
+            return self._read_directory(process_path)
+        return self._during_swap(process_id, self._read_directory)
+    
+    def list_process_ids(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        # Pastas ocultas são staging/versões antigas de write_many
+        return sorted(
+            path.name for path in self.root.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        )
+    
+    def version(self, process_id: str, name: str) -> Optional[Hashable]:
+        token = _file_version(self.root / process_id / name)
+        if token is None:
+            token = self._during_swap(process_id, lambda directory: _file_version(directory / name))
+        return token
+
+class SingleFileBackend(StorageBackend):
+    """
+    Um arquivo por processo com todos os formulários.
+    
+    Ler um processo inteiro é uma única leitura, e write_many substitui o
+    arquivo atomicamente: ou todos os formulários são gravados ou nenhum.
+    """
+    
+    bulk_read = True
+    
+    def __init__(self, root: PathLike, codec: Union[str, StorageCodec, None] = None, read_only: bool = False):
+        """
+        Inicializa o backend.
+        
+        Args:
+            root: Pasta com um arquivo <process_id>.json por processo
+            codec: Codec de gravação (padrão: JSON compacto)
+            read_only: Não cria a pasta; gravações falham
+        """
+        self.root = Path(root)
+        self.read_only = read_only
+        if not read_only:
+            self.root.mkdir(parents=True, exist_ok=True)
+        self.codec = get_codec(codec)
+        self._locks = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+    
+    def _path(self, process_id: str) -> Path:
+        return self.root / f"{process_id}.json"
+    
+    def _lock(self, process_id: str) -> threading.Lock:
+        """Lock do processo: serializa leituras-modificações-gravações concorrentes."""
+        with self._locks_guard:
+            return self._locks[process_id]
+    
+    def read_many(self, process_id: str) -> Dict[str, Dict[str, Any]]:
+        file_path = self._path(process_id)
+        if not file_path.exists():
+            return {}
+        return self.codec.decode(file_path.read_bytes())
+    
+    def _replace(self, process_id: str, documents: Dict[str, Dict[str, Any]]) -> None:
+        """Substitui atomicamente o arquivo do processo."""
+        with atomic_write(self._path(process_id), mode="wb", fsync=False) as f:
+            f.write(self.codec.encode(documents))
+    
+    def read(self, process_id: str, name: str) -> Optional[Dict[str, Any]]:
+        return self.read_many(process_id).get(name)
+    
+    def write_many(self, process_id: str, documents: Dict[str, Dict[str, Any]]) -> None:
+        self._check_writable()
+        with self._lock(process_id):
+            current = self.read_many(process_id)
+            current.update(documents)
+            self._replace(process_id, current)
+    
+    def write(self, process_id: str, name: str, document: Dict[str, Any]) -> None:
+        self.write_many(process_id, {name: document})
+    
+    def delete(self, process_id: str, name: str) -> None:
+        self._check_writable()
+        with self._lock(process_id):
+            current = self.read_many(process_id)
+            if name not in current:
+                return
+            del current[name]
+            if not current:
+                self._path(process_id).unlink()
+                return
+            self._replace(process_id, current)
+    
+    def list_process_ids(self) -> List[str]:
+        return sorted(path.stem for path in self.root.glob("*.json"))
+    
+    def version(self, process_id: str, name: str) -> Optional[Hashable]:
+        # Qualquer gravação substitui o arquivo inteiro do processo
+        return _file_version(self._path(process_id))
+
+class SQLiteBackend(StorageBackend):
+    """
+    Banco SQLite embutido com uma linha por (processo, formulário).
+    
+    Usa WAL, então leitores não bloqueiam a escrita, e cada thread tem sua
+    própria conexão. write_many grava todos os formulários em uma transação.
+    """
+    
+    bulk_read = True
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS forms ("
+        " process_id TEXT NOT NULL,"
+        " name TEXT NOT NULL,"
+        " document BLOB NOT NULL,"
+        " updated_at TEXT NOT NULL,"
+        " PRIMARY KEY (process_id, name)"
+        ") WITHOUT ROWID"
+    )
+    
+    def __init__(self, db_path: PathLike, codec: Union[str, StorageCodec, None] = None, read_only: bool = False):
+        """
+        Inicializa o backend.
+        
+        Args:
+            db_path: Caminho do arquivo do banco
+            codec: Codec de gravação dos documentos (padrão: JSON compacto)
+            read_only: Abre o banco em modo somente leitura (um banco que
+                ainda não existe é lido como vazio); gravações falham
+        """
+        self.db_path = Path(db_path)
+        self.codec = get_codec(codec)
+        self.read_only = read_only
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connection() as conn:
+                conn.execute(self.SCHEMA)
+    
+    def _open_read_only(self) -> sqlite3.Connection:
+        if not self.db_path.exists():
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.execute(self.SCHEMA)
+            return conn
+        return sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual, criada na primeira utilização."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.read_only:
+                conn = self._open_read_only()
+            else:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def read(self, process_id: str, name: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT document FROM forms WHERE process_id = ? AND name = ?",
+            (process_id, name)
+        ).fetchone()
+        return self.codec.decode(row[0]) if row else None
+    
+    def write_many(self, process_id: str, documents: Dict[str, Dict[str, Any]]) -> None:
+        self._check_writable()
+        now = datetime.now().isoformat()
+        with self._connection() as conn:  # Commit ao sair, rollback em caso de erro
+            conn.executemany(
+                "INSERT OR REPLACE INTO forms (process_id, name, document, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (process_id, name, self.codec.encode(document), now)
+                    for name, document in documents.items()
+                ]
+            )
+    
+    def write(self, process_id: str, name: str, document: Dict[str, Any]) -> None:
+        self.write_many(process_id, {name: document})
+    
+    def delete(self, process_id: str, name: str) -> None:
+        self._check_writable()
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM forms WHERE process_id = ? AND name = ?",
+                (process_id, name)
+            )
+    
+    def read_many(self, process_id: str) -> Dict[str, Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT name, document FROM forms WHERE process_id = ? ORDER BY name",
+            (process_id,)
+        )
+        return {name: self.codec.decode(document) for name, document in rows}
+    
+    def list_process_ids(self) -> List[str]:
+        rows = self._connection().execute(
+            "SELECT DISTINCT process_id FROM forms ORDER BY process_id"
+        )
+        return [row[0] for row in rows]
+    
+    def version(self, process_id: str, name: str) -> Optional[Hashable]:
+        # data_version muda quando outra conexão faz commit; é por conexão,
+        # então o token inclui a conexão da thread atual
+        conn = self._connection()
+        return (id(conn), conn.execute("PRAGMA data_version").fetchone()[0])
+    
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Cria um hard link (barato, mantém o inode) ou copia se não suportado."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def _file_version(path: Path) -> Optional[Hashable]:
+    """Versão de um arquivo: mtime, tamanho e inode (atomic_write troca o inode)."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+BACKENDS = {
+    "directory": DirectoryBackend,
+    "single_file": SingleFileBackend,
+    "sqlite": SQLiteBackend
+}
+
+def create_backend(
+    kind: str,
+    storage_path: PathLike,
+    codec: Union[str, StorageCodec, None] = None,
+    read_only: bool = False
+) -> StorageBackend:
+    """
+    Cria um backend pelo nome.
+    
+    Args:
+        kind: "directory", "single_file" ou "sqlite"
+        storage_path: Pasta de armazenamento (o SQLite usa migrations.db dentro dela)
+        codec: Codec de gravação (ver codecs.get_codec)
+        read_only: Abre só para leitura, sem criar nem alterar nada
+        
+    Returns:
+        StorageBackend
+    """
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {kind}")
+    if kind == "sqlite":
+        return SQLiteBackend(Path(storage_path) / "migrations.db", codec, read_only)
+    return BACKENDS[kind](storage_path, codec, read_only)
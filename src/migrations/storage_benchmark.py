@@ -0,0 +1,199 @@
+"""Benchmark dos backends de armazenamento do MigrationPersistence."""
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+import argparse
+import subprocess
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from src.migrations.persistence import MigrationPersistence, FORM_FILES
+from src.migrations.storage import BACKENDS
+
+def sample_forms(number: int) -> Dict[str, Dict[str, Any]]:
+    """Formulários migrados de um processo sintético."""
+    process_id = f"PROC-{number:06d}"
+    return {
+        "identification": {
+            "process_name": f"Processo {number}",
+            "process_id": process_id,
+            "department": "IT",
+            "owner": "John Doe",
+            "status": "draft"
+        },
+        "process_details": {
+            "description": "Conciliação diária de pagamentos",
+            "objective": "Reduzir trabalho manual",
+            "frequency": "daily"
+        },
+        "business_rules": {"rules": [f"Regra {i}" for i in range(5)], "exceptions": ["Valor nulo"]},
+        "automation_goals": {"goals": ["Reduzir erros"], "kpis": ["Tempo médio"]},
+        "systems": {"systems": ["SAP", "Excel"]},
+        "data": {"data_types": ["texto", "número"], "volume": "1000/dia"},
+        "steps": {"steps": [f"Passo {i}" for i in range(10)]},
+        "risks": {"risks": [{"description": "Sistema fora do ar", "impact": "alto"}]},
+        "documentation": {"documents": ["manual.pdf"]}
+    }
+
+def _disk_usage(path: Path) -> Dict[str, int]:
+    """Quantidade de arquivos e bytes ocupados sob a pasta."""
+    files = 0
+    size = 0
+    for directory, _, filenames in os.walk(path):
+        for filename in filenames:
+            files += 1
+            size += os.path.getsize(os.path.join(directory, filename))
+    return {"files": files, "bytes": size}
+
+def benchmark_backend(
+    kind: str,
+    processes: int,
+    root: Path,
+    reads: int = 10000,
+    codec: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Mede gravação e leitura de um backend.
+    
+    Args:
+        kind: Nome do backend
+        processes: Quantidade de processos gravados
+        root: Pasta de trabalho
+        reads: Processos lidos aleatoriamente após a gravação
+        codec: Codec de gravação (padrão: JSON compacto)
+        
+    Returns:
+        Dict com tempos, throughput e uso de disco
+    """
+    storage_path = root / f"{kind}-{codec or 'json'}"
+    persistence = MigrationPersistence(str(storage_path), backend=kind, codec=codec)
+    process_ids = [f"PROC-{number:06d}" for number in range(processes)]
+    
+    started = time.perf_counter()
+    for number, process_id in enumerate(process_ids):
+        persistence.save_forms(process_id, sample_forms(number))
+    write_s = time.perf_counter() - started
+    
+    sample = random.Random(42).sample(process_ids, min(reads, processes))
+    started = time.perf_counter()
+    for process_id in sample:
+        persistence.backend.read_many(process_id)
+    read_s = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    for process_id in sample:
+        persistence.load_identification_form(process_id)
+    point_read_s = time.perf_counter() - started
+    
+    persistence.close()
+    return {
+        "backend": kind,
+        "codec": persistence.backend.codec.name,
+        "processes": processes,
+        "write_s": round(write_s, 3),
+        "writes_per_s": round(processes / write_s, 1),
+        "full_reads_per_s": round(len(sample) / read_s, 1),
+        "point_reads_per_s": round(len(sample) / point_read_s, 1),
+        **_disk_usage(storage_path)
+    }
+
+def drop_page_cache() -> bool:
+    """Descarta o page cache do sistema (Linux, requer root)."""
+    try:
+        subprocess.run(["sync"], check=True)
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+def benchmark_bulk_load(
+    kind: str,
+    processes: int,
+    root: Path,
+    codec: Optional[str] = None,
+    max_read_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compara load_form sequencial com load_processes, com page cache frio e quente.
+    
+    Args:
+        kind: Nome do backend
+        processes: Quantidade de processos gravados e lidos
+        root: Pasta de trabalho
+        codec: Codec de gravação
+        max_read_workers: Threads de leitura de load_processes
+        
+    Returns:
+        Dict com processos lidos por segundo em cada cenário
+    """
+    storage_path = root / f"bulk-{kind}-{codec or 'json'}"
+    writer = MigrationPersistence(str(storage_path), backend=kind, codec=codec)
+    process_ids = [f"PROC-{number:06d}" for number in range(processes)]
+    for number, process_id in enumerate(process_ids):
+        writer.save_forms(process_id, sample_forms(number))
+    writer.close()
+    
+    def measure(load) -> float:
+        # Persistência nova a cada medição: o cache de formulários começa vazio
+        persistence = MigrationPersistence(
+            str(storage_path), backend=kind, codec=codec, max_read_workers=max_read_workers
+        )
+        started = time.perf_counter()
+        load(persistence)
+        elapsed = time.perf_counter() - started
+        persistence.close()
+        return round(processes / elapsed, 1)
+    
+    def sequential(persistence: MigrationPersistence) -> None:
+        for process_id in process_ids:
+            for form_name in FORM_FILES:
+                persistence.load_form(process_id, form_name)
+    
+    def bulk(persistence: MigrationPersistence) -> None:
+        persistence.load_processes(process_ids)
+        
+    result = {"backend": kind, "codec": codec or "json", "processes": processes}
+    for label, load in (("sequential", sequential), ("load_processes", bulk)):
+        cold = drop_page_cache()
+        result[f"{label}_{'cold' if cold else 'first'}_per_s"] = measure(load)
+        result[f"{label}_warm_per_s"] = measure(load)
+    return result
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Compara os backends do MigrationPersistence.")
+    parser.add_argument("--processes", type=int, default=100000, help="Processos gravados por backend")
+    parser.add_argument("--reads", type=int, default=10000, help="Processos lidos por backend")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--codecs", nargs="+", default=["json"], help="Codecs, ex.: json msgpack json+zstd")
+    parser.add_argument("--bulk-load", action="store_true", help="Mede load_processes em vez de gravação/leitura")
+    parser.add_argument("--read-workers", type=int, default=None, help="Threads de leitura de load_processes")
+    parser.add_argument("--workdir", default=None, help="Pasta de trabalho (padrão: temporária)")
+    args = parser.parse_args(argv)
+    
+    # O log por formulário distorceria a medição
+    logging.getLogger("src.migrations.persistence").setLevel(logging.WARNING)
+    root = Path(args.workdir or tempfile.mkdtemp(prefix="storage_benchmark_"))
+    try:
+        if args.bulk_load:
+            results = [
+                benchmark_bulk_load(kind, args.processes, root, codec, args.read_workers)
+                for kind in args.backends
+                for codec in args.codecs
+            ]
+        else:
+            results = [
+                benchmark_backend(kind, args.processes, root, args.reads, codec)
+                for kind in args.backends
+                for codec in args.codecs
+            ]
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
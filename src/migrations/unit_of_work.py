@@ -0,0 +1,111 @@
+"""Unidade de trabalho: gravação atômica dos formulários de um processo."""
+from typing import Dict, Any, Optional
+import logging
+
+from src.migrations.form_cache import copy_document
+from src.migrations.form_registry import add_storage_methods
+from src.migrations.persistence import MigrationPersistence, FORM_FILES, RAW_FORMS
+
+@add_storage_methods
+class UnitOfWork:
+    """
+    Acumula as gravações dos formulários de um processo e as aplica juntas.
+    
+    Os formulários ficam em memória até commit(), que os grava com uma
+    única chamada a MigrationPersistence.save_forms (troca atômica da pasta
+    no backend "directory", transação nos demais). rollback() apenas
+    descarta o que foi acumulado: nada chegou ao armazenamento.
+    
+    Expõe os mesmos métodos save_form, load_form e delete_form (e as
+    variantes save_*_form, load_*_form e delete_*_form) da persistência,
+    então pode substituí-la no MigrationService. Leituras
+    enxergam os formulários acumulados; delete_*_form apenas os descarta.
+    """
+    
+    def __init__(self, persistence: MigrationPersistence, process_id: str):
+        """
+        Inicializa a unidade de trabalho.
+        
+        Args:
+            persistence: Persistência onde os formulários serão gravados
+            process_id: ID do processo
+        """
+        self.persistence = persistence
+        self.process_id = process_id
+        self.staged: Dict[str, Dict[str, Any]] = {}
+        self.committed = False
+        self.logger = logging.getLogger(__name__)
+    
+    def _check(self, form_name: str, process_id: Optional[str] = None) -> None:
+        if form_name not in FORM_FILES:
+            raise ValueError(f"Invalid form name: {form_name}")
+        if process_id is not None and process_id != self.process_id:
+            raise ValueError(f"Unit of work is bound to process {self.process_id}, got {process_id}")
+        if self.committed:
+            raise RuntimeError("Unit of work already committed")
+    
+    def save(self, form_name: str, data: Dict[str, Any], process_id: Optional[str] = None) -> Dict[str, Any]:
+        """Acumula um formulário para gravação."""
+        self._check(form_name, process_id)
+        self.staged[form_name] = copy_document(data)
+        return {"success": True}
+    
+    def load(self, form_name: str, process_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Carrega um formulário, priorizando o acumulado (no formato gravado)."""
+        if form_name not in FORM_FILES:
+            raise ValueError(f"Invalid form name: {form_name}")
+        if form_name in self.staged:
+            data = copy_document(self.staged[form_name])
+            return data if form_name in RAW_FORMS else self.persistence._envelope(data)
+        return self.persistence.load_form(process_id or self.process_id, form_name)
+    
+    def discard(self, form_name: str, process_id: Optional[str] = None) -> Dict[str, Any]:
+        """Descarta um formulário acumulado; o já gravado não é alterado."""
+        self._check(form_name, process_id)
+        self.staged.pop(form_name, None)
+        return {"success": True, "message": f"{form_name} discarded"}
+    
+    def save_form(self, process_id: str, form_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Mesma assinatura de MigrationPersistence.save_form."""
+        return self.save(form_name, data, process_id)
+    
+    def load_form(self, process_id: str, form_name: str) -> Optional[Dict[str, Any]]:
+        """Mesma assinatura de MigrationPersistence.load_form."""
+        return self.load(form_name, process_id)
+    
+    def delete_form(self, process_id: str, form_name: str) -> Dict[str, Any]:
+        """Mesma assinatura de MigrationPersistence.delete_form."""
+        return self.discard(form_name, process_id)
+    
+    def commit(self) -> Dict[str, Any]:
+        """
+        Grava todos os formulários acumulados de uma vez.
+        
+        Returns:
+            Dict com resultado da operação e formulários gravados
+        """
+        if self.committed:
+            raise RuntimeError("Unit of work already committed")
+        forms = list(self.staged)
+        if self.staged:
+            self.persistence.save_forms(self.process_id, self.staged)
+        self.committed = True
+        self.staged = {}
+        return {"success": True, "forms": forms}
+    
+    def rollback(self) -> Dict[str, Any]:
+        """Descarta todos os formulários acumulados."""
+        forms = list(self.staged)
+        self.staged = {}
+        if forms:
+            self.logger.info(f"Discarded {len(forms)} staged forms for {self.process_id}")
+        return {"success": True, "forms": forms}
+    
+    def __enter__(self) -> "UnitOfWork":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.rollback()
+        elif not self.committed:
+            self.commit()
@@ -0,0 +1,17 @@
+"""Reconstrução do índice de processos migrados pela linha de comando.
+
+Uso:
+    python src/rebuild_index.py --storage data/migrations
+"""
+import sys
+from pathlib import Path
+
+# Adiciona a raiz e o src ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+sys.path.append(str(root_dir / "src"))
+
+from src.migrations.process_index import main
+
+if __name__ == "__main__":
+    sys.exit(main())
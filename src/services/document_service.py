@@ -1,44 +1,215 @@
 """Serviço para geração de documentos."""
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator
+from datetime import datetime
 import os
+import io
 import json
+import base64
 from utils.logger import Logger
+from utils.atomic_write import atomic_write
+from templates.base_template import precompile_templates
+from templates.pdd_template import PDDTemplate
+
+try:
+    from xhtml2pdf import pisa
+except ImportError:  # Dependência opcional, usada apenas na saída em PDF
+    pisa = None
+
+try:
+    from services.mermaid_service import MermaidService
+except ImportError:  # Sem requests não há conversão de diagramas
+    MermaidService = None
+
+NOT_INFORMED = "Não informado"
 
 class DocumentService:
     """Serviço para geração e manipulação de documentos."""
     
-    def __init__(self):
-        """Inicializa o serviço."""
+    SUPPORTED_FORMATS = ("json", "html", "pdf")
+    
+    def __init__(self, fsync: bool = True):
+        """
+        Inicializa o serviço.
+        
+        Args:
+            fsync: Se False, os arquivos são trocados atomicamente mas o fsync
+                fica a cargo do chamador (ex.: FsyncBatch na exportação em lote)
+        """
         self.logger = Logger()
+        self.fsync = fsync
         self.output_dir = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), 
             'output'
         )
         os.makedirs(self.output_dir, exist_ok=True)
+        precompile_templates()
+        self.mermaid_service = MermaidService() if MermaidService else None
+        self.template = PDDTemplate(diagram_resolver=self._embed_diagram)
+    
+    def build_pdd_data(self, process_id: str, forms: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Monta os dados do PDD a partir dos formulários migrados de um processo.
+        
+        Args:
+            process_id: ID do processo
+            forms: Formulários por nome, como retornados pela persistência
+            
+        Returns:
+            Dict: Dados no formato esperado pelo PDDTemplate
+        """
+        def form_data(name: str) -> Dict[str, Any]:
+            form = forms.get(name) or {}
+            # Alguns formulários são salvos com envelope {"data", "metadata"}
+            return form.get("data", form) if "metadata" in form else form
+        
+        def join(values, separator="\n") -> str:
+            return separator.join(str(value) for value in values if value) or NOT_INFORMED
+            
+        identification = form_data("identification")
+        details = form_data("process_details")
+        rules = form_data("business_rules")
+        goals = form_data("automation_goals")
+        documentation = form_data("documentation").get("process_documentation", {})
+        
+        business_rules = rules.get("business_rules") or rules.get("rules") or []
+        automation_goals = goals.get("automation_goals", [])
+        
+        return {
+            "process_id": process_id,
+            "process_name": identification.get("process_name") or process_id,
+            "process_owner": identification.get("owner") or NOT_INFORMED,
+            "process_description": details.get("description") or NOT_INFORMED,
+            "process_objective": details.get("objective"),
+            "process_type": details.get("process_type"),
+            "execution_frequency": details.get("frequency", {}).get("execution_frequency"),
+            "steps_as_is": join(
+                step.get("step_name") for step in form_data("steps").get("process_steps", [])
+            ),
+            "systems": join(
+                (system.get("name") for system in form_data("systems").get("systems", [])),
+                ", "
+            ),
+            "data_used": join(
+                (item.get("name") for item in form_data("data").get("data_inputs", [])),
+                ", "
+            ),
+            "business_rules": join(rule.get("description") for rule in business_rules),
+            "exceptions": join(
+                exception
+                for rule in business_rules
+                for exception in rule.get("exceptions", [])
+            ),
+            "automation_goals": join(goal.get("description") for goal in automation_goals),
+            "kpis": join(
+                "{}: {} → {}".format(
+                    goal.get("description", ""),
+                    goal.get("metrics", {}).get("current_value", ""),
+                    goal.get("metrics", {}).get("target_value", "")
+                )
+                for goal in automation_goals if goal.get("metrics")
+            ),
+            "risks": "\n".join(
+                f"{risk.get('description', '')} ({risk.get('severity_level', '')})"
+                for risk in form_data("risks").get("identified_risks", [])
+            ),
+            "documentation": "\n".join(
+                section.get("section_title", "")
+                for section in documentation.get("content_sections", [])
+            )
+        }
+    
+    def _embed_diagram(self, mermaid_code: str) -> Optional[str]:
+        """
+        Converte um diagrama Mermaid em data URI para embutir no PDD.
+        
+        Usa a imagem do cache do MermaidService quando existir; só gera
+        (via rede) diagramas ainda não convertidos.
+        """
+        if not self.mermaid_service:
+            return None
+            
+        image_path = (
+            self.mermaid_service.get_cached_image(mermaid_code)
+            or self.mermaid_service.mermaid_to_image(mermaid_code)
+        )
+        if not image_path:
+            return None
+            
+        with open(image_path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+        return f"data:image/svg+xml;base64,{encoded}"
+    
+    def _build_context(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta o contexto do template a partir dos dados do processo."""
+        context = dict(data)
+        context.setdefault("generated_at", datetime.now().strftime("%d/%m/%Y %H:%M"))
+        return context
+    
+    def render_html(self, data: Dict[str, Any]) -> str:
+        """
+        Renderiza o PDD em HTML com o template compilado.
+        
+        Args:
+            data: Dados do processo
+            
+        Returns:
+            str: Documento HTML
+        """
+        return self.template.render(self._build_context(data))
+    
+    def stream_html(self, data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Renderiza o PDD em HTML bloco a bloco, para respostas HTTP em streaming.
+        
+        Args:
+            data: Dados do processo
+            
+        Returns:
+            Iterator[str]: Blocos do documento HTML
+        """
+        return self.template.generate(self._build_context(data))
     
-    def generate_pdd(self, data: Dict[str, Any], output_path: Optional[str] = None) -> bool:
+    def render_pdf(self, data: Dict[str, Any]) -> bytes:
         """
-        Gera um PDD (Process Design Document) em formato JSON.
+        Renderiza o PDD em PDF a partir do HTML.
+        
+        Args:
+            data: Dados do processo
+            
+        Returns:
+            bytes: Conteúdo do PDF
+            
+        Raises:
+            RuntimeError: Se o xhtml2pdf não estiver instalado ou a conversão falhar
+        """
+        if pisa is None:
+            raise RuntimeError("Geração de PDF requer o pacote xhtml2pdf")
+            
+        buffer = io.BytesIO()
+        result = pisa.CreatePDF(self.render_html(data), dest=buffer, encoding="utf-8")
+        if result.err:
+            raise RuntimeError(f"Falha na conversão HTML para PDF ({result.err} erros)")
+        return buffer.getvalue()
+    
+    def generate_pdd(
+        self,
+        data: Dict[str, Any],
+        output_path: Optional[str] = None,
+        output_format: str = "json"
+    ) -> bool:
+        """
+        Gera um PDD (Process Design Document).
         
         Args:
             data: Dados do processo
             output_path: Caminho para salvar o arquivo
+            output_format: Formato de saída ("json", "html" ou "pdf")
             
         Returns:
             bool: True se gerado com sucesso, False caso contrário
         """
         try:
-            # Define caminho de saída
-            if not output_path:
-                output_path = os.path.join(
-                    self.output_dir,
-                    f"pdd_{data.get('process_id', 'unknown')}.json"
-                )
-            
-            # Salva como JSON
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
+            output_path = self.write_pdd(data, output_path, output_format)
             self.logger.info(f"PDD gerado com sucesso: {output_path}")
             return True
             
@@ -46,6 +217,50 @@ class DocumentService:
             self.logger.error(f"Erro ao gerar PDD: {str(e)}")
             return False
     
+    def write_pdd(
+        self,
+        data: Dict[str, Any],
+        output_path: Optional[str] = None,
+        output_format: str = "json"
+    ) -> str:
+        """
+        Gera um PDD propagando qualquer erro (usado na exportação em lote).
+        
+        Args:
+            data: Dados do processo
+            output_path: Caminho para salvar o arquivo
+            output_format: Formato de saída ("json", "html" ou "pdf")
+            
+        Returns:
+            str: Caminho do arquivo gerado
+            
+        Raises:
+            ValueError: Se o formato não for suportado
+            RuntimeError: Se a conversão para PDF falhar
+        """
+        if output_format not in self.SUPPORTED_FORMATS:
+            raise ValueError(f"Formato não suportado: {output_format}")
+            
+        # Define caminho de saída
+        if not output_path:
+            output_path = os.path.join(
+                self.output_dir,
+                f"pdd_{data.get('process_id', 'unknown')}.{output_format}"
+            )
+            
+        if output_format == "pdf":
+            with atomic_write(output_path, 'wb', fsync=self.fsync) as f:
+                f.write(self.render_pdf(data))
+        elif output_format == "html":
+            # Escreve em streaming: memória constante mesmo para PDDs enormes
+            with atomic_write(output_path, fsync=self.fsync) as f:
+                self.template.stream(self._build_context(data), f)
+        else:
+            # Salva como JSON
+            with atomic_write(output_path, fsync=self.fsync) as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        return output_path
+    
     def save_diagram(self, diagram_code: str, output_path: str) -> bool:
         """
         Salva um diagrama em arquivo.
@@ -58,10 +273,8 @@ class DocumentService:
             bool: True se salvo com sucesso, False caso contrário
         """
         try:
-            # Garante que o diretório existe
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
+            # Cria o diretório se necessário e troca o arquivo atomicamente
+            with atomic_write(output_path, fsync=self.fsync) as f:
                 f.write(diagram_code)
             
             self.logger.info(f"Diagrama salvo em: {output_path}")
@@ -69,4 +282,4 @@ class DocumentService:
             
         except Exception as e:
             self.logger.error(f"Erro ao salvar diagrama: {str(e)}")
-            return False 
\ No newline at end of file
+            return False 
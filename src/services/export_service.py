@@ -0,0 +1,206 @@
+"""Serviço para exportação em lote de PDDs."""
+from typing import Dict, Any, Optional, List, Iterable, Set
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import os
+import time
+
+from utils.logger import Logger
+from utils.atomic_write import FsyncBatch
+from migrations.persistence import MigrationPersistence
+from services.document_service import DocumentService
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# Estado de cada worker do pool, criado uma vez por processo
+_worker: Dict[str, Any] = {}
+
+def _init_worker(storage_path: str) -> None:
+    """Inicializa persistência e serviço de documentos no worker."""
+    _worker["persistence"] = MigrationPersistence(storage_path)
+    # O fsync dos documentos é feito em grupo pelo processo principal
+    _worker["documents"] = DocumentService(fsync=False)
+
+def _export_process(process_id: str, output_dir: str, output_format: str) -> Dict[str, Any]:
+    """Gera o PDD de um processo e retorna a entrada do manifesto."""
+    started = time.perf_counter()
+    output_path = os.path.join(output_dir, f"pdd_{process_id}.{output_format}")
+    entry = {
+        "process_id": process_id,
+        "output": output_path,
+        "status": "failed",
+        "error": None
+    }
+    try:
+        persistence = _worker["persistence"]
+        documents = _worker["documents"]
+        
+        forms = persistence.load_process(process_id)
+        load_time = time.perf_counter()
+        
+        data = documents.build_pdd_data(process_id, forms)
+        # write_pdd propaga o erro real, que vai para o manifesto
+        documents.write_pdd(data, output_path, output_format)
+        entry["status"] = "success"
+            
+        entry["load_ms"] = round((load_time - started) * 1000, 3)
+        entry["render_ms"] = round((time.perf_counter() - load_time) * 1000, 3)
+    except Exception as e:
+        entry["error"] = str(e)
+        
+    entry["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    entry["finished_at"] = datetime.now().isoformat()
+    return entry
+
+class PDDExportService:
+    """Exporta PDDs de vários processos em paralelo, com manifesto retomável."""
+    
+    def __init__(self, storage_path: str = "data/migrations", output_dir: str = "output/pdds"):
+        """
+        Inicializa o serviço de exportação.
+        
+        Args:
+            storage_path: Pasta com os dados migrados (MigrationPersistence)
+            output_dir: Pasta de saída dos PDDs e do manifesto
+        """
+        self.storage_path = storage_path
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.output_dir / MANIFEST_FILE
+        self.logger = Logger(__name__)
+    
+    def completed_process_ids(self) -> Set[str]:
+        """Retorna os processos já exportados com sucesso segundo o manifesto."""
+        completed = set()
+        if not self.manifest_path.exists():
+            return completed
+            
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha pode estar truncada após uma interrupção
+                    continue
+                if entry.get("status") == "success":
+                    completed.add(entry["process_id"])
+                else:
+                    completed.discard(entry["process_id"])
+        return completed
+    
+    def export(
+        self,
+        process_ids: Optional[Iterable[str]] = None,
+        output_format: str = "html",
+        max_workers: Optional[int] = None,
+        resume: bool = True,
+        fsync_batch_size: int = 64
+    ) -> Dict[str, Any]:
+        """
+        Exporta os PDDs dos processos informados.
+        
+        Args:
+            process_ids: IDs a exportar (padrão: todos os processos migrados)
+            output_format: Formato dos documentos ("json", "html" ou "pdf")
+            max_workers: Número de processos do pool (padrão: CPUs disponíveis)
+            resume: Se True, pula processos já exportados com sucesso
+            fsync_batch_size: Documentos persistidos por fsync em grupo
+            
+        Returns:
+            Dict com resumo da exportação
+        """
+        if output_format not in DocumentService.SUPPORTED_FORMATS:
+            raise ValueError(f"Formato não suportado: {output_format}")
+            
+        if process_ids is None:
+            with MigrationPersistence(self.storage_path) as persistence:
+                process_ids = persistence.list_process_ids()
+        process_ids = list(dict.fromkeys(process_ids))
+        
+        if not resume and self.manifest_path.exists():
+            self.manifest_path.unlink()
+            
+        completed = self.completed_process_ids() if resume else set()
+        pending = [pid for pid in process_ids if pid not in completed]
+        self.logger.info(
+            f"Exportando {len(pending)} PDDs ({len(process_ids) - len(pending)} já concluídos)"
+        )
+        
+        summary = {
+            "total": len(process_ids),
+            "skipped": len(process_ids) - len(pending),
+            "exported": 0,
+            "failed": 0,
+            "failures": [],
+            "manifest": str(self.manifest_path)
+        }
+        started = time.perf_counter()
+        
+        with open(self.manifest_path, "a", encoding="utf-8") as manifest, \
+                ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.storage_path,)
+                ) as pool:
+            futures = [
+                pool.submit(_export_process, pid, str(self.output_dir), output_format)
+                for pid in pending
+            ]
+            batch = FsyncBatch(fsync_batch_size)
+            pending_entries = []
+            
+            def write_entries() -> None:
+                # Só registra no manifesto documentos já persistidos em disco
+                for pending_entry in pending_entries:
+                    manifest.write(json.dumps(pending_entry, ensure_ascii=False) + "\n")
+                manifest.flush()
+                pending_entries.clear()
+                
+            for future in as_completed(futures):
+                entry = future.result()
+                pending_entries.append(entry)
+                
+                if entry["status"] == "success":
+                    summary["exported"] += 1
+                    if batch.add(entry["output"]):
+                        write_entries()
+                else:
+                    summary["failed"] += 1
+                    summary["failures"].append(entry["process_id"])
+                    self.logger.error(f"Falha ao exportar {entry['process_id']}: {entry['error']}")
+                    
+            batch.flush()
+            write_entries()
+                    
+        summary["elapsed_s"] = round(time.perf_counter() - started, 3)
+        self.logger.info(
+            f"Exportação concluída: {summary['exported']} gerados, "
+            f"{summary['failed']} falhas em {summary['elapsed_s']}s"
+        )
+        return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Exporta PDDs de processos migrados em lote.")
+    parser.add_argument("process_ids", nargs="*", help="IDs dos processos (padrão: todos)")
+    parser.add_argument("--storage", default="data/migrations", help="Pasta dos dados migrados")
+    parser.add_argument("--output", default="output/pdds", help="Pasta de saída")
+    parser.add_argument("--format", default="html", choices=DocumentService.SUPPORTED_FORMATS)
+    parser.add_argument("--workers", type=int, default=None, help="Número de workers")
+    parser.add_argument("--no-resume", action="store_true", help="Ignora o manifesto existente")
+    parser.add_argument("--fsync-batch", type=int, default=64, help="Documentos por fsync em grupo")
+    args = parser.parse_args(argv)
+    
+    service = PDDExportService(args.storage, args.output)
+    summary = service.export(
+        process_ids=args.process_ids or None,
+        output_format=args.format,
+        max_workers=args.workers,
+        resume=not args.no_resume,
+        fsync_batch_size=args.fsync_batch
+    )
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if summary["failed"] else 0
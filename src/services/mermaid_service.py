@@ -4,7 +4,10 @@ import requests
 import base64
 import urllib.parse
 from pathlib import Path
-from src.utils.logger import logger
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 class MermaidService:
     """Serviço para manipulação de diagramas Mermaid."""
@@ -18,12 +21,12 @@ class MermaidService:
         """Converte código Mermaid em imagem usando mermaid.ink."""
         try:
             # Verifica cache primeiro
-            cache_key = self._get_cache_key(mermaid_code)
-            cache_file = self.cache_dir / f"{cache_key}.{output_format}"
+            cached = self.get_cached_image(mermaid_code, output_format)
+            if cached:
+                logger.debug(f"Usando imagem em cache: {cached}")
+                return cached
             
-            if cache_file.exists():
-                logger.debug(f"Usando imagem em cache: {cache_file}")
-                return str(cache_file)
+            cache_file = self.cache_dir / f"{self._get_cache_key(mermaid_code)}.{output_format}"
             
             # Sanitiza e prepara o código
             sanitized_code = self._sanitize_mermaid_code(mermaid_code)
@@ -65,6 +68,11 @@ class MermaidService:
             logger.error(f"Erro ao converter diagrama Mermaid: {str(e)}")
             return None
     
+    def get_cached_image(self, mermaid_code: str, output_format: str = "svg") -> Optional[str]:
+        """Retorna a imagem do diagrama já presente no cache, sem acessar a rede."""
+        cache_file = self.cache_dir / f"{self._get_cache_key(mermaid_code)}.{output_format}"
+        return str(cache_file) if cache_file.exists() else None
+    
     def _get_cache_key(self, mermaid_code: str) -> str:
         """Gera uma chave única para o diagrama."""
         import hashlib
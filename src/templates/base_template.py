@@ -1,24 +1,102 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Iterator, TextIO
+from pathlib import Path
+import threading
 import jinja2
 import os
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'files')
+BYTECODE_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "templates"
+
+_environment: Optional[jinja2.Environment] = None
+_environment_lock = threading.Lock()
+# Se os templates do ambiente atual já foram compilados
+_precompiled = False
+
+def _create_environment() -> jinja2.Environment:
+    """Cria e configura o ambiente Jinja2 compartilhado."""
+    BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        autoescape=jinja2.select_autoescape(['html', 'xml']),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        # Templates são parte do pacote: sem stat() do arquivo a cada uso
+        auto_reload=False,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR))
+    )
+
+def get_environment() -> jinja2.Environment:
+    """Retorna o ambiente Jinja2 único do processo."""
+    global _environment
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                _environment = _create_environment()
+    return _environment
+
+def precompile_templates() -> None:
+    """Compila antecipadamente todos os templates HTML, uma vez por ambiente."""
+    global _precompiled
+    if _precompiled:
+        return
+    env = get_environment()
+    with _environment_lock:
+        if _precompiled:
+            return
+        for name in env.list_templates(extensions=['html']):
+            env.get_template(name)
+        _precompiled = True
+
+def reset_environment() -> None:
+    """Descarta o ambiente compartilhado (ex.: após alterar templates em disco)."""
+    global _environment, _precompiled
+    with _environment_lock:
+        _environment = None
+        _precompiled = False
+
 class BaseTemplate(ABC):
     """Classe base para templates."""
     
     def __init__(self, template_name: str):
         self.template_name = template_name
-        self.env = self._create_environment()
+        self.env = get_environment()
+        self._template: Optional[jinja2.Template] = None
+    
+    @property
+    def template(self) -> jinja2.Template:
+        """Template compilado, carregado uma única vez por instância."""
+        if self._template is None:
+            self._template = self.env.get_template(self.template_name)
+        return self._template
+    
+    def _context(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Contexto passado ao template; subclasses podem enriquecê-lo."""
+        return data
+    
+    def generate(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Renderiza o template em blocos, sem montar o documento inteiro em memória."""
+        if not self.validate_data(data):
+            raise ValueError(f"Dados incompletos para o template {self.template_name}")
+        return self.template.generate(**self._context(data))
     
-    def _create_environment(self) -> jinja2.Environment:
-        """Cria e configura o ambiente Jinja2."""
-        template_path = os.path.join(os.path.dirname(__file__), 'files')
-        return jinja2.Environment(
-            loader=jinja2.FileSystemLoader(template_path),
-            autoescape=jinja2.select_autoescape(['html', 'xml']),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+    def stream(self, data: Dict[str, Any], output: TextIO, buffer_size: int = 64) -> None:
+        """
+        Escreve o template renderizado diretamente em um arquivo ou resposta.
+        
+        Args:
+            data: Dados do template
+            output: Destino com método write (arquivo, resposta HTTP)
+            buffer_size: Quantidade de blocos agrupados por escrita
+        """
+        buffer = []
+        for chunk in self.generate(data):
+            buffer.append(chunk)
+            if len(buffer) >= buffer_size:
+                output.write("".join(buffer))
+                buffer.clear()
+        if buffer:
+            output.write("".join(buffer))
     
     @abstractmethod
     def render(self, data: Dict[str, Any]) -> str:
@@ -28,4 +106,4 @@ class BaseTemplate(ABC):
     @abstractmethod
     def validate_data(self, data: Dict[str, Any]) -> bool:
         """Valida os dados necessários para o template."""
-        pass 
\ No newline at end of file
+        pass 
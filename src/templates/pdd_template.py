@@ -1,11 +1,39 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple
+import hashlib
+import json
+from markupsafe import Markup
+from utils.cache import InMemoryCache
 from .base_template import BaseTemplate
 
 class PDDTemplate(BaseTemplate):
     """Template para geração de PDD."""
     
-    def __init__(self):
+    # Seções do documento, na ordem de exibição, e os campos que cada uma usa
+    SECTIONS: Dict[str, Tuple[str, ...]] = {
+        "identification": ("process_owner", "process_description"),
+        "details": ("process_objective", "process_type", "execution_frequency"),
+        "rules": ("business_rules", "exceptions"),
+        "systems": ("systems",),
+        "data": ("data_used",),
+        "steps": ("steps_as_is", "diagram"),
+        "goals": ("automation_goals", "kpis"),
+        "risks": ("risks",),
+        "documentation": ("documentation",)
+    }
+    
+    # Seções renderizadas, compartilhadas entre instâncias e chaveadas pelo hash da entrada
+    section_cache = InMemoryCache(max_size=10000, default_ttl=24 * 3600)
+    
+    def __init__(self, diagram_resolver: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Inicializa o template.
+        
+        Args:
+            diagram_resolver: Converte código Mermaid na URL/data URI da imagem
+        """
         super().__init__('pdd.html')
+        self.diagram_resolver = diagram_resolver
+        self.rendered_sections: List[str] = []
         
     def validate_data(self, data: Dict[str, Any]) -> bool:
         """Valida os dados necessários para o PDD."""
@@ -23,10 +51,53 @@ class PDDTemplate(BaseTemplate):
         ]
         return all(field in data and data[field] for field in required_fields)
     
+    def section_slices(self, data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Separa os dados por seção, omitindo seções sem conteúdo."""
+        slices = []
+        for name, fields in self.SECTIONS.items():
+            section_data = {field: data.get(field) for field in fields if data.get(field)}
+            if section_data:
+                section_data["number"] = len(slices) + 1
+                slices.append((name, section_data))
+        return slices
+    
+    @staticmethod
+    def section_key(name: str, section_data: Dict[str, Any]) -> str:
+        """Chave de cache da seção: hash do conteúdo da sua fatia de dados."""
+        payload = json.dumps(section_data, sort_keys=True, ensure_ascii=False, default=str)
+        return f"pdd:{name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+    
+    def render_section(self, name: str, section_data: Dict[str, Any]) -> Markup:
+        """Renderiza uma seção, reaproveitando o cache quando a entrada não mudou."""
+        key = self.section_key(name, section_data)
+        html = self.section_cache.get(key)
+        if html is None:
+            context = dict(section_data)
+            if context.get("diagram") and self.diagram_resolver:
+                context["diagram_image"] = self.diagram_resolver(context["diagram"])
+            html = self.env.get_template(f"sections/{name}.html").render(**context)
+            self.section_cache.set(key, html)
+            self.rendered_sections.append(name)
+        return Markup(html)
+    
+    def iter_sections(self, data: Dict[str, Any]) -> Iterator[Markup]:
+        """Gera as seções sob demanda, uma de cada vez."""
+        self.rendered_sections = []
+        for name, section_data in self.section_slices(data):
+            yield self.render_section(name, section_data)
+    
+    def _context(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona as seções renderizadas ao contexto do layout."""
+        return dict(data, sections=self.iter_sections(data))
+    
+    @classmethod
+    def clear_section_cache(cls) -> None:
+        """Descarta todas as seções em cache."""
+        cls.section_cache.clear()
+    
     def render(self, data: Dict[str, Any]) -> str:
         """Renderiza o PDD com os dados fornecidos."""
         if not self.validate_data(data):
             raise ValueError("Dados incompletos para geração do PDD")
         
-        template = self.env.get_template(self.template_name)
-        return template.render(**data) 
\ No newline at end of file
+        return self.template.render(**self._context(data))
@@ -0,0 +1,110 @@
+"""Escrita atômica de arquivos (arquivo temporário + fsync + rename)."""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, IO, List, Union
+import os
+import stat
+import tempfile
+
+PathLike = Union[str, Path]
+
+def fsync_dir(directory: PathLike) -> None:
+    """Persiste a entrada de diretório (necessário após rename em POSIX)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows não permite abrir diretórios para fsync
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_write(
+    path: PathLike,
+    mode: str = "w",
+    encoding: str = "utf-8",
+    fsync: bool = True
+) -> Iterator[IO]:
+    """
+    Abre um arquivo para escrita atômica.
+    
+    O conteúdo vai para um temporário na mesma pasta e só substitui o
+    destino quando o bloco termina sem erro: leitores veem o arquivo
+    antigo ou o novo completo, nunca um arquivo truncado.
+    
+    Args:
+        path: Caminho final do arquivo
+        mode: "w" (texto) ou "wb" (binário)
+        encoding: Codificação para modo texto
+        fsync: Se True, garante o conteúdo e o rename em disco antes de
+            retornar; use False com FsyncBatch para agrupar os fsyncs
+            
+    Yields:
+        Arquivo aberto para escrita
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"Unsupported mode for atomic write: {mode}")
+        
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    # mkstemp cria com 0600; mantém a permissão do arquivo substituído
+    os.chmod(tmp_path, stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644)
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if fsync:
+            fsync_dir(path.parent)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def fsync_paths(paths: Iterable[PathLike]) -> None:
+    """Força em disco os arquivos informados e, uma vez cada, suas pastas."""
+    directories = set()
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        directories.add(str(Path(path).parent))
+    for directory in directories:
+        fsync_dir(directory)
+
+class FsyncBatch:
+    """Agrupa fsyncs de arquivos escritos com atomic_write(fsync=False)."""
+    
+    def __init__(self, batch_size: int = 64):
+        """
+        Inicializa o lote.
+        
+        Args:
+            batch_size: Quantidade de arquivos que dispara um fsync em grupo
+        """
+        self.batch_size = batch_size
+        self.pending: List[PathLike] = []
+    
+    def add(self, path: PathLike) -> bool:
+        """
+        Registra um arquivo escrito.
+        
+        Returns:
+            bool: True se o lote foi persistido nesta chamada
+        """
+        self.pending.append(path)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+            return True
+        return False
+    
+    def flush(self) -> None:
+        """Persiste todos os arquivos pendentes."""
+        if self.pending:
+            fsync_paths(self.pending)
+            self.pending = []
@@ -1,44 +1,168 @@
 """Módulo para logging específico da migração."""
+import atexit
 import logging
+import multiprocessing
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+LOGGER_NAME = "migration"
+LOG_FILE = "migration.log"
+# Processos filhos (ex.: workers de um pool) gravam em um arquivo próprio:
+# o RotatingFileHandler não coordena a rotação entre processos
+CHILD_LOG_FILE = "migration.{pid}.log"
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class _ForkSafeQueueHandler(QueueHandler):
+    """QueueHandler que recria a fila e o listener em processos filhos (fork)."""
+    
+    def __init__(self, log_queue: queue.SimpleQueue):
+        super().__init__(log_queue)
+        self.pid = os.getpid()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A fila é da mesma memória: mensagens já prontas (sem args nem
+        # exceção) vão sem a cópia e formatação feitas pelo QueueHandler
+        if not record.args and not record.exc_info:
+            return record
+        return super().prepare(record)
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.pid != os.getpid():
+            _restart_after_fork(self)
+        self.queue.put_nowait(record)
+
+# Estado compartilhado por todas as instâncias do processo
+_lock = threading.Lock()
+_queue_handler: Optional[_ForkSafeQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_file_handlers: Dict[Path, RotatingFileHandler] = {}
+_running = False
+
+def _start_listener(handlers) -> None:
+    global _listener, _running
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _running = True
+
+def _stop_listener() -> None:
+    global _running
+    if _running:
+        _listener.stop()
+        _running = False
+
+def _reinit_lock() -> None:
+    # O lock pode estar preso por outra thread no momento do fork
+    global _lock
+    _lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_lock)
+
+def _log_file() -> str:
+    if multiprocessing.parent_process() is None:
+        return LOG_FILE
+    return CHILD_LOG_FILE.format(pid=os.getpid())
+
+def _file_handler(path: Path, max_bytes: int, backup_count: int) -> RotatingFileHandler:
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(FORMAT))
+    return file_handler
+
+def _restart_after_fork(handler: _ForkSafeQueueHandler) -> None:
+    """
+    A thread do listener não sobrevive ao fork: o filho usa fila e listener
+    novos, e troca os arquivos herdados do pai por arquivos próprios.
+    """
+    with _lock:
+        if handler.pid == os.getpid():
+            return
+        handlers = [
+            h for h in (_listener.handlers if _listener is not None else ())
+            if h not in _file_handlers.values()
+        ]
+        for key, inherited in list(_file_handlers.items()):
+            # Cópia do descritor do pai; o buffer já foi esvaziado a cada registro
+            inherited.close()
+            _file_handlers[key] = _file_handler(key / _log_file(), inherited.maxBytes, inherited.backupCount)
+        handler.queue = queue.SimpleQueue()
+        handler.pid = os.getpid()
+        _start_listener(handlers + list(_file_handlers.values()))
+
+def _setup(log_dir: Path, max_bytes: int, backup_count: int) -> None:
+    """Configura o logger compartilhado: um QueueHandler e um arquivo por pasta."""
+    global _queue_handler
+    with _lock:
+        if _queue_handler is None:
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter(FORMAT))
+            
+            _queue_handler = _ForkSafeQueueHandler(queue.SimpleQueue())
+            logger = logging.getLogger(LOGGER_NAME)
+            logger.setLevel(logging.DEBUG)
+            logger.addHandler(_queue_handler)
+            _start_listener([console_handler])
+            atexit.register(shutdown)
+        elif not _running:
+            _start_listener(_listener.handlers)
+            
+        key = log_dir.resolve()
+        if key not in _file_handlers:
+            file_handler = _file_handler(key / _log_file(), max_bytes, backup_count)
+            _file_handlers[key] = file_handler
+            # O listener lê a tupla a cada registro; a troca é atômica
+            _listener.handlers = _listener.handlers + (file_handler,)
+
+def flush() -> None:
+    """Espera a gravação de todas as mensagens já registradas."""
+    with _lock:
+        if _running:
+            _listener.stop()
+            _listener.start()
+
+def shutdown() -> None:
+    """Grava as mensagens pendentes e fecha os arquivos de log."""
+    with _lock:
+        _stop_listener()
+        for handler in _file_handlers.values():
+            handler.close()
 
 class MigrationLogger:
-    """Logger específico para o processo de migração."""
+    """
+    Logger específico para o processo de migração.
+    
+    Todas as instâncias usam o mesmo logger "migration", com um único
+    QueueHandler: as chamadas só enfileiram o registro, e uma thread
+    (QueueListener) grava no console e nos arquivos. Cada pasta de log
+    recebe um único arquivo (migration.log), rotacionado por tamanho,
+    não importa quantas instâncias sejam criadas. Processos filhos, como
+    os workers da migração em lote, gravam em migration.<pid>.log.
+    """
     
-    def __init__(self, log_dir: str = "logs/migration"):
+    def __init__(
+        self,
+        log_dir: str = "logs/migration",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5
+    ):
         """
         Inicializa o logger.
         
         Args:
             log_dir: Diretório para armazenar logs
+            max_bytes: Tamanho máximo do arquivo antes da rotação (usado
+                na primeira instância de cada pasta)
+            backup_count: Quantidade de arquivos rotacionados mantidos
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Configura logger
-        self.logger = logging.getLogger("migration")
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Handler para arquivo
-        log_file = self.log_dir / f"migration_{datetime.now():%Y%m%d_%H%M%S}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Handler para console
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Formato
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        _setup(self.log_dir, max_bytes, backup_count)
+        self.logger = logging.getLogger(LOGGER_NAME)
     
     def info(self, message: str) -> None:
         """Registra mensagem de info."""
@@ -54,4 +178,4 @@ class MigrationLogger:
     
     def debug(self, message: str) -> None:
         """Registra mensagem de debug."""
-        self.logger.debug(message) 
\ No newline at end of file
+        self.logger.debug(message) 
@@ -0,0 +1,85 @@
+"""Testes para o catálogo de backups."""
+from datetime import datetime, timedelta
+import pytest
+from src.migrations.backup_catalog import BackupCatalog, RetentionPolicy
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Fixture com um catálogo vazio."""
+    catalog = BackupCatalog(tmp_path / "catalog.db")
+    yield catalog
+    catalog.close()
+
+def add_backups(catalog, form_name, timestamps, digest=None):
+    """Registra um backup por timestamp, em ordem."""
+    for number, created in enumerate(timestamps):
+        catalog.add(form_name, {
+            "backup": f"backup_{number:04d}.json",
+            "created_at": created.isoformat(),
+            "hash": digest or f"hash{number}",
+            "size": 10
+        })
+
+def test_latest(catalog):
+    """Testa consulta dos backups mais recentes."""
+    start = datetime(2024, 1, 1)
+    add_backups(catalog, "form1", [start + timedelta(minutes=i) for i in range(5)])
+    
+    latest = catalog.latest("form1", 2)
+    
+    assert [entry["backup"] for entry in latest] == ["backup_0004.json", "backup_0003.json"]
+    assert catalog.get("form1", "backup_0001.json")["hash"] == "hash1"
+    assert catalog.get("form1", "missing.json") is None
+    assert catalog.count("form1") == 5
+
+def test_keep_last(catalog):
+    """Testa retenção dos N mais recentes."""
+    start = datetime(2024, 1, 1)
+    add_backups(catalog, "form1", [start + timedelta(minutes=i) for i in range(5)])
+    
+    removed, orphans = catalog.apply_retention("form1", RetentionPolicy(keep_last=2))
+    
+    assert removed == ["backup_0000.json", "backup_0001.json", "backup_0002.json"]
+    assert orphans == ["hash0", "hash1", "hash2"]
+    assert catalog.names("form1") == ["backup_0003.json", "backup_0004.json"]
+
+def test_keep_daily_and_weekly(catalog):
+    """Testa retenção do último backup de cada dia e de cada semana."""
+    # Três backups por dia durante 21 dias (segunda, 1/1/2024, em diante)
+    start = datetime(2024, 1, 1)
+    timestamps = [start + timedelta(days=day, hours=hour) for day in range(21) for hour in (8, 12, 18)]
+    add_backups(catalog, "form1", timestamps)
+    
+    catalog.apply_retention("form1", RetentionPolicy(keep_last=1, keep_daily=3, keep_weekly=3))
+    
+    kept = {catalog.get("form1", name)["created_at"] for name in catalog.names("form1")}
+    assert kept == {
+        "2024-01-21T18:00:00",  # último, último do dia e da semana
+        "2024-01-20T18:00:00",
+        "2024-01-19T18:00:00",
+        "2024-01-14T18:00:00",  # último da semana anterior
+        "2024-01-07T18:00:00"
+    }
+
+def test_shared_blob_is_orphaned_once(catalog):
+    """Testa que um blob só fica órfão quando nenhum backup o referencia."""
+    start = datetime(2024, 1, 1)
+    add_backups(catalog, "form1", [start, start + timedelta(minutes=1)], digest="same")
+    
+    _, orphans = catalog.apply_retention("form1", RetentionPolicy(keep_last=1))
+    assert orphans == []
+    
+    _, orphans = catalog.apply_retention("form1", RetentionPolicy(keep_last=0))
+    assert orphans == ["same"]
+
+def test_rebuild_replays_deletions(catalog):
+    """Testa reconstrução a partir de manifestos com remoções."""
+    entries = [
+        {"backup": "b1.json", "created_at": "2024-01-01T00:00:00", "hash": "h1"},
+        {"backup": "b2.json", "created_at": "2024-01-02T00:00:00", "hash": "h2"},
+        {"deleted": "b1.json"}
+    ]
+    
+    assert catalog.rebuild([("form1", entries)]) == 1
+    assert catalog.names("form1") == ["b2.json"]
+    assert catalog.forms() == ["form1"]
@@ -1,9 +1,12 @@
 """Testes para o serviço de backup."""
 import pytest
+import gzip
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 from src.migrations.backup_service import BackupService
+from src.migrations.metrics import MigrationMetrics
 
 @pytest.fixture
 def backup_dir(tmp_path):
@@ -29,12 +32,22 @@ def test_create_backup(backup_service, sample_data):
     backup_file = backup_service.create_backup("test_form", sample_data)
     
     assert backup_file is not None
-    assert backup_file.exists()
+    assert backup_file.name in backup_service.list_backups("test_form")["test_form"]
     
-    # Verifica conteúdo
-    with open(backup_file) as f:
-        restored_data = json.load(f)
-    assert restored_data == sample_data
+    # Conteúdo fica em um blob comprimido, endereçado pelo hash
+    blobs = list(backup_service.objects_dir.glob("*/*.json.gz"))
+    assert len(blobs) == 1
+    assert json.loads(gzip.decompress(blobs[0].read_bytes())) == sample_data
+
+def test_backups_are_deduplicated(backup_service, sample_data):
+    """Testa que backups do mesmo conteúdo compartilham o blob."""
+    first = backup_service.create_backup("test_form", sample_data)
+    second = backup_service.create_backup("test_form", sample_data)
+    backup_service.create_backup("test_form", dict(sample_data, name="Outro"))
+    
+    assert first != second
+    assert len(list(backup_service.objects_dir.glob("*/*.json.gz"))) == 2
+    assert backup_service.restore_backup(second) == sample_data
 
 def test_restore_backup(backup_service, sample_data):
     """Testa restauração de backup."""
@@ -73,6 +86,48 @@ def test_cleanup_old_backups(backup_service, sample_data):
     backups = backup_service.list_backups("test_form")
     assert len(backups["test_form"]) == 5
 
+def test_cleanup_removes_unreferenced_blobs(backup_service, sample_data):
+    """Testa que a limpeza apaga blobs sem backups restantes."""
+    old = backup_service.create_backup("test_form", {"version": 1})
+    backup_service.create_backup("test_form", sample_data)
+    
+    backup_service.cleanup_old_backups(max_backups=1)
+    
+    assert len(list(backup_service.objects_dir.glob("*/*.json.gz"))) == 1
+    assert backup_service.restore_backup(old) is None
+
+def test_restore_legacy_backup(backup_service, backup_dir, sample_data):
+    """Testa restauração de um backup JSON do formato anterior."""
+    legacy = Path(backup_dir) / "test_form" / "backup_20240101_000000_1_1.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps(sample_data))
+    
+    assert backup_service.restore_backup(legacy) == sample_data
+
+def test_legacy_backups_imported(backup_dir, sample_data):
+    """Testa que backups do formato anterior são listados, restaurados e limpos."""
+    form_dir = Path(backup_dir) / "identification"
+    form_dir.mkdir(parents=True)
+    names = ["backup_20240101_120000_1_1.json", "backup_20240102_120000_1_1.json"]
+    for day, name in enumerate(names, start=1):
+        legacy = form_dir / name
+        legacy.write_text(json.dumps(dict(sample_data, day=day)))
+        os.utime(legacy, (day * 86400, day * 86400))
+        
+    service = BackupService(backup_dir)
+    
+    assert service.list_backups() == {"identification": names}
+    assert not list(form_dir.glob("backup_*.json"))
+    assert service.restore_backup(form_dir / names[1]) == dict(sample_data, day=2)
+    assert BackupService(backup_dir).list_backups() == {"identification": names}
+    
+    service.cleanup_old_backups(1)
+    
+    assert service.list_backups() == {"identification": [names[1]]}
+    service.cleanup_old_backups(0)
+    assert service.list_backups() == {}
+    assert not list(service.objects_dir.glob("*/*.json.gz"))
+
 def test_failed_backup(backup_service, monkeypatch):
     """Testa falha na criação de backup."""
     def mock_open(*args, **kwargs):
@@ -86,4 +141,35 @@ def test_failed_backup(backup_service, monkeypatch):
 def test_failed_restore(backup_service):
     """Testa falha na restauração de backup."""
     result = backup_service.restore_backup(Path("nonexistent.json"))
-    assert result is None 
\ No newline at end of file
+    assert result is None 
+def test_latest_backups(backup_service, sample_data):
+    """Testa consulta dos backups mais recentes pelo catálogo."""
+    first = backup_service.create_backup("test_form", sample_data)
+    second = backup_service.create_backup("test_form", sample_data)
+    
+    assert backup_service.latest_backups("test_form", 5) == [second, first]
+
+def test_catalog_rebuilt_from_manifests(backup_dir, sample_data):
+    """Testa que o catálogo é reconstruído dos manifestos se for apagado."""
+    service = BackupService(backup_dir)
+    for _ in range(3):
+        service.create_backup("test_form", sample_data)
+    service.cleanup_old_backups(max_backups=2)
+    expected = service.list_backups()
+    service.catalog.close()
+    (Path(backup_dir) / "catalog.db").unlink()
+    
+    rebuilt = BackupService(backup_dir)
+    
+    assert rebuilt.list_backups() == expected
+    assert rebuilt.restore_backup(rebuilt.latest_backups("test_form")[0]) == sample_data
+
+def test_backup_metrics(backup_dir, sample_data):
+    """Testa registro da latência dos backups."""
+    metrics = MigrationMetrics()
+    service = BackupService(backup_dir, metrics=metrics)
+    
+    service.create_backups([("form1", sample_data, None), ("form2", sample_data, None)])
+    
+    assert metrics.form_snapshot("form1")["latency"]["backup"]["count"] == 1
+    assert metrics.form_snapshot("form2")["latency"]["backup"]["count"] == 1
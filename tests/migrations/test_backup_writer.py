@@ -0,0 +1,59 @@
+"""Testes para a gravação assíncrona de backups."""
+import threading
+import pytest
+from src.migrations.backup_service import BackupService
+from src.migrations.backup_writer import AsyncBackupWriter
+
+@pytest.fixture
+def backup_service(tmp_path):
+    """Fixture com um serviço de backup em pasta temporária."""
+    return BackupService(str(tmp_path / "backups"))
+
+def test_barrier_flushes_queue(backup_service, monkeypatch):
+    """Testa que a barreira grava em lote e força os arquivos em disco."""
+    batches, synced = [], []
+    create_backups = backup_service.create_backups
+    monkeypatch.setattr(backup_service, "create_backups", lambda items: batches.append(len(items)) or create_backups(items))
+    monkeypatch.setattr(backup_service, "sync", lambda: synced.append(True))
+    
+    with AsyncBackupWriter(backup_service, batch_size=4) as writer:
+        for number in range(10):
+            writer.submit("identification", f"PROC-{number:03d}", {"number": number})
+        assert writer.barrier() == []
+        
+        assert backup_service.catalog.count("identification") == 10
+        assert synced and all(size <= 4 for size in batches)
+        
+    latest = backup_service.latest_backups("identification")[0]
+    assert backup_service.restore_backup(latest) == {"number": 9}
+
+def test_barrier_reports_failures(backup_service):
+    """Testa que backups com falha são informados na barreira seguinte."""
+    with AsyncBackupWriter(backup_service) as writer:
+        writer.submit("identification", "PROC-001", {"ok": True})
+        writer.submit("identification", "PROC-002", {"bad": object()})
+        
+        assert writer.barrier() == [("PROC-002", "identification")]
+        assert writer.barrier() == []
+        
+    assert backup_service.catalog.count("identification") == 1
+
+def test_bounded_queue_blocks_producer(backup_service, monkeypatch):
+    """Testa que a fila limitada segura o produtor enquanto o disco não acompanha."""
+    release = threading.Event()
+    create_backups = backup_service.create_backups
+    monkeypatch.setattr(backup_service, "create_backups", lambda items: release.wait() and create_backups(items))
+    writer = AsyncBackupWriter(backup_service, queue_size=2, batch_size=1)
+    
+    producer = threading.Thread(target=lambda: [writer.submit("form", str(n), {"n": n}) for n in range(5)])
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()
+    
+    release.set()
+    producer.join()
+    writer.close()
+    assert backup_service.catalog.count("form") == 5
+    
+    with pytest.raises(RuntimeError):
+        writer.submit("form", "x", {})
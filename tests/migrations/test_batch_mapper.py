@@ -0,0 +1,37 @@
+"""Testes para o mapeamento em lote."""
+import gc
+import json
+import pytest
+from src.migrations.data_mapper import DataMapper
+from src.migrations.batch_mapper import BATCH_MAPPERS, map_batch
+from src.migrations.form_registry import FORMS
+from src.migrations.mapper_benchmark import sample_legacy_forms
+
+@pytest.mark.parametrize("form_name", list(BATCH_MAPPERS))
+def test_batch_matches_data_mapper(form_name, capsys):
+    """Testa que o lote produz exatamente o resultado do DataMapper."""
+    method = getattr(DataMapper, FORMS[form_name].mapper)
+    records = [sample_legacy_forms(number)[form_name] for number in range(3)] + [{}]
+    
+    expected = [method(record) for record in records]
+    mapped = map_batch(form_name, records)
+    
+    # Compara também a ordem das chaves
+    assert json.dumps(mapped) == json.dumps(expected)
+
+def test_batch_restores_gc_state():
+    """Testa que o coletor de ciclos volta ao estado anterior ao lote."""
+    assert gc.isenabled()
+    map_batch("identification", [{"id": "PROC-001"}])
+    assert gc.isenabled()
+
+def test_map_batch_invalid_form():
+    """Testa erro para formulário desconhecido."""
+    with pytest.raises(ValueError):
+        map_batch("invalid", [])
+
+def test_batch_mappers_cover_forms():
+    """Testa que há uma variante em lote, nomeada, para cada formulário do registro."""
+    assert list(BATCH_MAPPERS) == list(FORMS)
+    assert BATCH_MAPPERS["data"].__name__ == "map_data_batch"
+    assert BATCH_MAPPERS["identification"].__doc__ == "Mapeia uma lista de IdentificationForms."
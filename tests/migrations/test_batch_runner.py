@@ -0,0 +1,197 @@
+"""Testes para a migração em lote."""
+import json
+import pytest
+from pathlib import Path
+from src.migrations.backup_service import BackupService
+from src.migrations.batch_runner import MigrationBatchRunner, MigrationProgress
+from src.migrations.checkpoint import CheckpointJournal, content_hash
+from src.migrations.persistence import MigrationPersistence
+
+def legacy_record(number: int, department: str = "IT"):
+    """Registro legado de exemplo."""
+    process_id = f"PROC-{number:03d}"
+    return {
+        "id": process_id,
+        "identification": {
+            "name": f"Processo {number}",
+            "id": process_id,
+            "department": department,
+            "owner": "John Doe",
+            "status": "draft"
+        },
+        "process_details": {
+            "description": "Processo de teste",
+            "objective": "Testar migração em lote",
+            "frequency": "daily"
+        }
+    }
+
+@pytest.fixture
+def storage_path(tmp_path):
+    """Fixture com a pasta de destino."""
+    return str(tmp_path / "migrations")
+
+def test_run_migrates_stream(storage_path):
+    """Testa migração de um fluxo de registros."""
+    runner = MigrationBatchRunner(storage_path, max_workers=2, chunk_size=2)
+    records = (legacy_record(i) for i in range(1, 6))
+    
+    summary = runner.run(records, total=5)
+    
+    assert summary["processed"] == 5
+    assert summary["succeeded"] == 5
+    assert summary["failed"] == 0
+    assert summary["throughput_per_s"] > 0
+    # Métricas dos dois workers somadas no runner
+    assert summary["metrics"]["identification"]["counters"]["success"] == 5
+    assert summary["metrics"]["process_details"]["latency"]["persist"]["count"] == 5
+    
+    persistence = MigrationPersistence(storage_path)
+    assert len(persistence.list_process_ids()) == 5
+    assert persistence.load_process_details_form("PROC-003")["data"]["objective"]
+
+def test_run_reports_failures(storage_path):
+    """Testa relatório de falhas por formulário."""
+    runner = MigrationBatchRunner(storage_path, max_workers=1)
+    invalid = legacy_record(2, department="")
+    
+    summary = runner.run([legacy_record(1), invalid])
+    
+    assert summary["failed"] == 1
+    assert summary["failures"][0]["process_id"] == "PROC-002"
+    assert "identification" in summary["failures"][0]["forms"]
+
+def test_run_calls_progress(storage_path):
+    """Testa callback de progresso."""
+    runner = MigrationBatchRunner(storage_path, max_workers=1, chunk_size=1)
+    seen = []
+    
+    runner.run([legacy_record(1), legacy_record(2)], on_progress=lambda p: seen.append(p.processed))
+    
+    assert seen == [1, 2]
+
+def test_progress_eta():
+    """Testa cálculo de ETA."""
+    progress = MigrationProgress(total=10, processed=5, started_at=0)
+    
+    assert progress.eta_seconds is not None
+    assert MigrationProgress(processed=5).eta_seconds is None
+
+def test_run_resumes_from_journal(storage_path, tmp_path):
+    """Testa retomada: pula concluídos e refaz só falhas e conteúdo alterado."""
+    journal_path = str(tmp_path / "journal.jsonl")
+    runner = MigrationBatchRunner(storage_path, max_workers=1, journal_path=journal_path)
+    records = [legacy_record(1), legacy_record(2, department=""), legacy_record(3)]
+    
+    first = runner.run(records)
+    assert first["processed"] == 3
+    assert first["failed"] == 1
+    
+    records[1] = legacy_record(2)
+    records[2]["process_details"]["objective"] = "Objetivo alterado"
+    second = runner.run(records)
+    
+    assert second["skipped"] == 1
+    assert second["processed"] == 2
+    assert second["failed"] == 0
+    persistence = MigrationPersistence(storage_path)
+    assert persistence.load_process_details_form("PROC-003")["data"]["objective"] == "Objetivo alterado"
+    
+    third = runner.run(records)
+    assert third["skipped"] == 3
+    assert third["processed"] == 0
+
+def test_journal_ignores_truncated_line(tmp_path):
+    """Testa leitura do diário com a última linha truncada."""
+    journal_path = tmp_path / "journal.jsonl"
+    with CheckpointJournal(journal_path) as journal:
+        journal.record("PROC-001", "identification", "success", content_hash({"a": 1}))
+    with open(journal_path, "a") as f:
+        f.write('{"process_id": "PROC-002", "fo')
+        
+    journal = CheckpointJournal(journal_path)
+    
+    assert journal.is_completed("PROC-001", "identification", content_hash({"a": 1}))
+    assert not journal.is_completed("PROC-001", "identification", content_hash({"a": 2}))
+    assert journal.stats() == {"completed": 1, "failed": 0}
+    
+    journal.record("PROC-002", "identification", "failed", None)
+    journal.close()
+    assert CheckpointJournal(journal_path).stats() == {"completed": 1, "failed": 1}
+
+def test_run_backs_up_legacy_data(storage_path, tmp_path):
+    """Testa backup dos dados legados antes da migração."""
+    backup_dir = str(tmp_path / "backups")
+    runner = MigrationBatchRunner(storage_path, max_workers=1, chunk_size=2, backup_dir=backup_dir)
+    
+    summary = runner.run([legacy_record(i) for i in range(1, 4)])
+    
+    assert summary["succeeded"] == 3
+    assert summary["backup_failed"] == 0
+    identification = summary["metrics"]["identification"]
+    assert identification["counters"]["success"] == 3
+    assert identification["latency"]["backup"]["count"] == 3
+    backups = BackupService(backup_dir)
+    assert backups.catalog.count("identification") == 3
+    assert backups.catalog.count("process_details") == 3
+    latest = backups.latest_backups("identification")[0]
+    assert backups.restore_backup(latest) == legacy_record(3)["identification"]
+
+def test_dry_run_reports_differences(storage_path, tmp_path):
+    """Testa simulação: relatório de diferenças sem gravar nada."""
+    runner = MigrationBatchRunner(storage_path, max_workers=1, chunk_size=2)
+    runner.run([legacy_record(1), legacy_record(2)])
+    persistence = MigrationPersistence(storage_path)
+    before = persistence.load_process("PROC-002")
+    
+    changed = legacy_record(2)
+    changed["process_details"]["objective"] = "Novo objetivo"
+    report_path = tmp_path / "diff.jsonl"
+    summary = runner.dry_run(
+        [legacy_record(1), changed, legacy_record(3), legacy_record(4, department="")],
+        str(report_path)
+    )
+    
+    assert summary["processed"] == 4
+    assert (summary["unchanged"], summary["changed"], summary["new"], summary["invalid"]) == (1, 1, 1, 1)
+    entries = {entry["process_id"]: entry for entry in map(json.loads, report_path.read_text().splitlines())}
+    assert set(entries) == {"PROC-002", "PROC-003", "PROC-004"}
+    assert entries["PROC-002"]["forms"] == {"process_details": {"status": "changed", "changes": [
+        {"path": "objective", "op": "changed", "old": "Testar migração em lote", "new": "Novo objetivo"}
+    ]}}
+    assert entries["PROC-003"]["status"] == "new"
+    assert entries["PROC-004"]["forms"]["identification"]["status"] == "invalid"
+    
+    # Nada foi gravado
+    assert sorted(persistence.list_process_ids()) == ["PROC-001", "PROC-002"]
+    assert persistence.load_process("PROC-002") == before
+
+def _tree(root):
+    """Conteúdo de todos os arquivos e pastas sob root."""
+    return {
+        str(path.relative_to(root)): path.read_bytes() if path.is_file() else None
+        for path in sorted(root.rglob("*"))
+    }
+
+def test_dry_run_leaves_storage_untouched(storage_path, tmp_path):
+    """Testa que a simulação não cria, recupera nem altera nada no armazenamento."""
+    MigrationBatchRunner(storage_path, max_workers=1).run([legacy_record(1)])
+    root = Path(storage_path)
+    # Sobra de uma troca interrompida de um processo que não existe mais
+    leftover = root / ".PROC-001.staging-999999999-abc"
+    leftover.mkdir()
+    (leftover / "identification.json").write_text("{}")
+    (root / "index.db").unlink()
+    before = _tree(root)
+    
+    runner = MigrationBatchRunner(storage_path, max_workers=1)
+    summary = runner.dry_run([legacy_record(1), legacy_record(2)], str(tmp_path / "diff.jsonl"))
+    
+    assert (summary["unchanged"], summary["new"]) == (1, 1)
+    assert _tree(root) == before
+    
+    missing = tmp_path / "missing"
+    summary = MigrationBatchRunner(str(missing), max_workers=1).dry_run([legacy_record(1)], str(tmp_path / "new.jsonl"))
+    assert summary["new"] == 1
+    assert not missing.exists()
+
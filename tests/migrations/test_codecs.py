@@ -0,0 +1,56 @@
+"""Testes para os codecs de armazenamento."""
+import json
+import pytest
+from src.migrations.codecs import StorageCodec, MAGIC, get_codec
+from src.migrations.persistence import MigrationPersistence
+
+@pytest.fixture
+def document():
+    """Documento de exemplo."""
+    return {
+        "data": {"process_name": "Conciliação", "steps": ["Passo 1", "Passo 2"]},
+        "metadata": {"version": "1.0", "status": "migrated"}
+    }
+
+def test_json_is_compact_and_headerless(document):
+    """Testa que o JSON padrão é texto compacto sem cabeçalho."""
+    encoded = get_codec("json").encode(document)
+    
+    assert not encoded.startswith(MAGIC)
+    assert b" " not in encoded.replace(b"Passo ", b"")
+    assert json.loads(encoded) == document
+
+@pytest.mark.parametrize("spec", ["json+gzip", "msgpack", "msgpack+zstd", "json+zstd"])
+def test_roundtrip(spec, document):
+    """Testa ida e volta de cada codec, lendo com um codec diferente."""
+    if "msgpack" in spec:
+        pytest.importorskip("msgpack")
+    if "zstd" in spec:
+        pytest.importorskip("zstandard")
+    encoded = get_codec(spec).encode(document)
+    
+    assert encoded.startswith(MAGIC)
+    assert StorageCodec().decode(encoded) == document
+
+def test_decode_legacy_pretty_json(document):
+    """Testa leitura do JSON indentado gravado antes dos codecs."""
+    legacy = json.dumps(document, indent=4).encode("utf-8")
+    
+    assert get_codec("json+gzip").decode(legacy) == document
+
+def test_invalid_codec():
+    """Testa codec desconhecido."""
+    with pytest.raises(ValueError):
+        get_codec("xml")
+    with pytest.raises(ValueError):
+        get_codec("json+lz4")
+
+def test_persistence_reads_any_codec(tmp_path, document):
+    """Testa que a persistência lê dados gravados com outro codec."""
+    MigrationPersistence(str(tmp_path), codec="json+gzip").save_identification_form(document["data"], "PROC-001")
+    raw = (tmp_path / "PROC-001" / "identification.json").read_bytes()
+    
+    loaded = MigrationPersistence(str(tmp_path)).load_identification_form("PROC-001")
+    
+    assert raw.startswith(MAGIC)
+    assert loaded["data"] == document["data"]
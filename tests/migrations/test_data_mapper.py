@@ -2,6 +2,12 @@
 import pytest
 from pytest_check import check
 from src.migrations.data_mapper import DataMapper
+from src.migrations.mapping_spec import CompiledDataMapper
+
+@pytest.fixture(params=[DataMapper, CompiledDataMapper], ids=["data_mapper", "compiled"])
+def mapper(request):
+    """Fixture com o DataMapper e o mapeador compilado da especificação."""
+    return request.param()
 
 @pytest.fixture
 def sample_identification_data():
@@ -17,9 +23,9 @@ def sample_identification_data():
         "status": "draft"
     }
 
-def test_map_identification_data(sample_identification_data):
+def test_map_identification_data(mapper, sample_identification_data):
     """Testa mapeamento de dados do IdentificationForm."""
-    result = DataMapper.map_identification_data(sample_identification_data)
+    result = mapper.map_identification_data(sample_identification_data)
     
     assert result["process_name"] == sample_identification_data["name"]
     assert result["process_id"] == sample_identification_data["id"]
@@ -30,11 +36,11 @@ def test_map_identification_data(sample_identification_data):
     assert result["last_update"] == sample_identification_data["updated_at"]
     assert result["status"] == sample_identification_data["status"]
 
-def test_map_identification_data_missing_fields():
+def test_map_identification_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {"name": "Test Process"}  # Dados incompletos
     
-    result = DataMapper.map_identification_data(old_data)
+    result = mapper.map_identification_data(old_data)
     
     assert result["process_name"] == "Test Process"
     assert result["process_id"] == ""
@@ -64,9 +70,9 @@ def sample_process_details_data():
         "additional_info": "Additional information"
     }
 
-def test_map_process_details_data(sample_process_details_data):
+def test_map_process_details_data(mapper, sample_process_details_data):
     """Testa mapeamento de dados do ProcessDetailsForm."""
-    result = DataMapper.map_process_details_data(sample_process_details_data)
+    result = mapper.map_process_details_data(sample_process_details_data)
     
     assert result["description"] == sample_process_details_data["description"]
     assert result["objective"] == sample_process_details_data["objective"]
@@ -82,11 +88,11 @@ def test_map_process_details_data(sample_process_details_data):
     assert result["dependencies"]["downstream"] == sample_process_details_data["dependencies_downstream"]
     assert result["additional_info"] == sample_process_details_data["additional_info"]
 
-def test_map_process_details_data_missing_fields():
+def test_map_process_details_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {"description": "Process description"}  # Dados incompletos
     
-    result = DataMapper.map_process_details_data(old_data)
+    result = mapper.map_process_details_data(old_data)
     
     assert result["description"] == "Process description"
     assert result["objective"] == ""
@@ -145,9 +151,9 @@ def sample_business_rules_data():
         ]
     }
 
-def test_map_business_rules_data(sample_business_rules_data):
+def test_map_business_rules_data(mapper, sample_business_rules_data):
     """Testa mapeamento de dados do BusinessRulesForm."""
-    result = DataMapper.map_business_rules_data(sample_business_rules_data)
+    result = mapper.map_business_rules_data(sample_business_rules_data)
     
     # Verifica regras de negócio
     assert len(result["business_rules"]) == 2
@@ -175,7 +181,7 @@ def test_map_business_rules_data(sample_business_rules_data):
     assert result["conditions"][0]["action"] == "require_approval"
     assert result["conditions"][0]["description"] == "Large amounts need approval"
 
-def test_map_business_rules_data_missing_fields():
+def test_map_business_rules_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "rules": [
@@ -186,7 +192,7 @@ def test_map_business_rules_data_missing_fields():
         ]
     }
     
-    result = DataMapper.map_business_rules_data(old_data)
+    result = mapper.map_business_rules_data(old_data)
     
     # Verifica regras com campos faltando
     assert len(result["business_rules"]) == 1
@@ -246,9 +252,9 @@ def sample_automation_goals_data():
         "priority": "high"
     }
 
-def test_map_automation_goals_data(sample_automation_goals_data):
+def test_map_automation_goals_data(mapper, sample_automation_goals_data):
     """Testa mapeamento de dados do AutomationGoalsForm."""
-    result = DataMapper.map_automation_goals_data(sample_automation_goals_data)
+    result = mapper.map_automation_goals_data(sample_automation_goals_data)
 
     # Verifica objetivos
     with check:
@@ -300,7 +306,7 @@ def test_map_automation_goals_data(sample_automation_goals_data):
     with check:
         assert "constraints" in result, "Restrições ausentes"
 
-def test_map_automation_goals_data_missing_fields():
+def test_map_automation_goals_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "goals": [
@@ -311,7 +317,7 @@ def test_map_automation_goals_data_missing_fields():
         ]
     }
 
-    result = DataMapper.map_automation_goals_data(old_data)
+    result = mapper.map_automation_goals_data(old_data)
 
     # Verifica objetivo com campos faltando
     with check:
@@ -418,9 +424,9 @@ def sample_systems_data():
         ]
     }
 
-def test_map_systems_data(sample_systems_data):
+def test_map_systems_data(mapper, sample_systems_data):
     """Testa mapeamento de dados do SystemsForm."""
-    result = DataMapper.map_systems_data(sample_systems_data)
+    result = mapper.map_systems_data(sample_systems_data)
     
     with check:
         assert len(result["systems"]) == 2, "Número incorreto de sistemas"
@@ -445,7 +451,7 @@ def test_map_systems_data(sample_systems_data):
     with check:
         assert result["technical_requirements"][0]["requirement_type"] == "performance", "Tipo de requisito incorreto"
 
-def test_map_systems_data_missing_fields():
+def test_map_systems_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "systems": [
@@ -456,7 +462,7 @@ def test_map_systems_data_missing_fields():
         ]
     }
     
-    result = DataMapper.map_systems_data(old_data)
+    result = mapper.map_systems_data(old_data)
     
     # Verifica sistema com campos faltando
     with check:
@@ -545,9 +551,9 @@ def sample_data_form_data():
         }
     }
 
-def test_map_data_form_data(sample_data_form_data):
+def test_map_data_form_data(mapper, sample_data_form_data):
     """Testa mapeamento de dados do DataForm."""
-    result = DataMapper.map_data_form_data(sample_data_form_data)
+    result = mapper.map_data_form_data(sample_data_form_data)
 
     # Verifica inputs
     with check:
@@ -593,7 +599,7 @@ def test_map_data_form_data(sample_data_form_data):
     with check:
         assert "error_handling" in result["data_quality"], "Tratamento de erros ausente"
 
-def test_map_data_form_data_missing_fields():
+def test_map_data_form_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "data_inputs": [
@@ -616,7 +622,7 @@ def test_map_data_form_data_missing_fields():
         ]
     }
 
-    result = DataMapper.map_data_form_data(old_data)
+    result = mapper.map_data_form_data(old_data)
 
     # Verifica input com campos faltando
     with check:
@@ -722,9 +728,9 @@ def sample_steps_data():
         }
     }
 
-def test_map_steps_data(sample_steps_data):
+def test_map_steps_data(mapper, sample_steps_data):
     """Testa mapeamento de dados do StepsForm."""
-    result = DataMapper.map_steps_data(sample_steps_data)
+    result = mapper.map_steps_data(sample_steps_data)
     
     # Verifica passos
     assert len(result["process_steps"]) == 2
@@ -762,7 +768,7 @@ def test_map_steps_data(sample_steps_data):
     assert result["process_metrics"]["automated_processing_time"] == "2 minutes"
     assert result["process_metrics"]["number_of_handoffs"] == 1
 
-def test_map_steps_data_missing_fields():
+def test_map_steps_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "steps": [
@@ -774,7 +780,7 @@ def test_map_steps_data_missing_fields():
         ]
     }
     
-    result = DataMapper.map_steps_data(old_data)
+    result = mapper.map_steps_data(old_data)
     
     # Verifica passo com campos faltando
     assert len(result["process_steps"]) == 1
@@ -894,9 +900,9 @@ def sample_risks_data():
         ]
     }
 
-def test_map_risks_data(sample_risks_data):
+def test_map_risks_data(mapper, sample_risks_data):
     """Testa mapeamento de dados do RisksForm."""
-    result = DataMapper.map_risks_data(sample_risks_data)
+    result = mapper.map_risks_data(sample_risks_data)
     
     # Verifica riscos
     assert len(result["identified_risks"]) == 2
@@ -934,7 +940,7 @@ def test_map_risks_data(sample_risks_data):
     assert len(plan["required_resources"]) == 2
     assert plan["recovery_target"] == "2 hours"
 
-def test_map_risks_data_missing_fields():
+def test_map_risks_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "risks": [
@@ -945,7 +951,7 @@ def test_map_risks_data_missing_fields():
         ]
     }
     
-    result = DataMapper.map_risks_data(old_data)
+    result = mapper.map_risks_data(old_data)
     
     # Verifica risco com campos faltando
     assert len(result["identified_risks"]) == 1
@@ -1069,9 +1075,9 @@ def sample_documentation_data():
         }
     }
 
-def test_map_documentation_data(sample_documentation_data):
+def test_map_documentation_data(mapper, sample_documentation_data):
     """Testa mapeamento de dados do DocumentationForm."""
-    result = DataMapper.map_documentation_data(sample_documentation_data)
+    result = mapper.map_documentation_data(sample_documentation_data)
     
     # Verifica documentação do processo
     doc = result["process_documentation"]
@@ -1117,7 +1123,7 @@ def test_map_documentation_data(sample_documentation_data):
     assert review["last_review_date"] == "2024-01-10"
     assert len(review["review_team"]) == 2
 
-def test_map_documentation_data_missing_fields():
+def test_map_documentation_data_missing_fields(mapper):
     """Testa mapeamento com campos faltando."""
     old_data = {
         "process_documentation": {
@@ -1131,7 +1137,7 @@ def test_map_documentation_data_missing_fields():
         }
     }
     
-    result = DataMapper.map_documentation_data(old_data)
+    result = mapper.map_documentation_data(old_data)
     
     # Verifica documentação com campos faltando
     doc = result["process_documentation"]
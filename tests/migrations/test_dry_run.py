@@ -0,0 +1,37 @@
+"""Testes para a simulação da migração."""
+from src.migrations.dry_run import DiffReport, diff_documents, diff_process
+
+def test_diff_documents():
+    """Testa diferenças em dicts e listas aninhados."""
+    old = {"name": "a", "tags": ["x", "y"], "meta": {"owner": "ana", "old": 1}}
+    new = {"name": "b", "tags": ["x"], "meta": {"owner": "ana", "new": 2}}
+    
+    assert diff_documents(old, new) == [
+        {"path": "name", "op": "changed", "old": "a", "new": "b"},
+        {"path": "tags[1]", "op": "removed", "old": "y"},
+        {"path": "meta.old", "op": "removed", "old": 1},
+        {"path": "meta.new", "op": "added", "new": 2}
+    ]
+    assert len(diff_documents(old, new, limit=2)) == 2
+    assert diff_documents(old, dict(old)) == []
+
+def test_diff_process_unwraps_envelope():
+    """Testa comparação com formulários gravados com e sem envelope."""
+    preview = {
+        "process_id": "PROC-001",
+        "forms": {"systems": {"success": True, "errors": []}, "steps": {"success": True, "errors": []}},
+        "staged": {"systems": {"systems": []}, "steps": {"steps": []}}
+    }
+    persisted = {"systems": {"data": {"systems": []}, "metadata": {}}, "steps": {"steps": []}}
+    
+    assert diff_process(preview, persisted) == {"process_id": "PROC-001", "status": "unchanged", "forms": {}}
+    assert diff_process(preview, {})["status"] == "new"
+
+def test_report_skips_unchanged(tmp_path):
+    """Testa que processos sem alterações só entram nos totais."""
+    with DiffReport(tmp_path / "report.jsonl") as report:
+        report.write({"process_id": "A", "status": "unchanged", "forms": {}})
+        report.write({"process_id": "B", "status": "new", "forms": {}})
+        
+    assert report.totals["unchanged"] == 1 and report.totals["new"] == 1
+    assert (tmp_path / "report.jsonl").read_text().count("\n") == 1
@@ -2,7 +2,7 @@
 import pytest
 from pathlib import Path
 import json
-from src.migrations.feature_flags import FeatureFlagManager, MigrationFlag
+from src.migrations.feature_flags import FeatureFlagManager, MigrationFlag, _FlagStore, _set_flag, rollout_bucket
 
 @pytest.fixture
 def temp_config(tmp_path):
@@ -68,4 +68,66 @@ def test_persistence(temp_config):
     
     # Segunda instância
     manager2 = FeatureFlagManager(temp_config)
-    assert manager2.is_enabled(MigrationFlag.USE_NEW_FORMS) 
\ No newline at end of file
+    assert manager2.is_enabled(MigrationFlag.USE_NEW_FORMS) 
+def test_instances_share_changes(temp_config):
+    """Testa que instâncias do mesmo arquivo veem as alterações umas das outras."""
+    manager1 = FeatureFlagManager(temp_config)
+    manager2 = FeatureFlagManager(temp_config)
+    
+    manager1.enable(MigrationFlag.STEPS_MIGRATED)
+    
+    assert manager2.is_enabled(MigrationFlag.STEPS_MIGRATED)
+
+def test_reloads_external_changes(temp_config):
+    """Testa recarga quando outro processo altera o arquivo."""
+    manager = FeatureFlagManager(temp_config, check_interval=0)
+    
+    with open(temp_config, "w") as f:
+        json.dump({MigrationFlag.RISKS_MIGRATED.value: True}, f)
+        
+    assert manager.is_enabled(MigrationFlag.RISKS_MIGRATED)
+
+def test_shared_store_uses_smallest_interval(temp_config):
+    """Testa que o gerenciador com o menor intervalo vê alterações externas sem esperar."""
+    slow = FeatureFlagManager(temp_config, check_interval=60)
+    assert not slow.is_enabled(MigrationFlag.RISKS_MIGRATED)
+    fast = FeatureFlagManager(temp_config, check_interval=0)
+    
+    with open(temp_config, "w") as f:
+        json.dump({MigrationFlag.RISKS_MIGRATED.value: True}, f)
+        
+    assert fast.is_enabled(MigrationFlag.RISKS_MIGRATED)
+    assert FeatureFlagManager(temp_config, check_interval=60)._store.check_interval == 0
+
+def test_concurrent_writers_keep_all_changes(temp_config):
+    """Testa que gravações de outro store não são sobrescritas."""
+    manager = FeatureFlagManager(temp_config, check_interval=60)
+    # Outro store no mesmo arquivo simula um segundo processo
+    other = _FlagStore(Path(temp_config), check_interval=60)
+    
+    other.update(_set_flag(MigrationFlag.DATA_MIGRATED, True))
+    manager.enable(MigrationFlag.SYSTEMS_MIGRATED)
+    
+    with open(temp_config) as f:
+        flags = json.load(f)
+    assert flags[MigrationFlag.DATA_MIGRATED.value]
+    assert flags[MigrationFlag.SYSTEMS_MIGRATED.value]
+
+def test_rollout(flag_manager):
+    """Testa liberação por porcentagem e por processo."""
+    flag = MigrationFlag.STEPS_MIGRATED
+    flag_manager.set_rollout(flag, percentage=30, processes=["PROC-EXTRA"])
+    process_ids = [f"PROC-{number:04d}" for number in range(1000)] + ["PROC-EXTRA"]
+    
+    enabled = [process_id for process_id in process_ids if flag_manager.is_enabled(flag, process_id)]
+    
+    assert 200 < len(enabled) - 1 < 400
+    assert "PROC-EXTRA" in enabled
+    assert not flag_manager.is_enabled(flag)
+    assert all(rollout_bucket(flag, process_id) < 30 for process_id in enabled if process_id != "PROC-EXTRA")
+    
+    flag_manager.enable(flag)
+    assert flag_manager.is_enabled(flag, "PROC-0001")
+    
+    with pytest.raises(ValueError):
+        flag_manager.set_rollout(flag, percentage=101)
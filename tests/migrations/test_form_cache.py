@@ -0,0 +1,82 @@
+"""Testes para o cache de leitura da persistência."""
+import json
+import pytest
+from src.migrations.form_cache import FormCache
+from src.migrations.persistence import MigrationPersistence
+
+@pytest.fixture
+def persistence(tmp_path):
+    """Fixture com persistência em pasta temporária."""
+    return MigrationPersistence(str(tmp_path))
+
+def test_second_load_hits_cache(persistence):
+    """Testa que a segunda leitura vem do cache."""
+    persistence.save_risks_form({"risks": ["Atraso"]}, "PROC-001")
+    
+    first = persistence.load_risks_form("PROC-001")
+    second = persistence.load_risks_form("PROC-001")
+    
+    assert first == second
+    stats = persistence.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_own_write_invalidates(persistence):
+    """Testa que gravações da persistência invalidam o cache."""
+    persistence.save_risks_form({"risks": ["Atraso"]}, "PROC-001")
+    persistence.load_risks_form("PROC-001")
+    
+    persistence.save_risks_form({"risks": ["Falha"]}, "PROC-001")
+    assert persistence.load_risks_form("PROC-001")["data"] == {"risks": ["Falha"]}
+    
+    persistence.delete_risks_form("PROC-001")
+    assert persistence.load_risks_form("PROC-001") is None
+
+def test_external_change_detected(persistence, tmp_path):
+    """Testa que alterações feitas fora da persistência são detectadas."""
+    persistence.save_data_form({"volume": "10"}, "PROC-001")
+    persistence.load_form("PROC-001", "data")
+    
+    (tmp_path / "PROC-001" / "data_form.json").write_text(json.dumps({"volume": "1000"}))
+    
+    assert persistence.load_form("PROC-001", "data") == {"volume": "1000"}
+    assert persistence.cache_stats()["stale"] == 1
+
+def test_sqlite_external_writer_detected(tmp_path):
+    """Testa invalidação por commits de outra conexão no SQLite."""
+    reader = MigrationPersistence(str(tmp_path), backend="sqlite")
+    writer = MigrationPersistence(str(tmp_path), backend="sqlite")
+    writer.save_steps_form({"steps": ["A"]}, "PROC-001")
+    
+    assert reader.load_form("PROC-001", "steps") == {"steps": ["A"]}
+    writer.save_steps_form({"steps": ["B"]}, "PROC-001")
+    
+    assert reader.load_form("PROC-001", "steps") == {"steps": ["B"]}
+
+def test_cached_document_is_not_shared(persistence):
+    """Testa que alterar o documento retornado não altera o cache."""
+    persistence.save_data_form({"volume": ["10"]}, "PROC-001")
+    persistence.load_form("PROC-001", "data")["volume"].append("20")
+    
+    assert persistence.load_form("PROC-001", "data") == {"volume": ["10"]}
+
+def test_lru_eviction():
+    """Testa descarte do item menos usado."""
+    cache = FormCache(max_size=2)
+    cache.put(("P1", "a"), 1, {"a": 1})
+    cache.put(("P1", "b"), 1, {"b": 1})
+    cache.get(("P1", "a"), 1)
+    cache.put(("P1", "c"), 1, {"c": 1})
+    
+    assert cache.get(("P1", "b"), 1) is None
+    assert cache.get(("P1", "a"), 1) == {"a": 1}
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_disabled(tmp_path):
+    """Testa persistência sem cache."""
+    persistence = MigrationPersistence(str(tmp_path), cache_size=0)
+    persistence.save_risks_form({"risks": []}, "PROC-001")
+    
+    assert persistence.load_risks_form("PROC-001")["data"] == {"risks": []}
+    assert persistence.cache_stats() == {"enabled": False}
@@ -0,0 +1,44 @@
+"""Testes para o registro de formulários."""
+import pytest
+from src.migrations.data_mapper import DataMapper
+from src.migrations.validators import DataValidator
+from src.migrations.form_registry import FORMS, get_form
+from src.migrations.migration_service import MigrationService
+from src.migrations.persistence import MigrationPersistence
+from src.migrations.unit_of_work import UnitOfWork
+
+@pytest.mark.parametrize("form_name", list(FORMS))
+def test_spec_methods_exist(form_name):
+    """Testa que cada formulário aponta para métodos existentes."""
+    spec = FORMS[form_name]
+    assert callable(getattr(DataMapper, spec.mapper))
+    assert callable(getattr(DataValidator, spec.validator))
+
+def test_validate_returns_error_list():
+    """Testa erros de validação no formato "campo: erro"."""
+    is_valid, errors = get_form("process_details").validate(DataValidator(), {})
+    assert is_valid is False
+    assert errors and all(isinstance(error, str) and ": " in error for error in errors)
+
+def test_check_input_rejects_legacy_data():
+    """Testa a recusa de dados legados inválidos antes do mapeamento."""
+    with pytest.raises(ValueError, match="Invalid input data"):
+        get_form("automation_goals").map(DataMapper(), {"automation_goals": [{"goal_id": ""}]})
+
+@pytest.mark.parametrize("cls", [MigrationPersistence, UnitOfWork])
+def test_storage_methods_defined(cls):
+    """Testa que save/load/delete_<form>_form existem na classe."""
+    for form_name in FORMS:
+        for action in ("save", "load", "delete"):
+            method = getattr(cls, f"{action}_{form_name}_form")
+            assert method.__qualname__ == f"{cls.__name__}.{action}_{form_name}_form"
+
+def test_migrate_methods_defined():
+    """Testa que migrate_<form>_form existe no MigrationService."""
+    for form_name, spec in FORMS.items():
+        assert spec.label in getattr(MigrationService, f"migrate_{form_name}_form").__doc__
+
+def test_get_form_invalid():
+    """Testa erro para formulário desconhecido."""
+    with pytest.raises(ValueError):
+        get_form("invalid")
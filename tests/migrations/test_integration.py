@@ -5,11 +5,13 @@ from datetime import datetime
 from src.migrations.migration_service import MigrationService
 from src.migrations.data_mapper import DataMapper
 from src.migrations.validators import DataValidator
+from src.migrations.persistence import MigrationPersistence
 
 @pytest.fixture
-def migration_service():
+def migration_service(tmp_path):
     """Fixture que retorna uma instância do MigrationService."""
-    return MigrationService(DataMapper(), DataValidator())
+    # Grava em pasta temporária, sem tocar nos dados de data/migrations
+    return MigrationService(DataMapper(), DataValidator(), MigrationPersistence(str(tmp_path / "migrations")))
 
 @pytest.fixture
 def sample_old_identification_data():
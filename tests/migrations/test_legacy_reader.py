@@ -0,0 +1,107 @@
+"""Testes para leitura em streaming de exportações legadas."""
+import gzip
+import json
+import pytest
+from src.migrations.legacy_reader import iter_jsonl, iter_json_array, iter_legacy_records
+from src.migrations.pipeline import StreamingMigrationPipeline
+from src.migrations.persistence import MigrationPersistence
+
+@pytest.fixture
+def records():
+    """Registros legados de exemplo."""
+    return [
+        {
+            "id": f"PROC-{i:03d}",
+            "identification": {
+                "name": f"Processo {i}",
+                "id": f"PROC-{i:03d}",
+                "department": "IT" if i != 3 else "",
+                "owner": "John Doe",
+                "status": "draft"
+            }
+        }
+        for i in range(1, 6)
+    ]
+
+def test_iter_jsonl(tmp_path, records):
+    """Testa leitura de JSONL, ignorando linhas em branco."""
+    path = tmp_path / "export.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n\n")
+
+    assert list(iter_jsonl(path)) == records
+
+def test_iter_jsonl_invalid_line(tmp_path):
+    """Testa erro em linha inválida com número da linha."""
+    path = tmp_path / "export.jsonl"
+    path.write_text('{"id": 1}\n{quebrado\n')
+
+    with pytest.raises(ValueError, match=":2"):
+        list(iter_jsonl(path))
+    assert list(iter_jsonl(path, skip_invalid=True)) == [{"id": 1}]
+
+def test_iter_json_array_small_reads(tmp_path, records):
+    """Testa array JSON lido em blocos menores que um registro."""
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(records, indent=2))
+
+    assert list(iter_json_array(path, read_size=16)) == records
+
+def test_iter_json_array_truncated(tmp_path, records):
+    """Testa arquivo truncado."""
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(records)[:-40])
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(path))
+
+def test_iter_legacy_records_detects_format(tmp_path, records):
+    """Testa detecção automática do formato, inclusive compactado."""
+    array_path = tmp_path / "export.json.gz"
+    with gzip.open(array_path, "wt", encoding="utf-8") as f:
+        json.dump(records, f)
+    jsonl_path = tmp_path / "export.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(r) for r in records))
+
+    assert list(iter_legacy_records(array_path)) == records
+    assert list(iter_legacy_records(jsonl_path)) == records
+
+def test_pipeline_migrate_file(tmp_path, records):
+    """Testa o pipeline completo a partir de um arquivo."""
+    path = tmp_path / "export.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in records))
+    persistence = MigrationPersistence(str(tmp_path / "migrations"))
+    pipeline = StreamingMigrationPipeline(persistence=persistence, queue_size=1)
+
+    result = pipeline.migrate_file(path)
+
+    assert result["records"] == 5
+    assert result["forms_persisted"] == 4
+    assert result["validate_failed"] == 1
+    assert result["failures"][0]["process_id"] == "PROC-003"
+    assert persistence.load_identification_form("PROC-005")["data"]["process_name"] == "Processo 5"
+
+def test_pipeline_skips_malformed_record(tmp_path, records):
+    """Testa que um registro que não é objeto vira falha sem travar o pipeline."""
+    path = tmp_path / "export.jsonl"
+    lines = [json.dumps(r) for r in records]
+    lines.insert(1, json.dumps(["x"]))
+    path.write_text("\n".join(lines))
+    persistence = MigrationPersistence(str(tmp_path / "migrations"))
+    pipeline = StreamingMigrationPipeline(persistence=persistence, queue_size=1)
+
+    result = pipeline.migrate_file(path)
+
+    assert result["records"] == 6
+    assert result["map_failed"] == 1
+    assert result["forms_persisted"] == 4
+
+def test_pipeline_fills_identification_id(tmp_path, records):
+    """Testa que o identification sem "id" usa o ID do registro, como no MigrationService."""
+    del records[0]["identification"]["id"]
+    persistence = MigrationPersistence(str(tmp_path / "migrations"))
+    pipeline = StreamingMigrationPipeline(persistence=persistence, queue_size=1)
+
+    result = pipeline.run(records[:1])
+
+    assert result["forms_persisted"] == 1
+    assert persistence.load_identification_form("PROC-001")["data"]["process_id"] == "PROC-001"
@@ -0,0 +1,62 @@
+"""Testes para a especificação declarativa de mapeamento."""
+import json
+import pytest
+from src.migrations.data_mapper import DataMapper
+from src.migrations.form_registry import FORMS
+from src.migrations.mapping_spec import (
+    CompiledDataMapper, compile_form, generate_source, load_spec
+)
+from src.migrations.mapper_benchmark import sample_legacy_forms
+
+def test_spec_covers_all_forms():
+    """Testa que a especificação padrão tem todos os formulários."""
+    assert set(load_spec()) == set(FORMS)
+
+@pytest.mark.parametrize("form_name", list(FORMS))
+def test_compiled_matches_data_mapper(form_name):
+    """Testa saída idêntica ao DataMapper, inclusive na ordem das chaves."""
+    compiled = CompiledDataMapper()
+    method_name = FORMS[form_name].mapper
+    for old_data in (sample_legacy_forms(7)[form_name], {}):
+        expected = getattr(DataMapper, method_name)(old_data)
+        assert json.dumps(getattr(compiled, method_name)(old_data)) == json.dumps(expected)
+
+def test_compiled_defaults_are_fresh():
+    """Testa que padrões mutáveis não são compartilhados entre registros."""
+    mapper = compile_form("sample", {"fields": {
+        "tags": {"from": "labels", "default": []},
+        "owner": {"from": ["meta", "owner"], "default": "unknown"},
+        "kind": {"from": "type", "default": "General", "coerce": "lower"},
+        "items": {"from": "rows", "limit": 1, "items": {"value": {"from": "v", "default": 0}}}
+    }})
+    first = mapper({})
+    second = mapper({"meta": {"owner": "Ana"}, "rows": [{"v": 1}, {"v": 2}]})
+    
+    first["tags"].append("x")
+    assert second == {"tags": [], "owner": "Ana", "kind": "general", "items": [{"value": 1}]}
+
+def test_same_as_shares_object():
+    """Testa que same_as reaproveita o mesmo objeto."""
+    result = CompiledDataMapper().map_business_rules_data({"rules": [{"id": "BR001"}]})
+    assert result["business_rules"] is result["rules"]
+
+def test_form_error_wraps_failures():
+    """Testa que o erro do formulário é convertido em ValueError."""
+    with pytest.raises(ValueError, match="Failed to map data form data"):
+        CompiledDataMapper().map_data_form_data({"data_inputs": [None]})
+
+def test_invalid_spec():
+    """Testa mensagens de erro para especificações inválidas."""
+    with pytest.raises(ValueError, match="unknown options"):
+        generate_source("sample", {"fields": {"name": {"from": "name", "rename": "x"}}})
+    with pytest.raises(ValueError, match="unknown coercion"):
+        generate_source("sample", {"fields": {"name": {"from": "name", "coerce": "float"}}})
+    with pytest.raises(ValueError, match="missing 'fields'"):
+        generate_source("sample", {})
+
+def test_custom_spec_path(tmp_path):
+    """Testa que uma especificação incompleta é rejeitada."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text("identification:\n  fields:\n    process_id: {from: id, default: ''}\n")
+    with pytest.raises(ValueError, match="missing forms"):
+        CompiledDataMapper(spec_path)
@@ -0,0 +1,54 @@
+"""Testes para as métricas da migração."""
+import pickle
+import pytest
+from src.migrations.metrics import Histogram, MigrationMetrics
+
+def test_histogram_buckets():
+    """Testa contagens acumuladas e quantis do histograma."""
+    histogram = Histogram((0.001, 0.01, 0.1))
+    for value in (0.0005, 0.001, 0.005, 0.05, 0.5):
+        histogram.observe(value)
+        
+    assert histogram.cumulative() == [("0.001", 2), ("0.01", 3), ("0.1", 4), ("+Inf", 5)]
+    assert histogram.quantile(0.5) == 0.01
+    assert Histogram().quantile(0.5) is None
+
+def test_metrics_snapshot():
+    """Testa métricas por formulário."""
+    metrics = MigrationMetrics()
+    with metrics.time("map", "steps"):
+        pass
+    metrics.observe("backup", "steps", 0.002)
+    metrics.increment("success", "steps")
+    metrics.increment("failure", "risks", 2)
+    
+    snapshot = metrics.snapshot()
+    
+    assert list(snapshot) == ["risks", "steps"]
+    assert snapshot["steps"]["counters"] == {"success": 1, "failure": 0, "rollback": 0}
+    assert snapshot["steps"]["latency"]["backup"]["count"] == 1
+    assert snapshot["steps"]["latency"]["map"]["buckets"]["+Inf"] == 1
+    assert snapshot["risks"]["counters"]["failure"] == 2
+    assert snapshot["risks"]["last_update"] is not None
+    
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+def test_metrics_merge_state():
+    """Testa a soma do estado de outra instância (ex.: de um worker)."""
+    worker = MigrationMetrics()
+    worker.observe("map", "steps", 0.002)
+    worker.increment("success", "steps")
+    total = MigrationMetrics()
+    total.observe("map", "steps", 0.02)
+    
+    total.merge(pickle.loads(pickle.dumps(worker.state(reset=True))))
+    
+    assert worker.snapshot() == {}
+    steps = total.form_snapshot("steps")
+    assert steps["counters"]["success"] == 1
+    assert steps["latency"]["map"]["count"] == 2
+    assert steps["latency"]["map"]["sum_s"] == 0.022
+    with pytest.raises(ValueError):
+        total.merge(MigrationMetrics((0.1,)).state())
+
@@ -1,17 +1,20 @@
 """Testes para o serviço de migração."""
+import json
 import pytest
 from datetime import datetime
 from src.migrations.migration_service import MigrationService
 from src.migrations.data_mapper import DataMapper
 from src.migrations.validators import DataValidator
 from src.migrations.backup_service import BackupService
+from src.migrations.persistence import MigrationPersistence
 
 @pytest.fixture
-def migration_service():
+def migration_service(tmp_path):
     """Fixture que cria uma instância do serviço de migração."""
     mapper = DataMapper()
     validator = DataValidator()
-    return MigrationService(mapper=mapper, validator=validator)
+    persistence = MigrationPersistence(str(tmp_path / "migrations"))
+    return MigrationService(mapper=mapper, validator=validator, persistence=persistence)
 
 def test_start_migration_success(migration_service):
     """Testa início bem sucedido da migração."""
@@ -103,7 +106,7 @@ def test_rollback_migration_failure(migration_service, monkeypatch):
     def mock_rollback_error(*args, **kwargs):
         raise Exception("Rollback failed")
     
-    monkeypatch.setattr(MigrationService, "_rollback_identification_form", mock_rollback_error)
+    monkeypatch.setattr(MigrationService, "_rollback_form", mock_rollback_error)
     
     old_data = {
         "name": "Test Process",
@@ -142,4 +145,43 @@ def test_invalid_form_name(migration_service):
     old_data = {"name": "Test"}
     
     with pytest.raises(ValueError, match="Invalid form name"):
-        migration_service.get_migration_status(form_name) 
\ No newline at end of file
+        migration_service.get_migration_status(form_name)
+
+
+def test_migration_status_metrics(migration_service):
+    """Testa contadores e latência por etapa no status da migração."""
+    valid = {"name": "Test Process", "id": "PROC-001", "department": "IT", "owner": "John Doe", "status": "draft"}
+    
+    assert migration_service.get_migration_status("identification")["status"] == "not_started"
+    
+    migration_service.migrate_identification_form(valid)
+    migration_service.migrate_identification_form(dict(valid, department=""))
+    
+    status = migration_service.get_migration_status("identification")
+    assert status["status"] == "in_progress"
+    assert status["details"]["total_records"] == 2
+    assert status["details"]["migrated_records"] == 1
+    assert status["details"]["failed_records"] == 1
+    assert status["details"]["rollbacks"] == 1
+    latency = status["metrics"]["latency"]
+    assert latency["map"]["count"] == 2
+    assert latency["validate"]["count"] == 2
+    assert latency["persist"]["count"] == 1
+    assert latency["rollback"]["count"] == 1
+
+def test_export_metrics(migration_service):
+    """Testa exportação das métricas em JSON e Prometheus."""
+    migration_service.migrate_identification_form(
+        {"name": "Test Process", "id": "PROC-001", "department": "IT", "owner": "John Doe", "status": "draft"}
+    )
+    
+    metrics = json.loads(migration_service.export_metrics("json"))
+    assert metrics["identification"]["counters"]["success"] == 1
+    
+    text = migration_service.export_metrics("prometheus")
+    assert 'rpa_migration_forms_total{form="identification",outcome="success"} 1' in text
+    assert 'rpa_migration_stage_duration_seconds_count{form="identification",stage="map"} 1' in text
+    assert 'stage="map",le="+Inf"} 1' in text
+    
+    with pytest.raises(ValueError):
+        migration_service.export_metrics("xml")
@@ -0,0 +1,66 @@
+"""Testes para os índices secundários de processos."""
+import pytest
+from src.migrations.persistence import MigrationPersistence
+from src.migrations.process_index import main
+
+def identification(number: int, status: str = "draft", department: str = "IT"):
+    """Dados de identificação de exemplo."""
+    return {
+        "process_name": f"Processo {number}",
+        "process_id": f"PROC-{number:03d}",
+        "department": department,
+        "owner": "John Doe" if number % 2 else "Jane Roe",
+        "status": status
+    }
+
+@pytest.fixture
+def persistence(tmp_path):
+    """Fixture com três processos migrados."""
+    persistence = MigrationPersistence(str(tmp_path))
+    persistence.save_identification_form(identification(1), "PROC-001")
+    persistence.save_identification_form(identification(2, status="in_review"), "PROC-002")
+    persistence.save_identification_form(identification(3, status="in_review", department="RH"), "PROC-003")
+    yield persistence
+    persistence.close()
+
+def test_find_processes(persistence):
+    """Testa consultas por campo indexado."""
+    assert persistence.find_processes(status="in_review") == ["PROC-002", "PROC-003"]
+    assert persistence.find_processes(status="in_review", department="IT") == ["PROC-002"]
+    assert persistence.find_processes(owner="John Doe") == ["PROC-001", "PROC-003"]
+    assert persistence.find_processes() == ["PROC-001", "PROC-002", "PROC-003"]
+
+def test_index_follows_saves_and_deletes(persistence):
+    """Testa atualização do índice ao regravar e remover."""
+    persistence.save_identification_form(identification(1, status="approved"), "PROC-001")
+    persistence.delete_identification_form("PROC-003")
+    
+    assert persistence.find_processes(status="approved") == ["PROC-001"]
+    assert persistence.find_processes(status="in_review") == ["PROC-002"]
+    assert persistence.index.counts("status") == {"approved": 1, "in_review": 1}
+
+def test_list_processes(persistence):
+    """Testa listagem resumida."""
+    rows = persistence.list_processes(department="RH")
+    
+    assert rows == [{
+        "process_id": "PROC-003",
+        "process_name": "Processo 3",
+        "status": "in_review",
+        "department": "RH",
+        "owner": "John Doe"
+    }]
+
+def test_rebuild_index(persistence, tmp_path):
+    """Testa reconstrução do índice a partir dos formulários."""
+    persistence.index.remove("PROC-002")
+    assert persistence.find_processes(status="in_review") == ["PROC-003"]
+    
+    assert persistence.rebuild_index() == 3
+    assert persistence.find_processes(status="in_review") == ["PROC-002", "PROC-003"]
+    assert main(["--storage", str(tmp_path)]) == 0
+
+def test_invalid_field(persistence):
+    """Testa campo não indexado."""
+    with pytest.raises(ValueError):
+        persistence.index.find(process_name="Processo 1")
@@ -0,0 +1,101 @@
+"""Testes para o motor de regras de validação."""
+from datetime import datetime
+import pytest
+from src.migrations.rule_engine import RECORD_ERROR_KEY, RuleEngine, default_engine, is_iso_date
+from src.migrations.validators import DataValidator
+
+def _strptime_accepts(value):
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+@pytest.mark.parametrize("value", [
+    "2024-01-01", "2024-1-1", "2024-02-29", "2023-02-29", "2024-13-01",
+    "2024-00-10", "2024-01-32", "2024-01- 5", "24-01-01", "2024-01-01 ",
+    "2024/01/01", "", "abcd-ef-gh", "2024-01-001"
+])
+def test_is_iso_date_matches_strptime(value):
+    """Testa que a verificação de data aceita o mesmo que strptime."""
+    assert is_iso_date(value) == _strptime_accepts(value)
+
+def test_validate_many():
+    """Testa validação em lote com erros por registro."""
+    validator = DataValidator()
+    valid = {
+        "process_name": "Processo",
+        "process_id": "PROC-001",
+        "department": "TI",
+        "owner": "John Doe",
+        "status": "draft"
+    }
+    invalid = dict(valid, process_id="123", status=["draft"])
+    
+    errors = validator.validate_many("identification", [valid, invalid, {}])
+    
+    assert errors[0] == {}
+    assert errors[1] == {
+        "process_id": "Invalid process ID format (should be PROC-XXX)",
+        "status": "Invalid status. Must be one of: draft, in_review, approved, archived"
+    }
+    assert errors[2] == validator.validate_identification_data({})[1]
+
+def test_validate_many_nested_lists():
+    """Testa chaves de erro com índices de listas aninhadas."""
+    data = {"data_inputs": [{"input_id": "IN1", "name": "a", "type": "csv",
+                             "fields": [{"name": "x", "type": "string"}, {"type": "blob"}]}]}
+                             
+    errors = default_engine().validate_many("data", [data])
+    
+    assert errors == [{
+        "data_inputs[0].fields[1].name": "Field name is required",
+        "data_inputs[0].fields[1].type": "Invalid data type"
+    }]
+
+def test_validate_many_malformed_records():
+    """Testa que um registro malformado não aborta o lote."""
+    valid = {"identified_risks": [], "risk_assessment_matrix": {"probability_scale": ["low"], "impact_scale": ["low"]}}
+    malformed = {"identified_risks": ["not a dict"]}
+    
+    errors = default_engine().validate_many("risks", [valid, malformed, valid])
+    
+    assert errors[0] == {} and errors[2] == {}
+    assert list(errors[1]) == [RECORD_ERROR_KEY]
+    assert "AttributeError" in errors[1][RECORD_ERROR_KEY]
+    
+    errors = default_engine().validate_many("identification", [{"process_id": 123}])
+    assert "TypeError" in errors[0][RECORD_ERROR_KEY]
+
+def test_custom_rules():
+    """Testa regras informadas em um dict."""
+    engine = RuleEngine({
+        "enums": {"colors": ["red", "blue"]},
+        "forms": {"custom": [
+            {"field": "name", "required": True},
+            {"field": "color", "enum": "colors", "message": "Use {choices}"}
+        ]}
+    })
+    
+    assert engine.validate("custom", {"name": "x", "color": "red"}) == (True, {})
+    assert engine.validate("custom", {"color": "green"}) == (False, {
+        "name": "Field name is required",
+        "color": "Use red, blue"
+    })
+
+@pytest.mark.parametrize("rules", [
+    [{"field": "name"}],
+    [{"field": "name", "required": True, "date": True}],
+    [{"field": "name", "required": True, "unknown": 1}],
+    [{"field": "color", "enum": "missing"}],
+    [{"field": "items", "type": "dict"}]
+])
+def test_invalid_rules(rules):
+    """Testa erro para regras inválidas."""
+    with pytest.raises(ValueError):
+        RuleEngine({"forms": {"custom": rules}})
+
+def test_unknown_form():
+    """Testa erro para formulário desconhecido."""
+    with pytest.raises(ValueError):
+        default_engine().validate_many("invalid", [])
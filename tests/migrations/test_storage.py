@@ -0,0 +1,168 @@
+"""Testes para os backends de armazenamento."""
+import os
+import subprocess
+import sys
+import pytest
+from src.migrations import storage
+from src.migrations.persistence import MigrationPersistence
+from src.migrations.storage import DirectoryBackend, SingleFileBackend, create_backend
+
+@pytest.fixture(params=["directory", "single_file", "sqlite"])
+def persistence(request, tmp_path):
+    """Fixture com a persistência em cada backend."""
+    persistence = MigrationPersistence(str(tmp_path / "migrations"), backend=request.param)
+    yield persistence
+    persistence.close()
+
+@pytest.fixture
+def identification_data():
+    """Dados de exemplo."""
+    return {
+        "process_name": "Processo Ação",
+        "process_id": "PROC-001",
+        "department": "IT",
+        "owner": "John Doe",
+        "status": "draft"
+    }
+
+def test_save_load_delete(persistence, identification_data):
+    """Testa o ciclo básico em todos os backends."""
+    persistence.save_identification_form(identification_data, "PROC-001")
+    persistence.save_data_form({"data_types": ["texto"]}, "PROC-001")
+    
+    assert persistence.load_identification_form("PROC-001")["data"] == identification_data
+    assert persistence.load_form("PROC-001", "data") == {"data_types": ["texto"]}
+    assert persistence.list_process_ids() == ["PROC-001"]
+    
+    persistence.delete_identification_form("PROC-001")
+    assert persistence.load_identification_form("PROC-001") is None
+    assert persistence.delete_data_form("PROC-001")["success"] is True
+    assert persistence.load_form("PROC-001", "data") is None
+
+def test_save_forms(persistence, identification_data):
+    """Testa gravação de vários formulários de uma vez."""
+    persistence.save_forms("PROC-002", {
+        "identification": identification_data,
+        "steps": {"steps": ["Passo 1"]}
+    })
+    
+    assert persistence.load_identification_form("PROC-002")["metadata"]["status"] == "migrated"
+    assert persistence.load_form("PROC-002", "steps") == {"steps": ["Passo 1"]}
+    assert set(persistence.backend.read_many("PROC-002")) == {"identification.json", "steps_form.json"}
+
+def test_save_forms_invalid_name(persistence):
+    """Testa formulário desconhecido."""
+    with pytest.raises(ValueError):
+        persistence.save_forms("PROC-001", {"invalid": {}})
+
+def test_sqlite_write_many_is_atomic(tmp_path, identification_data):
+    """Testa que uma falha no meio da transação não grava nada."""
+    persistence = MigrationPersistence(str(tmp_path), backend="sqlite")
+    
+    with pytest.raises(TypeError):
+        persistence.save_forms("PROC-001", {
+            "identification": identification_data,
+            "risks": {"impact": object()}
+        })
+        
+    assert persistence.list_process_ids() == []
+
+def test_single_file_backend_layout(tmp_path, identification_data):
+    """Testa que o backend de arquivo único grava um arquivo por processo."""
+    backend = SingleFileBackend(tmp_path)
+    persistence = MigrationPersistence(str(tmp_path), backend=backend)
+    persistence.save_identification_form(identification_data, "PROC-001")
+    persistence.save_risks_form({"risks": []}, "PROC-001")
+    
+    assert [path.name for path in tmp_path.glob("*.json")] == ["PROC-001.json"]
+
+def test_unknown_backend(tmp_path):
+    """Testa backend inválido."""
+    with pytest.raises(ValueError):
+        create_backend("invalid", tmp_path)
+
+def test_load_process(persistence, identification_data):
+    """Testa carga de todos os formulários de um processo."""
+    persistence.save_forms("PROC-001", {
+        "identification": identification_data,
+        "steps": {"steps": ["Passo 1"]}
+    })
+    
+    process = persistence.load_process("PROC-001")
+    
+    assert process["identification"]["data"] == identification_data
+    assert process["steps"] == {"steps": ["Passo 1"]}
+    assert process["risks"] is None
+    assert len(process) == 9
+
+def test_load_processes(persistence, identification_data):
+    """Testa carga em lote, com IDs repetidos e inexistentes."""
+    for number in range(1, 6):
+        persistence.save_identification_form(dict(identification_data, process_id=f"PROC-{number}"), f"PROC-{number}")
+        
+    processes = persistence.load_processes(["PROC-1", "PROC-5", "PROC-1", "PROC-9"], chunk_size=2)
+    
+    assert list(processes) == ["PROC-1", "PROC-5", "PROC-9"]
+    assert processes["PROC-5"]["identification"]["data"]["process_id"] == "PROC-5"
+    assert all(form is None for form in processes["PROC-9"].values())
+
+@pytest.mark.parametrize("backend", ["directory", "single_file", "sqlite"])
+def test_read_only(tmp_path, backend, identification_data):
+    """Testa leitura sem criar nada e recusa de gravações no modo somente leitura."""
+    missing = MigrationPersistence(str(tmp_path / "missing"), backend=backend, read_only=True)
+    assert missing.list_process_ids() == []
+    assert missing.load_identification_form("PROC-001") is None
+    assert not (tmp_path / "missing").exists()
+    
+    writer = MigrationPersistence(str(tmp_path / "migrations"), backend=backend)
+    writer.save_identification_form(identification_data, "PROC-001")
+    writer.close()
+    reader = MigrationPersistence(str(tmp_path / "migrations"), backend=backend, read_only=True)
+    
+    assert reader.load_identification_form("PROC-001")["data"] == identification_data
+    with pytest.raises(PermissionError):
+        reader.save_identification_form(identification_data, "PROC-002")
+    reader.close()
+
+def test_directory_read_during_swap(tmp_path, identification_data):
+    """Testa leituras entre os dois renames de write_many (pasta do processo ausente)."""
+    backend = DirectoryBackend(tmp_path)
+    backend.write_many("PROC-001", {"identification.json": identification_data})
+    token = backend.version("PROC-001", "identification.json")
+    
+    # Versão anterior deixada por um processo que já terminou
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    old = tmp_path / f".PROC-001.old-{finished.stdout.strip()}-abc"
+    os.rename(tmp_path / "PROC-001", old)
+    (tmp_path / ".PROC-001.swap").write_text(old.name)
+    
+    assert backend.read("PROC-001", "identification.json") == identification_data
+    assert backend.read_many("PROC-001") == {"identification.json": identification_data}
+    assert backend.version("PROC-001", "identification.json") == token
+    assert backend.read("PROC-001", "mapping.json") is None
+    assert backend.read("PROC-002", "identification.json") is None
+    
+    # Marcador de um dono que já terminou é removido ao abrir, e a versão anterior restaurada
+    DirectoryBackend(tmp_path)
+    assert not (tmp_path / ".PROC-001.swap").exists()
+    assert backend.read_many("PROC-001") == {"identification.json": identification_data}
+
+def test_directory_write_many_syncs_before_swap(tmp_path, identification_data, monkeypatch):
+    """Testa que a staging vai a disco antes da troca e a raiz depois dela."""
+    backend = DirectoryBackend(tmp_path)
+    backend.write_many("PROC-001", {"identification.json": identification_data})
+    events = []
+    monkeypatch.setattr(storage, "fsync_paths", lambda paths: events.append(("fsync", [p.parent.name for p in paths])))
+    monkeypatch.setattr(storage, "fsync_dir", lambda directory: events.append(("fsync_dir", str(directory))))
+    real_rename = os.rename
+    monkeypatch.setattr(storage.os, "rename", lambda src, dst: (events.append(("rename", str(dst))), real_rename(src, dst)))
+    
+    backend.write_many("PROC-001", {"identification.json": dict(identification_data, status="done")})
+    
+    kinds = [event[0] for event in events]
+    assert kinds == ["fsync", "rename", "rename", "fsync_dir"]
+    assert events[0][1][0].startswith(".PROC-001.staging-")
+    assert events[2][1] == str(tmp_path / "PROC-001")
+    assert events[3][1] == str(tmp_path)
+    assert not list(tmp_path.glob(".PROC-001*"))
+    assert backend.read("PROC-001", "identification.json")["status"] == "done"
@@ -0,0 +1,175 @@
+"""Testes para a unidade de trabalho e a gravação atômica por processo."""
+import os
+import subprocess
+import sys
+import pytest
+from src.migrations.persistence import MigrationPersistence
+from src.migrations.migration_service import MigrationService
+from src.migrations.data_mapper import DataMapper
+from src.migrations.validators import DataValidator
+from src.migrations.storage import DirectoryBackend
+
+@pytest.fixture(params=["directory", "single_file", "sqlite"])
+def persistence(request, tmp_path):
+    """Fixture com a persistência em cada backend."""
+    persistence = MigrationPersistence(str(tmp_path / "migrations"), backend=request.param)
+    yield persistence
+    persistence.close()
+
+@pytest.fixture
+def old_forms():
+    """Formulários legados de um processo."""
+    return {
+        "identification": {
+            "name": "Processo Teste",
+            "id": "PROC-001",
+            "department": "IT",
+            "owner": "John Doe",
+            "status": "draft"
+        },
+        "process_details": {
+            "description": "Processo de teste",
+            "objective": "Testar migração atômica",
+            "frequency": "daily"
+        }
+    }
+
+def test_commit_writes_all_forms(persistence):
+    """Testa que nada é gravado antes do commit."""
+    with persistence.unit_of_work("PROC-001") as unit:
+        unit.save_systems_form({"systems": ["SAP"]}, "PROC-001")
+        unit.save_data_form({"data_types": ["texto"]}, "PROC-001")
+        assert unit.load_systems_form("PROC-001")["data"] == {"systems": ["SAP"]}
+        assert persistence.load_systems_form("PROC-001") is None
+        
+    assert persistence.load_systems_form("PROC-001")["data"] == {"systems": ["SAP"]}
+    assert persistence.load_form("PROC-001", "data") == {"data_types": ["texto"]}
+
+def test_rollback_discards_staged_forms(persistence):
+    """Testa que uma exceção no bloco descarta todos os formulários."""
+    persistence.save_systems_form({"systems": ["SAP"]}, "PROC-001")
+    
+    with pytest.raises(RuntimeError):
+        with persistence.unit_of_work("PROC-001") as unit:
+            unit.save_systems_form({"systems": ["Excel"]}, "PROC-001")
+            unit.save_risks_form({"risks": []}, "PROC-001")
+            raise RuntimeError("falha no meio da migração")
+            
+    assert persistence.load_systems_form("PROC-001")["data"] == {"systems": ["SAP"]}
+    assert persistence.load_risks_form("PROC-001") is None
+
+def test_unit_of_work_is_bound_to_process(persistence):
+    """Testa que formulários de outro processo são rejeitados."""
+    unit = persistence.unit_of_work("PROC-001")
+    with pytest.raises(ValueError):
+        unit.save_systems_form({"systems": []}, "PROC-002")
+    with pytest.raises(AttributeError):
+        unit.save_unknown_form({}, "PROC-001")
+
+def test_directory_write_many_is_atomic(tmp_path, monkeypatch):
+    """Testa que uma falha durante a gravação mantém a versão anterior da pasta."""
+    backend = DirectoryBackend(tmp_path)
+    backend.write_many("PROC-001", {"a.json": {"v": 1}, "b.json": {"v": 1}})
+    
+    encode = backend.codec.encode
+    calls = []
+    def failing_encode(document):
+        calls.append(document)
+        if len(calls) == 2:
+            raise OSError("disco cheio")
+        return encode(document)
+    monkeypatch.setattr(backend.codec, "encode", failing_encode)
+    
+    with pytest.raises(OSError):
+        backend.write_many("PROC-001", {"a.json": {"v": 2}, "b.json": {"v": 2}})
+        
+    assert backend.read_many("PROC-001") == {"a.json": {"v": 1}, "b.json": {"v": 1}}
+    assert backend.list_process_ids() == ["PROC-001"]
+    assert sorted(os.listdir(tmp_path)) == ["PROC-001"]
+
+def test_directory_keeps_untouched_forms(tmp_path):
+    """Testa que formulários não regravados continuam na nova versão da pasta."""
+    backend = DirectoryBackend(tmp_path)
+    backend.write_many("PROC-001", {"a.json": {"v": 1}, "b.json": {"v": 1}})
+    backend.write_many("PROC-001", {"b.json": {"v": 2}})
+    
+    assert backend.read_many("PROC-001") == {"a.json": {"v": 1}, "b.json": {"v": 2}}
+
+def test_directory_recovers_interrupted_swap(tmp_path):
+    """Testa a recuperação de uma troca interrompida entre os renames."""
+    backend = DirectoryBackend(tmp_path)
+    backend.write_many("PROC-001", {"a.json": {"v": 1}})
+    os.rename(tmp_path / "PROC-001", tmp_path / ".PROC-001.old-abc")
+    (tmp_path / ".PROC-002.staging-xyz").mkdir()
+    
+    backend = DirectoryBackend(tmp_path)
+    
+    assert backend.read("PROC-001", "a.json") == {"v": 1}
+    assert sorted(os.listdir(tmp_path)) == ["PROC-001"]
+
+def test_directory_recover_keeps_live_writers(tmp_path):
+    """Testa que abrir o backend não apaga o staging de um gravador ainda ativo."""
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    (tmp_path / f".PROC-001.staging-{os.getpid()}-abc").mkdir()
+    (tmp_path / f".PROC-002.staging-{finished.pid}-abc").mkdir()
+    
+    DirectoryBackend(tmp_path)
+    
+    assert sorted(os.listdir(tmp_path)) == [f".PROC-001.staging-{os.getpid()}-abc"]
+
+def test_directory_write_many_with_concurrent_open(tmp_path, monkeypatch):
+    """Testa que um segundo backend aberto durante write_many não perde a gravação."""
+    backend = DirectoryBackend(tmp_path)
+    encode = backend.codec.encode
+    def encode_and_open(document):
+        DirectoryBackend(tmp_path)
+        return encode(document)
+    monkeypatch.setattr(backend.codec, "encode", encode_and_open)
+    
+    backend.write_many("PROC-001", {"a.json": {"v": 1}})
+    
+    assert DirectoryBackend(tmp_path).read("PROC-001", "a.json") == {"v": 1}
+
+def test_migrate_process_all_or_nothing(tmp_path, old_forms):
+    """Testa que um formulário inválido impede a gravação dos demais."""
+    persistence = MigrationPersistence(str(tmp_path / "migrations"))
+    service = MigrationService(DataMapper(), DataValidator(), persistence)
+    
+    invalid = dict(old_forms, identification=dict(old_forms["identification"], department=""))
+    result = service.migrate_process(invalid, "PROC-001")
+    
+    assert result["success"] is False
+    assert result["forms"]["process_details"]["success"] is True
+    assert persistence.list_process_ids() == []
+    
+    result = service.migrate_process(old_forms, "PROC-001")
+    
+    assert result["success"] is True
+    assert persistence.load_identification_form("PROC-001")["data"]["department"] == "IT"
+    assert persistence.load_process_details_form("PROC-001") is not None
+    assert service.persistence is persistence
+    persistence.close()
+
+def test_migrate_process_metrics_follow_commit(tmp_path, old_forms):
+    """Testa que formulários descartados pelo rollback não contam como migrados."""
+    persistence = MigrationPersistence(str(tmp_path / "migrations"))
+    service = MigrationService(DataMapper(), DataValidator(), persistence)
+    
+    invalid = dict(old_forms, identification=dict(old_forms["identification"], department=""))
+    service.migrate_process(invalid, "PROC-001")
+    
+    details = service.get_migration_status("process_details")
+    assert details["details"]["migrated_records"] == 0
+    assert details["details"]["failed_records"] == 1
+    assert details["details"]["rollbacks"] == 1
+    assert "persist" not in details["metrics"]["latency"]
+    
+    service.migrate_process(old_forms, "PROC-001")
+    
+    assert service.get_migration_status("process_details")["details"]["migrated_records"] == 1
+    process = service.get_migration_status("process")
+    assert process["details"]["migrated_records"] == 1
+    assert process["details"]["failed_records"] == 1
+    assert process["metrics"]["latency"]["persist"]["count"] == 1
+
@@ -0,0 +1,127 @@
+"""Testes para o DocumentService."""
+import io
+import pytest
+from src.services.document_service import DocumentService
+from templates import base_template
+from templates.base_template import get_environment
+from templates.pdd_template import PDDTemplate
+
+@pytest.fixture
+def document_service():
+    """Fixture que fornece uma instância do DocumentService."""
+    return DocumentService()
+
+def test_render_html(document_service, sample_process_data):
+    """Testa renderização do PDD em HTML."""
+    html = document_service.render_html(sample_process_data)
+    
+    assert "Processo de Teste" in html
+    assert "Documento gerado em" in html
+
+def test_templates_share_environment():
+    """Testa que todos os templates usam o mesmo ambiente Jinja2."""
+    assert PDDTemplate().env is PDDTemplate().env is get_environment()
+
+def test_templates_precompiled_once(monkeypatch):
+    """Testa que novas instâncias do serviço não recompilam os templates."""
+    DocumentService()
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("templates listados de novo")
+        
+    monkeypatch.setattr(get_environment(), "list_templates", fail)
+    DocumentService()
+
+def test_bytecode_cache_outside_cwd():
+    """Testa que o cache de bytecode não depende do diretório atual."""
+    assert base_template.BYTECODE_CACHE_DIR.is_absolute()
+
+def test_second_render_skips_loader(document_service, sample_process_data, monkeypatch):
+    """Testa que uma nova renderização não relê nem recompila o template."""
+    document_service.render_html(sample_process_data)
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("template recarregado do disco")
+        
+    monkeypatch.setattr(get_environment().loader, "get_source", fail)
+    
+    html = PDDTemplate().render(dict(sample_process_data, generated_at="hoje"))
+    assert "Processo de Teste" in html
+
+def test_generate_pdd_html(document_service, sample_process_data, tmp_path):
+    """Testa geração do PDD em HTML."""
+    output_path = tmp_path / "pdd.html"
+    
+    assert document_service.generate_pdd(sample_process_data, str(output_path), "html")
+    html = output_path.read_text(encoding="utf-8")
+    assert "Processo de Teste" in html
+    assert html.rstrip().endswith("</html>")
+
+def test_generate_pdd_invalid_format(document_service, sample_process_data, tmp_path):
+    """Testa formato de saída inválido."""
+    assert not document_service.generate_pdd(
+        sample_process_data, str(tmp_path / "pdd.doc"), "doc"
+    )
+
+def test_stream_matches_render(sample_process_data):
+    """Testa que a renderização em streaming produz o mesmo documento."""
+    template = PDDTemplate()
+    data = dict(sample_process_data, generated_at="hoje")
+    output = io.StringIO()
+    
+    template.stream(data, output, buffer_size=2)
+    
+    assert output.getvalue() == template.render(data)
+
+def test_stream_html_yields_chunks(document_service, sample_process_data):
+    """Testa geração do HTML em blocos."""
+    chunks = list(document_service.stream_html(sample_process_data))
+    
+    assert len(chunks) > 1
+    assert "Processo de Teste" in "".join(chunks)
+
+def test_stream_invalid_data():
+    """Testa streaming com dados incompletos."""
+    with pytest.raises(ValueError):
+        PDDTemplate().generate({"process_name": "Teste"})
+
+def test_changed_field_rerenders_only_its_section(sample_process_data):
+    """Testa que alterar uma regra renderiza apenas a seção de regras."""
+    PDDTemplate.clear_section_cache()
+    template = PDDTemplate()
+    data = dict(sample_process_data, generated_at="hoje")
+    
+    template.render(data)
+    assert "rules" in template.rendered_sections
+    
+    html = template.render(dict(data, business_rules="Regra 1\nRegra 3"))
+    
+    assert template.rendered_sections == ["rules"]
+    assert "Regra 3" in html
+    assert "Processo de Teste" in html
+
+def test_section_slices_skip_empty_sections(sample_process_data):
+    """Testa que seções sem dados são omitidas e a numeração é contínua."""
+    slices = PDDTemplate().section_slices(sample_process_data)
+    names = [name for name, _ in slices]
+    
+    assert "risks" not in names
+    assert [section["number"] for _, section in slices] == list(range(1, len(slices) + 1))
+
+def test_diagram_resolved_once(sample_process_data):
+    """Testa que o diagrama é convertido apenas quando a seção muda."""
+    PDDTemplate.clear_section_cache()
+    calls = []
+    
+    def resolver(code):
+        calls.append(code)
+        return "data:image/svg+xml;base64,AAAA"
+    
+    template = PDDTemplate(diagram_resolver=resolver)
+    data = dict(sample_process_data, diagram="flowchart TD\n A-->B", generated_at="hoje")
+    
+    html = template.render(data)
+    template.render(dict(data, kpis="KPI 3"))
+    
+    assert calls == ["flowchart TD\n A-->B"]
+    assert "data:image/svg+xml;base64,AAAA" in html
@@ -0,0 +1,92 @@
+"""Testes para o PDDExportService."""
+import importlib.util
+import json
+import pytest
+from src.migrations.persistence import MigrationPersistence
+from services import export_service as export_module
+from services.export_service import PDDExportService
+
+@pytest.fixture
+def storage_path(tmp_path):
+    """Fixture com dois processos migrados."""
+    storage = tmp_path / "migrations"
+    persistence = MigrationPersistence(storage_path=str(storage))
+    for process_id in ["PROC-001", "PROC-002"]:
+        persistence.save_identification_form({
+            "process_name": f"Processo {process_id}",
+            "process_id": process_id,
+            "owner": "John Doe"
+        }, process_id)
+        persistence.save_steps_form({
+            "process_steps": [{"step_id": "STEP001", "step_name": "Receber pedido"}]
+        }, process_id)
+    return str(storage)
+
+@pytest.fixture
+def export_service(storage_path, tmp_path):
+    """Fixture que fornece o serviço de exportação."""
+    return PDDExportService(storage_path, str(tmp_path / "pdds"))
+
+def read_manifest(service):
+    with open(service.manifest_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_export_all_processes(export_service):
+    """Testa exportação de todos os processos migrados."""
+    summary = export_service.export(max_workers=2)
+    
+    assert summary["exported"] == 2
+    assert summary["failed"] == 0
+    
+    entries = read_manifest(export_service)
+    assert {entry["process_id"] for entry in entries} == {"PROC-001", "PROC-002"}
+    for entry in entries:
+        assert entry["status"] == "success"
+        assert entry["duration_ms"] >= 0
+        with open(entry["output"], encoding="utf-8") as f:
+            html = f.read()
+        assert "Receber pedido" in html
+
+def test_export_resumes_from_manifest(export_service):
+    """Testa que uma nova execução pula processos já exportados."""
+    export_service.export(["PROC-001"], max_workers=1)
+    
+    summary = export_service.export(max_workers=1)
+    
+    assert summary["skipped"] == 1
+    assert summary["exported"] == 1
+    assert len(read_manifest(export_service)) == 2
+
+def test_export_records_failures(export_service, storage_path):
+    """Testa registro de falhas no manifesto e nova tentativa."""
+    with open(f"{storage_path}/PROC-002/identification.json", "w") as f:
+        f.write("{corrompido")
+        
+    summary = export_service.export(max_workers=1)
+    
+    assert summary["failures"] == ["PROC-002"]
+    assert export_service.completed_process_ids() == {"PROC-001"}
+
+@pytest.mark.skipif(importlib.util.find_spec("xhtml2pdf") is not None, reason="xhtml2pdf instalado")
+def test_export_records_real_error(export_service):
+    """Testa que o manifesto guarda a causa real da falha."""
+    summary = export_service.export(["PROC-001"], output_format="pdf", max_workers=1)
+    
+    assert summary["failed"] == 1
+    assert "xhtml2pdf" in read_manifest(export_service)[0]["error"]
+
+def test_export_closes_listing_persistence(export_service, monkeypatch):
+    """Testa que a persistência usada para listar os processos é fechada."""
+    closed = []
+    # A classe importada pelo serviço (pacote migrations, sem o prefixo src)
+    persistence_class = export_module.MigrationPersistence
+    original_close = persistence_class.close
+    
+    def close(self):
+        closed.append(self)
+        original_close(self)
+        
+    monkeypatch.setattr(persistence_class, "close", close)
+    export_service.export(max_workers=1)
+    
+    assert len(closed) == 1
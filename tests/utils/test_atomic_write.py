@@ -0,0 +1,60 @@
+"""Testes para escrita atômica de arquivos."""
+import os
+import pytest
+from src.utils.atomic_write import atomic_write, fsync_paths, FsyncBatch
+
+def test_atomic_write_creates_file(tmp_path):
+    """Testa escrita em arquivo novo, criando a pasta."""
+    path = tmp_path / "out" / "doc.html"
+    
+    with atomic_write(path) as f:
+        f.write("conteúdo")
+    
+    assert path.read_text(encoding="utf-8") == "conteúdo"
+    assert os.listdir(path.parent) == ["doc.html"]
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    """Testa que uma falha no meio da escrita preserva o arquivo anterior."""
+    path = tmp_path / "doc.json"
+    path.write_text("antigo")
+    
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write("novo parcial")
+            raise RuntimeError("falha")
+    
+    assert path.read_text() == "antigo"
+    assert os.listdir(tmp_path) == ["doc.json"]
+
+def test_atomic_write_binary_without_fsync(tmp_path):
+    """Testa escrita binária com fsync adiado."""
+    path = tmp_path / "doc.pdf"
+    
+    with atomic_write(path, "wb", fsync=False) as f:
+        f.write(b"%PDF")
+    fsync_paths([path])
+    
+    assert path.read_bytes() == b"%PDF"
+
+def test_atomic_write_invalid_mode(tmp_path):
+    """Testa modo de abertura não suportado."""
+    with pytest.raises(ValueError):
+        with atomic_write(tmp_path / "doc.txt", "a"):
+            pass
+
+def test_fsync_batch_flushes_at_size(tmp_path):
+    """Testa persistência em grupo ao atingir o tamanho do lote."""
+    batch = FsyncBatch(batch_size=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc{i}.txt"
+        path.write_text(str(i))
+        paths.append(path)
+    
+    assert batch.add(paths[0]) is False
+    assert batch.add(paths[1]) is True
+    assert batch.add(paths[2]) is False
+    assert batch.pending == [paths[2]]
+    
+    batch.flush()
+    assert batch.pending == []
@@ -0,0 +1,67 @@
+"""Testes para o logger da migração."""
+import logging
+import multiprocessing
+import pytest
+from src.utils import migration_logger
+from src.utils.migration_logger import MigrationLogger, LOGGER_NAME, LOG_FILE
+
+def log_lines(log_dir):
+    """Linhas gravadas no arquivo de log da pasta."""
+    migration_logger.flush()
+    return (log_dir / LOG_FILE).read_text(encoding="utf-8").splitlines()
+
+def test_instances_share_handlers(tmp_path):
+    """Testa que várias instâncias não duplicam handlers nem linhas."""
+    loggers = [MigrationLogger(str(tmp_path)) for _ in range(3)]
+    
+    loggers[0].info("single line")
+    
+    handlers = logging.getLogger(LOGGER_NAME).handlers
+    assert len(handlers) == 1
+    assert len([line for line in log_lines(tmp_path) if "single line" in line]) == 1
+
+def test_error_includes_traceback(tmp_path):
+    """Testa registro de erro com a exceção."""
+    logger = MigrationLogger(str(tmp_path))
+    try:
+        raise ValueError("broken value")
+    except ValueError as e:
+        logger.error("failed step", e)
+        
+    text = "\n".join(log_lines(tmp_path))
+    assert "ERROR - failed step" in text
+    assert "ValueError: broken value" in text
+
+def test_rotation(tmp_path):
+    """Testa rotação do arquivo por tamanho."""
+    logger = MigrationLogger(str(tmp_path), max_bytes=1000, backup_count=2)
+    
+    for number in range(100):
+        logger.debug(f"message {number}")
+    migration_logger.flush()
+    
+    assert (tmp_path / f"{LOG_FILE}.1").exists()
+    assert not (tmp_path / f"{LOG_FILE}.3").exists()
+    assert (tmp_path / LOG_FILE).stat().st_size <= 1000
+
+def _log_in_child(log_dir):
+    MigrationLogger(log_dir).info("from child")
+    migration_logger.flush()
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_logs_after_fork(tmp_path):
+    """Testa que processos filhos (fork) gravam em um arquivo próprio."""
+    MigrationLogger(str(tmp_path)).info("from parent")
+    
+    child = multiprocessing.get_context("fork").Process(target=_log_in_child, args=(str(tmp_path),))
+    child.start()
+    child.join(10)
+    
+    assert child.exitcode == 0
+    child_log = (tmp_path / f"migration.{child.pid}.log").read_text(encoding="utf-8")
+    assert "from child" in child_log
+    assert "from parent" not in child_log
+    MigrationLogger(str(tmp_path)).info("parent again")
+    lines = log_lines(tmp_path)
+    assert any("parent again" in line for line in lines)
+    assert not any("from child" in line for line in lines)